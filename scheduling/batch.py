@@ -0,0 +1,171 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import contextlib
+import csv
+import importlib
+import io
+import multiprocessing
+import os
+import time
+import traceback
+import yaml
+from synthetic import copy_config
+from input_cache import InputCache
+from instrumentation import Instrumentation
+
+# Batch Runner: Build and Solve the Instances of a Manifest in a Process Pool
+# Usage (From Repository Root): python scheduling/batch.py scheduling/batch_example.yml --out /tmp/batch
+# Manifest (YAML):
+#   defaults:                      Applied to Every Instance Unless Overridden
+#     model: stoch_duration_v1
+#     max_time: 30
+#     profile_phase: solve         With --instrument: Phase Run Under cProfile (Optional)
+#   instances:
+#     - name: bypass_20
+#       config: scheduling/stoch_duration_example_V1.yml
+#       set:                       Configuration Changes, Merged Into the YAML Key by Key
+#         stoch_task: {bypass_probability: 0.20}
+#         table_changes:           Input Table Edits: [Row Label..., Column, Value]
+#           project_attrs: [[long, Deadline, 45]]
+
+MODELS = {
+    "one_period_v2": ("one_period_v2", "Model"),
+    "stoch_duration_v0": ("stoch_duration_v0", "Model2P"),
+    "stoch_duration_v1": ("stoch_duration_v1", "Model2P"),
+    }
+_caches = {}
+
+RESULT_FIELDS = [
+    "instance", "model", "status", "objective", "bound", "gap",
+    "build_s", "solve_s", "total_s", "workers", "error"
+    ]
+
+def merge(base: dict, changes: dict) -> dict:
+    "Nested Dictionary Update; Non-Dictionary Values Replace"
+    out = dict(base)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = merge(out[key], value)
+        else:
+            out[key] = value
+    return out
+
+def load_manifest(filename: str) -> list:
+    "Instances of a Manifest With Defaults Applied"
+    with open(filename, 'r') as f:
+        manifest = yaml.safe_load(f)
+    defaults = manifest.get("defaults", {})
+    instances = [merge(defaults, instance) for instance in manifest["instances"]]
+    names = [instance["name"] for instance in instances]
+    if len(set(names)) < len(names):
+        raise ValueError("Instance Names in {} Are Not Unique".format(filename))
+    for instance in instances:
+        if instance.get("model") not in MODELS:
+            raise ValueError("Instance {}: Unknown Model {!r}; Choose From {}".format(
+                instance["name"], instance.get("model"), list(MODELS)))
+    return instances
+
+def instance_config(instance: dict, output_dir: str, workers_per_job: int) -> str:
+    "Write the Instance Configuration (With Its Changes and Worker Budget) to Its Own Directory"
+    with open(instance["config"], 'r') as f:
+        model_input = yaml.safe_load(f)
+    changes = merge({"render": "off"}, instance.get("set", {}))
+    changes = merge(changes, {"solver": {"num_workers": workers_per_job}})
+    model_input = merge(model_input, changes)
+    path = os.path.join(output_dir, instance["name"])
+    return copy_config(instance["config"], path, instance["name"], **model_input)
+
+def run_instance(
+        instance: dict,
+        output_dir: str,
+        workers_per_job: int=1,
+        report: bool=False,
+        cache_dir: str=None,
+        instrument: bool=False) -> dict:
+    """
+    Build and Solve One Instance; Errors Are Returned in the Result Row
+    With cache_dir, Parsed Inputs Are Shared Across Workers Through an On-Disk Input Cache
+    With instrument, Phase Timings and Solver Statistics Are Written to the Instance Directory
+    """
+    t0 = time.perf_counter()
+    row = dict.fromkeys(RESULT_FIELDS)
+    row.update(instance=instance["name"], model=instance["model"], workers=workers_per_job)
+    try:
+        module, class_name = MODELS[instance["model"]]
+        model_class = getattr(importlib.import_module(module), class_name)
+        model_input_file = instance_config(instance, output_dir, workers_per_job)
+        mod = model_class(instance["name"])
+        if instrument:
+            mod.instrumentation = Instrumentation(mod, instance.get("profile_phase"))
+        if cache_dir is not None:
+            if cache_dir not in _caches:
+                _caches[cache_dir] = InputCache(path=cache_dir)
+            mod.input_cache = _caches[cache_dir]
+        with contextlib.redirect_stdout(io.StringIO()):
+            mod.get_inputs(model_input_file)
+            mod.build_model()
+            t1 = time.perf_counter()
+            mod.solve(max_time=instance.get("max_time", 100), profile=instance.get("profile"))
+            t2 = time.perf_counter()
+            if report:
+                mod.report_results()
+                mod.renderer.wait()
+        row["status"] = mod.solver.StatusName()
+        if row["status"] in ("OPTIMAL", "FEASIBLE"):
+            row["objective"] = mod.solver.ObjectiveValue()
+            row["bound"] = mod.solver.BestObjectiveBound()
+            row["gap"] = abs(row["objective"] - row["bound"]) / max(abs(row["objective"]), 1)
+        row["build_s"] = round(t1 - t0, 3)
+        row["solve_s"] = round(t2 - t1, 3)
+    except Exception:
+        row["status"] = "ERROR"
+        row["error"] = traceback.format_exc(limit=1).strip().splitlines()[-1]
+    row["total_s"] = round(time.perf_counter() - t0, 3)
+    return row
+
+def run_batch(
+        instances: list,
+        output_dir: str,
+        processes: int=None,
+        workers_per_job: int=1,
+        report: bool=False,
+        cache_dir: str=None,
+        instrument: bool=False):
+    """
+    Solve instances in a Pool of processes (Default: Cores // workers_per_job), Each Solve
+    Limited to workers_per_job CP-SAT Workers. Yield Result Rows as Instances Finish and
+    Append Them to output_dir/results.csv
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 1) // workers_per_job)
+    results_file = os.path.join(output_dir, "results.csv")
+    with open(results_file, 'w', newline='') as f, \
+            ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        jobs = [pool.submit(run_instance, instance, output_dir, workers_per_job, report, cache_dir, instrument) for instance in instances]
+        for job in as_completed(jobs):
+            row = job.result()
+            writer.writerow(row)
+            f.flush()
+            yield row
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve the instances of a manifest in a process pool")
+    parser.add_argument("manifest", help="YAML manifest of instances")
+    parser.add_argument("--out", default="batch_results", help="output directory (results.csv and one directory per instance)")
+    parser.add_argument("--processes", type=int, default=None, help="parallel instances (default: cores // workers-per-job)")
+    parser.add_argument("--workers-per-job", type=int, default=1, help="CP-SAT workers per instance")
+    parser.add_argument("--report", action="store_true", help="write each instance's report and CSVs")
+    parser.add_argument("--cache-dir", default=None, help="on-disk input cache shared by the workers")
+    parser.add_argument("--instrument", action="store_true", help="write phase timings and solver statistics per instance")
+    args = parser.parse_args()
+
+    import pandas as pd
+    rows = []
+    for row in run_batch(load_manifest(args.manifest), args.out, args.processes, args.workers_per_job, args.report, args.cache_dir, args.instrument):
+        print("{instance}: {status} {objective} ({total_s}s)".format(**row), flush=True)
+        rows.append(row)
+    print(pd.DataFrame(rows, columns=RESULT_FIELDS).sort_values("instance").to_markdown(index=False))
@@ -0,0 +1,49 @@
+import tempfile
+import yaml
+import pandas as pd
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from synthetic import busy_calendar, write_instance
+from bench_scaling import bench_parser, solve_case, solver_row
+
+# Benchmark: Daily Busy Intervals vs Compiled Busy Intervals
+
+def run(model_class, model_input_file, compress_busy, max_time):
+    mod, build_s = solve_case(model_class, model_input_file, max_time, compress_busy=compress_busy)
+    response = mod.solver.ResponseProto()
+    proto = mod.model.Proto()
+    return {
+        "model": model_class.__name__,
+        "compress_busy": compress_busy,
+        "intervals": sum(c.HasField("interval") for c in proto.constraints),
+        "constraints": len(proto.constraints),
+        "build_s": build_s,
+        **solver_row(mod.solver),
+        "branches": mod.solver.NumBranches(),
+        "conflicts": mod.solver.NumConflicts(),
+        "propagations": response.num_integer_propagations + response.num_binary_propagations,
+        }
+
+if __name__ == "__main__":
+    args = bench_parser("Compare daily and compiled busy intervals", days=365, max_time=30.0, seed=0).parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for model_class, config in [(Model, "one_period_v2_example"), (Model2P, "stoch_duration_example_V1")]:
+            with open("scheduling/{}.yml".format(config), 'r') as f:
+                model_input = yaml.safe_load(f)
+            resource_attrs = pd.read_csv(model_input['resource_attrs'], index_col=[0])
+            extra = {key: model_input[key] for key in model_input if key == "stoch_task"}
+            model_input_file = write_instance(
+                "{}/{}".format(tmpdir, config),
+                config,
+                pd.read_csv(model_input['project_attrs'], index_col=[0]),
+                pd.read_csv(model_input['project_reqs'], index_col=[0,1,2]),
+                resource_attrs,
+                busy_calendar(resource_attrs, args.days, seed=args.seed),
+                model_input["date0_str"],
+                **extra
+                )
+            for compress_busy in (False, True):
+                rows.append(run(model_class, model_input_file, compress_busy, args.max_time))
+    print(pd.DataFrame(rows).to_markdown(index=False))
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from capacity_calendar import capacity_profile, apply_calendar
+from synthetic import portfolio, busy_calendar, vacation_calendar, stoch_task, write_instance
+from bench_scaling import bench_parser, solve_case, solver_row
+
+# Benchmark: Capacity Calendar vs Capacity Variations Faked as Daily Busy Rows
+# A Synthetic Portfolio With Weekend and Vacation Capacity Changes, Encoded Three Ways:
+#   daily      Unavailable Capacity Written Into resource_busy, One Fixed Interval per Day
+#   compiled   Same resource_busy, Compiled Into Fewest Fixed Intervals (compress_busy)
+#   calendar   resource_busy Plus a resource_calendar of Ranges (Compiled Together)
+
+def run(model_class, model_input_file, compress_busy, max_time):
+    mod, build_s = solve_case(model_class, model_input_file, max_time, compress_busy=compress_busy)
+    proto = mod.model.Proto()
+    return {
+        "model": model_class.__name__,
+        "fixed_intervals": sum(c.HasField("interval") and not c.interval.start.vars for c in proto.constraints),
+        "constraints": len(proto.constraints),
+        "build_s": build_s,
+        **solver_row(mod.solver),
+        }
+
+if __name__ == "__main__":
+    parser = bench_parser(
+        "Compare capacity calendars with capacity faked as daily busy rows", projects=5, resources=4, days=365, max_time=30.0, seed=0
+        )
+    parser.add_argument("--vacations", type=int, default=8, help="vacation ranges per resource")
+    args = parser.parse_args()
+
+    date0_str = "2023-05-01"
+    project_attrs, project_reqs, resource_attrs = portfolio(args.projects, args.resources, seed=args.seed)
+    calendar = vacation_calendar(resource_attrs, args.days, date0_str, args.vacations, args.seed)
+    # Prior Commitments Within Each Day's Calendar Capacity
+    capacity = capacity_profile(calendar, resource_attrs["Capacity"], pd.Timestamp(date0_str).date(), args.days)
+    busy = busy_calendar(resource_attrs, args.days, seed=args.seed)
+    busy[:] = np.minimum(busy.to_numpy(), capacity.to_numpy()[:args.days])
+    # Vacations Only Lower Capacity: the Faked Load Needs No Tail Past the Calendar
+    faked_attrs, faked_busy = apply_calendar(resource_attrs, busy, calendar, pd.Timestamp(date0_str).date())
+    extra = {"stoch_task": stoch_task(project_reqs, seed=args.seed), "render": "off"}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        daily_file = write_instance(os.path.join(tmpdir, "daily"), "bench", project_attrs, project_reqs, faked_attrs, faked_busy, date0_str, **extra)
+        calendar_path = os.path.join(tmpdir, "calendar")
+        os.makedirs(calendar_path)
+        calendar.to_csv(os.path.join(calendar_path, "resource_calendar.csv"), index=False)
+        calendar_file = write_instance(
+            calendar_path, "bench", project_attrs, project_reqs, resource_attrs, busy, date0_str,
+            resource_calendar=os.path.join(calendar_path, "resource_calendar.csv"), **extra
+            )
+        for model_class in (Model, Model2P):
+            for encoding, model_input_file, compress_busy in (
+                    ("daily", daily_file, False), ("compiled", daily_file, True), ("calendar", calendar_file, True)):
+                rows.append(dict(encoding=encoding, **run(model_class, model_input_file, compress_busy, args.max_time)))
+                print(rows[-1], flush=True)
+    print("Calendar: {} Rows; Faked Busy Calendar: {} Days x {} Resources".format(len(calendar), *faked_busy.shape))
+    print(pd.DataFrame(rows).to_markdown(index=False))
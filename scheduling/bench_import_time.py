@@ -0,0 +1,55 @@
+import argparse
+import os
+import subprocess
+import sys
+import pandas as pd
+
+# Benchmark and Guard: Import Time of Scheduling Modules (python -X importtime)
+# Usage (From Repository Root): python scheduling/bench_import_time.py
+# Exits With Status 1 if Importing a Module Loads a Plotting Library
+
+MODULES = ["one_period_v2", "stoch_duration_v1", "stoch_duration_v0", "one_period_model", "rolling_horizon"]
+PLOTTING = ("plotly", "matplotlib", "kaleido")
+
+def import_times(module: str) -> pd.DataFrame:
+    "Self and Cumulative Import Time (Microseconds) per Imported Module, in a Fresh Interpreter"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return pd.DataFrame(rows, columns=["module", "self_us", "cumulative_us"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import time of scheduling modules")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--top", type=int, default=3, help="heaviest top-level packages to list")
+    args = parser.parse_args()
+
+    rows, failed = [], []
+    for module in args.modules:
+        times = import_times(module)
+        package = times["module"].str.split(".").str[0]
+        plotting = sorted(set(package[package.isin(PLOTTING)]))
+        top_level = times.loc[times["module"] == package].sort_values("cumulative_us", ascending=False)
+        rows.append({
+            "module": module,
+            "import_ms": round(times.loc[times["module"] == module, "cumulative_us"].sum() / 1000, 1),
+            "modules_loaded": len(times),
+            "heaviest": ", ".join(
+                "{} {:.0f}ms".format(name, us / 1000)
+                for name, us in top_level[["module", "cumulative_us"]].head(args.top).values
+                ),
+            "plotting": ", ".join(plotting) or "-",
+            })
+        if plotting:
+            failed.append(module)
+    print(pd.DataFrame(rows).to_markdown(index=False))
+    if failed:
+        print("\nPlotting libraries loaded at import time by: {}".format(", ".join(failed)))
+        sys.exit(1)
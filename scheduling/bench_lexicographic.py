@@ -0,0 +1,67 @@
+import contextlib
+import io
+import os
+import tempfile
+import pandas as pd
+from ortools.sat.python import cp_model
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from lexicographic import stage_terms, integer_coefficients
+from bench_scaling import bench_parser, synthetic_instance, solve_case
+
+# Benchmark: Lexicographic Stages vs One Solve of a Big-M Weighted Objective
+# Goal: Minimize Tardiness, Then Cost. Two Runs per Model on a Synthetic Portfolio:
+#   lexicographic   tardiness Stage, Then cost Stage, stage-time Seconds Each
+#   weighted        One Solve of M x tardiness + cost, 2 x stage-time Seconds, With M Larger Than
+#                   Any Cost Difference so Tardiness Always Comes First
+
+def term_value(solver, term) -> float:
+    return sum(c * solver.Value(v) for v, c in zip(term.variables, term.coefficients)) + term.offset
+
+def big_m(model, term) -> int:
+    "One More Than the Largest Possible Change of a Term"
+    proto = model.Proto()
+    span = sum(abs(c) * (proto.variables[v.Index()].domain[-1] - proto.variables[v.Index()].domain[0]) for v, c in zip(term.variables, term.coefficients))
+    return int(span) + 1
+
+def run(model_class, model_input_file, method, stage_time):
+    if method == "lexicographic":
+        stages = [{"objective": "tardiness"}, {"objective": "cost"}]
+        mod, _ = solve_case(model_class, model_input_file, stage_time, lexicographic=stages)
+        terms = stage_terms(mod.objective_terms())
+        wall_time = sum(stage.wall_time for stage in mod.stages)
+    else:
+        mod, _ = solve_case(model_class, model_input_file)
+        terms = stage_terms(mod.objective_terms())
+        scale, tardiness = integer_coefficients(terms["tardiness"].coefficients)
+        m = scale * big_m(mod.model, terms["cost"])
+        mod.model.Minimize(
+            m * cp_model.LinearExpr.WeightedSum(terms["tardiness"].variables, tardiness)
+            + scale * cp_model.LinearExpr.WeightedSum(terms["cost"].variables, terms["cost"].coefficients)
+            )
+        with contextlib.redirect_stdout(io.StringIO()):
+            mod.solve(max_time=2 * stage_time)
+        wall_time = mod.solver.WallTime()
+    row = {"model": model_class.__name__, "method": method, "status": mod.solver.StatusName(), "wall_s": round(wall_time, 2)}
+    if row["status"] in ("OPTIMAL", "FEASIBLE"):
+        row["tardiness"] = round(term_value(mod.solver, terms["tardiness"]), 3)
+        row["cost"] = round(term_value(mod.solver, terms["cost"]), 1)
+    if method == "lexicographic":
+        row["stages"] = " / ".join("{} {}".format(stage.status, stage.wall_time) for stage in mod.stages)
+    else:
+        row["stages"] = "M = {:,}".format(m)
+    return row
+
+if __name__ == "__main__":
+    parser = bench_parser("Lexicographic stages vs a big-M weighted objective", projects=6, resources=4, days=60, seed=0)
+    parser.add_argument("--stage-time", type=float, default=20, help="solver time limit per stage (seconds)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_input_file, _ = synthetic_instance(os.path.join(tmpdir, "bench"), args.projects, args.resources, args.days, args.seed)
+        for model_class in (Model, Model2P):
+            for method in ("lexicographic", "weighted"):
+                rows.append(run(model_class, model_input_file, method, args.stage_time))
+                print(rows[-1], flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
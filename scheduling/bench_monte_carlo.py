@@ -0,0 +1,60 @@
+import os
+import tempfile
+import time
+import yaml
+import pandas as pd
+from stoch_duration_v1 import Model2P
+from bench_scaling import bench_parser, solve_case, solver_row
+
+# Benchmark: Convergence of the Sample-Average Objective With the Number of Scenarios
+# The Example Planner's Bypass Event Is Replaced by Monte Carlo Durations. For Each K, Two Models:
+#   reduced   samples Draws Reduced to K Medoid Scenarios (K = samples Is the Full-Sample Model)
+#   sampled   K Draws Used as Equally Likely Scenarios, Without Reduction
+# Both Should Approach the Full-Sample Objective as K Grows, the Reduced Model Typically Sooner.
+
+def duration_config(model_input_file: str, path: str, name: str, **duration_uncertainty) -> str:
+    "Copy of a Configuration With Its Scenario Events Replaced by Monte Carlo Durations"
+    with open(model_input_file, 'r') as f:
+        model_input = yaml.safe_load(f)
+    for key in ("stoch_task", "scenario_tree"):
+        model_input.pop(key, None)
+    model_input.update(render="off", report_path=os.path.join(path, "{}"), duration_uncertainty=duration_uncertainty)
+    os.makedirs(path, exist_ok=True)
+    new_model_input_file = os.path.join(path, "{}.yml".format(name))
+    with open(new_model_input_file, 'w') as f:
+        yaml.safe_dump(model_input, f, sort_keys=False)
+    return new_model_input_file
+
+def run(model_input_file: str, max_time: float) -> dict:
+    t0 = time.perf_counter()
+    mod, _ = solve_case(Model2P, model_input_file, max_time)
+    total_s = time.perf_counter() - t0
+    # Sampling and Reduction Happen While Loading: build_s Is Everything Before the Solve
+    row = {"scenarios": len(mod.prob), "variables": len(mod.model.Proto().variables)}
+    row.update(solver_row(mod.solver), build_s=round(total_s - mod.solver.WallTime(), 3))
+    return row
+
+if __name__ == "__main__":
+    parser = bench_parser("Sample-average objective vs number of Monte Carlo duration scenarios", max_time=60.0, seed=0)
+    parser.add_argument("--config", default="scheduling/stoch_duration_example_V1.yml", help="base model configuration")
+    parser.add_argument("--samples", type=int, default=48, help="Monte Carlo draws before reduction")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="scenario counts K")
+    parser.add_argument("--distribution", default="triangular", choices=["triangular", "lognormal"])
+    parser.add_argument("--resolves-project", default="regsize")
+    parser.add_argument("--resolves-task", default="T04_Eval_Pass_A")
+    args = parser.parse_args()
+
+    resolves_after = {"project": args.resolves_project, "task": args.resolves_task}
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for k in args.scenarios:
+            for method, samples in (("reduced", args.samples), ("sampled", k)):
+                if method == "sampled" and k == args.samples:
+                    continue
+                model_input_file = duration_config(
+                    args.config, os.path.join(tmpdir, "{}_{}".format(method, k)), "bench",
+                    distribution=args.distribution, samples=samples, scenarios=k, seed=args.seed, resolves_after=resolves_after
+                    )
+                rows.append(dict(K=k, method=method, **run(model_input_file, args.max_time)))
+                print(rows[-1], flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import pandas as pd
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from synthetic import portfolio, busy_calendar, stoch_task, write_instance
+from bench_scaling import bench_parser, solve_case, solver_row
+
+# Benchmark: Solve With and Without the Dominated Option Presolve (option_presolve)
+# A Synthetic Portfolio With Wide Option Sets (Every Task May Use Any Resource); the First ample
+# Resources Get a Capacity Large Enough That They Never Run Short, Which Is When Their Faster,
+# Cheaper Options Provably Dominate. Both Runs Should Reach the Same Objective.
+
+def run(model_class, model_input_file, presolve_options, max_time):
+    mod, _ = solve_case(model_class, model_input_file, max_time, presolve_options=presolve_options)
+    proto = mod.model.Proto()
+    return {
+        "model": model_class.__name__,
+        "presolve": presolve_options,
+        "options": mod.options.n_options,
+        "removed": len(mod.removed_options),
+        "booleans": sum(len(v.domain) == 2 and v.domain[0] == 0 and v.domain[1] == 1 for v in proto.variables),
+        "optional_intervals": sum(c.HasField("interval") and len(c.enforcement_literal) > 0 for c in proto.constraints),
+        **solver_row(mod.solver),
+        }
+
+if __name__ == "__main__":
+    parser = bench_parser(
+        "Solve with and without removing dominated resource options", projects=4, resources=6, days=60, max_time=60.0, seed=0
+        )
+    parser.add_argument("--ample", type=int, default=2, help="resources given ample capacity")
+    args = parser.parse_args()
+
+    project_attrs, project_reqs, resource_attrs = portfolio(
+        args.projects, args.resources, max_options=args.resources, seed=args.seed
+        )
+    resource_busy = busy_calendar(resource_attrs, args.days, seed=args.seed)
+    # Ample Capacity: Every Task Could Run on the Resource at Once Next to Its Prior Commitments
+    ample = resource_attrs.index[:args.ample]
+    resource_attrs.loc[ample, "Capacity"] = 2 * len(project_reqs) + resource_busy[ample].max()
+    extra = {"stoch_task": stoch_task(project_reqs, seed=args.seed), "render": "off"}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_input_file = write_instance(
+            os.path.join(tmpdir, "bench"), "bench", project_attrs, project_reqs, resource_attrs, resource_busy, **extra
+            )
+        for model_class in (Model, Model2P):
+            for presolve_options in (False, True):
+                rows.append(run(model_class, model_input_file, presolve_options, args.max_time))
+                print(rows[-1], flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
@@ -0,0 +1,108 @@
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+import pandas as pd
+from stoch_duration_v1 import Model2P
+from variable_registry import VariableRegistry, COLUMNS
+from bench_scaling import bench_parser, synthetic_instance, solve_case
+
+# Benchmark: Columnar Variable Registry vs Nested Dictionaries of Namedtuples
+# Memory (tracemalloc) of the Registry's Index Arrays vs the Former Model2P Structures (assign,
+# project_completion, completion_time, resource_needs) Holding cp_model Variable Objects, Both
+# Rebuilt From a Built Model; Extraction Time of All Option Values From One Solution.
+
+CompletionWin = namedtuple('CompletionWin', 'early tardy')
+TaskOption = namedtuple('TaskOption','resource interval is_active option')
+Task = namedtuple('Task', 'task start end options mult')
+
+def legacy_structures(mod) -> tuple:
+    "Former Model2P Variable Structures, Rebuilt From the Registry of a Built Model"
+    reg, options = mod.registry, mod.options
+    assign = {scenario: {} for scenario in mod.prob}
+    project_completion, completion_time, resource_needs = {}, {}, {}
+    for scenario in mod.prob:
+        for project in mod.projects:
+            c = options.chain_id(scenario, project)
+            project_completion[scenario, project] = CompletionWin(reg.var(reg.early[c]), reg.var(reg.tardy[c]))
+            tasks = []
+            for group in options.task_groups(options.chain(scenario, project)):
+                k, mult = group.index, len(group.options) > 1
+                tasks.append(Task(group.task, reg.var(reg.start[k]), reg.var(reg.end[k]), [], mult))
+                for option in group.options:
+                    i = option.index
+                    interval, is_active = reg.interval_var(reg.interval[i]), reg.literal(reg.active[i])
+                    if mult:
+                        completion_time.setdefault((scenario, project, group.task), []).append(reg.var(reg.option_end[i]))
+                    tasks[-1].options.append(TaskOption(option.resource, interval, is_active, i))
+                    resource_needs.setdefault((scenario, option.resource), []).append((interval, option.units))
+            assign[scenario][project] = tasks
+        for resource, (intervals, units) in reg.busy.items():
+            resource_needs.setdefault((scenario, resource), []).extend(
+                (reg.interval_var(i), u) for i, u in zip(intervals.tolist(), units.tolist())
+                )
+    return assign, project_completion, completion_time, resource_needs
+
+def columnar_copy(mod) -> VariableRegistry:
+    copy = VariableRegistry(mod.model, mod.options)
+    for column in COLUMNS:
+        setattr(copy, column, getattr(mod.registry, column).copy())
+    copy.busy = {resource: (intervals.copy(), units.copy()) for resource, (intervals, units) in mod.registry.busy.items()}
+    return copy
+
+def traced_kb(build) -> tuple:
+    "Memory Retained by build() (KB), Keeping Its Result Alive While Measuring"
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return round(size / 1024, 1), result
+
+def legacy_extract(solver, assign) -> list:
+    return [
+        (scenario, project, tstruct.task, rstruct.resource,
+         solver.Value(rstruct.interval.StartExpr()), solver.Value(rstruct.interval.EndExpr()), bool(solver.Value(rstruct.is_active)))
+        for scenario, projects in assign.items()
+        for project, tasks in projects.items()
+        for tstruct in tasks
+        for rstruct in tstruct.options
+        ]
+
+def columnar_extract(mod) -> pd.DataFrame:
+    rows = mod.registry.present()
+    values = mod.registry.option_values(mod.solver.ResponseProto().solution)
+    df = mod.options.label_frame()[rows]
+    return df.assign(Start=values.start[rows], Finish=values.end[rows], Is_Active=values.active[rows])
+
+def run(model_input_file: str, max_time: float) -> dict:
+    mod, _ = solve_case(Model2P, model_input_file, max_time)
+    legacy_kb, legacy = traced_kb(lambda: legacy_structures(mod))
+    columnar_kb, _ = traced_kb(lambda: columnar_copy(mod))
+    row = {"options": mod.options.n_options, "legacy_kb": legacy_kb, "columnar_kb": columnar_kb}
+    row["memory_ratio"] = round(legacy_kb / max(columnar_kb, 0.1), 1)
+    if mod.solver.StatusName() in ("OPTIMAL", "FEASIBLE"):
+        t0 = time.perf_counter()
+        legacy_values = legacy_extract(mod.solver, legacy[0])
+        t1 = time.perf_counter()
+        columnar_values = columnar_extract(mod)
+        t2 = time.perf_counter()
+        assert sorted(legacy_values) == sorted(columnar_values.itertuples(index=False, name=None))
+        row.update(legacy_extract_s=round(t1 - t0, 4), columnar_extract_s=round(t2 - t1, 4))
+    return row
+
+if __name__ == "__main__":
+    args = bench_parser(
+        "Memory of the columnar variable registry vs nested dictionaries",
+        projects=[10, 40, 160], resources=3, days=60, max_time=5.0, seed=0
+        ).parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_projects in args.projects:
+            model_input_file, _ = synthetic_instance(
+                "{}/p{}".format(tmpdir, n_projects), n_projects, args.resources, args.days, args.seed
+                )
+            rows.append(dict(projects=n_projects, **run(model_input_file, args.max_time)))
+            print(rows[-1], flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
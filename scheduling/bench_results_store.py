@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from stoch_duration_v1 import Model2P
+from results_store import ResultsStore
+from synthetic import copy_config
+from bench_scaling import bench_parser, solve_case
+
+# Benchmark: Indexed Queries Over Thousands of Stored Runs
+# The Example Stochastic Planner Is Solved Once and Recorded runs Times; Each Query Is Timed
+# on the Growing Store, and the Full Assignment Scan Is Read in Chunks, Tracking Peak Memory.
+
+def timed(query) -> tuple:
+    t0 = time.perf_counter()
+    result = query()
+    return round(time.perf_counter() - t0, 4), result
+
+def chunked_scan(store, chunksize: int) -> tuple:
+    "Active Option Count of All Runs, Read chunksize Rows at a Time; Returns (Rows, Peak KB)"
+    tracemalloc.start()
+    rows = sum(int(chunk["Is_Active"].sum()) for chunk in store.assignments(chunksize=chunksize))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, round(peak / 1024, 1)
+
+def queries(store, n_runs: int, mod) -> dict:
+    project, resource = mod.projects[0], mod.resources[0]
+    start = mod.get_date(10).isoformat()
+    end = mod.get_date(20).isoformat()
+    row = {"runs": n_runs}
+    row["one_run_s"], _ = timed(lambda: store.assignments(n_runs // 2))
+    row["project_s"], df = timed(lambda: store.assignments(project=project))
+    row["project_rows"] = len(df)
+    row["resource_dates_s"], df = timed(lambda: store.assignments(resource=resource, start=start, end=end))
+    row["resource_date_rows"] = len(df)
+    row["utilization_s"], _ = timed(lambda: store.utilization(n_runs // 2, resource=resource, start=start, end=end))
+    t0 = time.perf_counter()
+    row["active_rows"], row["scan_peak_kb"] = chunked_scan(store, 10000)
+    row["scan_s"] = round(time.perf_counter() - t0, 3)
+    return row
+
+if __name__ == "__main__":
+    parser = bench_parser("Query times of the results store as runs accumulate", max_time=30.0)
+    parser.add_argument("--runs", type=int, nargs="+", default=[100, 1000, 4000], help="store sizes (runs)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir, ResultsStore(os.path.join(tmpdir, "runs.sqlite")) as store:
+        model_input_file = copy_config("scheduling/stoch_duration_example_V1.yml", os.path.join(tmpdir, "schedV3"), "bench", render="off")
+        mod, _ = solve_case(Model2P, model_input_file, args.max_time)
+        mod.extract_results()
+        mod.project_report()
+        utilization = mod.utilization()
+        recorded = 0
+        for n_runs in sorted(args.runs):
+            t0, added = time.perf_counter(), n_runs - recorded
+            while recorded < n_runs:
+                store.record(mod, utilization)
+                recorded += 1
+            row = {"record_ms": round(1000 * (time.perf_counter() - t0) / max(added, 1), 2)}
+            row.update(queries(store, n_runs, mod))
+            row["store_mb"] = round(os.path.getsize(store.path) / (1 << 20), 1)
+            rows.append(row)
+            print(rows[-1], flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
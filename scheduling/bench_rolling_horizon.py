@@ -0,0 +1,63 @@
+import contextlib
+import io
+import tempfile
+import time
+import pandas as pd
+from one_period_v2 import Model
+from rolling_horizon import RollingHorizon
+from bench_scaling import bench_parser, synthetic_instance, solve_case
+
+# Benchmark: Rolling-Horizon Decomposition vs Monolithic one_period_v2 Model
+# Monolithic Runs Get --max-time Seconds; Rolling Horizon Gets --window-time Seconds per Window
+
+def run_monolithic(model_input_file, max_time):
+    t0 = time.perf_counter()
+    mod, _ = solve_case(Model, model_input_file, max_time)
+    found = mod.solver.StatusName() in ("OPTIMAL", "FEASIBLE")
+    return {
+        "method": "monolithic",
+        "windows": 1,
+        "total_s": round(time.perf_counter() - t0, 3),
+        "status": mod.solver.StatusName(),
+        "objective": mod.solver.ObjectiveValue() if found else None,
+        "bound": mod.solver.BestObjectiveBound(),
+        }
+
+def run_rolling(model_input_file, window, overlap, window_time):
+    mod = RollingHorizon("bench", window=window, overlap=overlap)
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        mod.get_inputs(model_input_file)
+        mod.solve(max_time=window_time)
+    found = mod.full.solver.StatusName() in ("OPTIMAL", "FEASIBLE")
+    return {
+        "method": "rolling {}/{}".format(window, overlap),
+        "windows": len(mod.window_stats),
+        "total_s": round(time.perf_counter() - t0, 3),
+        "status": mod.full.solver.StatusName(),
+        "objective": mod.full.solver.ObjectiveValue() if found else None,
+        "bound": None,
+        }
+
+if __name__ == "__main__":
+    parser = bench_parser(
+        "Compare rolling-horizon and monolithic solves", projects=[50, 200], resources=3, days=60, max_time=60.0, seed=0
+        )
+    parser.add_argument("--windows", type=int, nargs="+", default=[30, 60], help="window sizes (days)")
+    parser.add_argument("--overlap", type=int, default=10, help="window overlap (days)")
+    parser.add_argument("--window-time", type=float, default=10, help="solver time limit per window (seconds)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_projects in args.projects:
+            model_input_file, project_reqs = synthetic_instance(
+                "{}/p{}".format(tmpdir, n_projects), n_projects, args.resources, args.days, args.seed
+                )
+            results = [run_monolithic(model_input_file, args.max_time)]
+            results += [run_rolling(model_input_file, window, args.overlap, args.window_time) for window in args.windows]
+            for row in results:
+                row = dict(projects=n_projects, tasks=len(project_reqs.groupby(level=[0,1])), **row)
+                rows.append(row)
+                print(row, flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
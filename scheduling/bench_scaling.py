@@ -0,0 +1,196 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import datetime
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import pandas as pd
+from synthetic import portfolio, busy_calendar, stoch_task, write_instance
+
+# Benchmark Suite: Scaling of the Scheduling Models on Seeded Synthetic Instances
+# Usage (From Repository Root): python scheduling/bench_scaling.py --projects 10 40 160 --out bench_scaling.json
+# Each Case Runs in a Fresh Process, so Peak Memory (Max RSS) Belongs to That Case Alone.
+# Phases: load (get_inputs), build, solve, extract (Results, Completion Report and Utilization
+# Tables) and report (report_results, Which Extracts Again and Writes Files; Charts Off).
+# Results Are Written as JSON; --baseline Compares Against a Previous Run's JSON.
+# The Other bench_* Scripts (Also Run From the Repository Root; --help Lists Their Options) Share
+# solve_case (Quiet Load, Build and Solve of One Model), solver_row (Status, Time, Objective and
+# Bound), synthetic_instance (a Seeded Portfolio Written to a Directory) and bench_parser.
+
+MODELS = {
+    "one_period_v2": ("one_period_v2", "Model"),
+    "stoch_duration_v0": ("stoch_duration_v0", "Model2P"),
+    "stoch_duration_v1": ("stoch_duration_v1", "Model2P"),
+    }
+PHASES = ["load_s", "build_s", "solve_s", "extract_s", "report_s"]
+
+def max_rss_mb() -> float:
+    "Peak Resident Set Size of This Process (ru_maxrss is in KB on Linux, Bytes on macOS)"
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1 << 20 if platform.system() == "Darwin" else 1 << 10), 1)
+
+def model_size(proto) -> dict:
+    kinds = pd.Series([ct.WhichOneof("constraint") for ct in proto.constraints], dtype=object).value_counts()
+    return {
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "intervals": int(kinds.get("interval", 0)),
+        "cumulatives": int(kinds.get("cumulative", 0)),
+        }
+
+HELP = {
+    "projects": "sizes of synthetic portfolios",
+    "days": "length of the busy calendar",
+    "max_time": "solver time limit per run (seconds)",
+    }
+
+def bench_parser(description: str, **defaults) -> argparse.ArgumentParser:
+    "Parser With the Common Arguments Given Defaults (projects, resources, days, max_time, seed); Lists Take nargs='+'"
+    parser = argparse.ArgumentParser(description=description)
+    for key, default in defaults.items():
+        many = isinstance(default, list)
+        parser.add_argument(
+            "--" + key.replace("_", "-"), type=type(default[0] if many else default), nargs="+" if many else None,
+            default=default, help=HELP.get(key)
+            )
+    return parser
+
+def synthetic_instance(path: str, n_projects: int, n_resources: int, days: int, seed: int, **model_input) -> tuple:
+    "Seeded Portfolio, Busy Calendar and Stochastic Task Written to path (Charts Off); Returns (Configuration File, project_reqs)"
+    project_attrs, project_reqs, resource_attrs = portfolio(n_projects, n_resources, seed=seed)
+    model_input = dict({"render": "off", "stoch_task": stoch_task(project_reqs, seed=seed)}, **model_input)
+    model_input_file = write_instance(
+        path, "bench", project_attrs, project_reqs, resource_attrs, busy_calendar(resource_attrs, days, seed=seed), **model_input
+        )
+    return model_input_file, project_reqs
+
+def solve_case(model_class, model_input_file: str, max_time: float=None, profile: str=None, **settings) -> tuple:
+    """
+    Load, Build and (Unless max_time Is None) Solve One Model With Its Printing Suppressed;
+    settings Override Model Switches (compress_busy, break_symmetry, ...). Returns (Model, Build Seconds)
+    """
+    mod = model_class("bench")
+    for key, value in settings.items():
+        setattr(mod, key, value)
+    with contextlib.redirect_stdout(io.StringIO()):
+        mod.get_inputs(model_input_file)
+        t0 = time.perf_counter()
+        mod.build_model()
+        build_s = round(time.perf_counter() - t0, 3)
+        if max_time is not None:
+            mod.solve(max_time=max_time, profile=profile)
+    return mod, build_s
+
+def solver_row(solver) -> dict:
+    "Status, Solve Time, Objective and Bound of a Solve (No Objective or Bound Without a Solution)"
+    found = solver.StatusName() in ("OPTIMAL", "FEASIBLE")
+    return {
+        "status": solver.StatusName(),
+        "solve_s": round(solver.WallTime(), 3),
+        "objective": solver.ObjectiveValue() if found else None,
+        "bound": solver.BestObjectiveBound() if found else None,
+        }
+
+def run_case(model: str, model_input_file: str, max_time: float) -> dict:
+    "Time Each Phase of One Model on One Instance"
+    module, class_name = MODELS[model]
+    model_class = getattr(importlib.import_module(module), class_name)
+    row = {"model": model, "rss_base_mb": max_rss_mb()}
+    mod = model_class("bench")
+    times = [time.perf_counter()]
+    with contextlib.redirect_stdout(io.StringIO()):
+        mod.get_inputs(model_input_file)
+        times.append(time.perf_counter())
+        mod.build_model()
+        times.append(time.perf_counter())
+        mod.solve(max_time=max_time)
+        times.append(time.perf_counter())
+        found = mod.solver.StatusName() in ("OPTIMAL", "FEASIBLE")
+        if found:
+            mod.collect_results()
+            mod.project_report()
+            mod.utilization()
+        times.append(time.perf_counter())
+        if found:
+            mod.report_results()
+        times.append(time.perf_counter())
+    row.update(zip(PHASES, [round(t1 - t0, 3) for t0, t1 in zip(times[:-1], times[1:])]))
+    row["peak_rss_mb"] = max_rss_mb()
+    row.update(model_size(mod.model.Proto()))
+    row["status"] = mod.solver.StatusName()
+    row["objective"] = mod.solver.ObjectiveValue() if found else None
+    row["bound"] = mod.solver.BestObjectiveBound() if found else None
+    return row
+
+def run_isolated(model: str, model_input_file: str, max_time: float) -> dict:
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_case, model, model_input_file, max_time).result()
+
+def environment() -> dict:
+    "Versions and Machine, to Tell Runs Apart When Tracking Regressions"
+    import ortools
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "ortools": ortools.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        }
+
+def compare(results: pd.DataFrame, baseline: pd.DataFrame) -> pd.DataFrame:
+    "Phase Times and Peak Memory Relative to a Baseline Run (Ratio > 1 is Slower or Larger)"
+    keys = ["projects", "model"]
+    columns = PHASES + ["peak_rss_mb", "variables", "constraints"]
+    merged = results.merge(baseline, on=keys, suffixes=("", "_base"))
+    out = merged[keys].copy()
+    for column in columns:
+        out[column] = (merged[column] / merged[column + "_base"].where(merged[column + "_base"] > 0)).round(2)
+    return out
+
+if __name__ == "__main__":
+    parser = bench_parser(
+        "Scaling benchmark of the scheduling models on synthetic instances",
+        projects=[10, 40, 160], resources=3, days=60, max_time=20.0, seed=0
+        )
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--out", default="bench_scaling.json", help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_projects in args.projects:
+            model_input_file, project_reqs = synthetic_instance(
+                "{}/p{}".format(tmpdir, n_projects), n_projects, args.resources, args.days, args.seed
+                )
+            size = {"projects": n_projects, "tasks": len(project_reqs.groupby(level=[0,1])), "options": len(project_reqs)}
+            for model in args.models:
+                row = dict(size, **run_isolated(model, model_input_file, args.max_time))
+                rows.append(row)
+                print(row, flush=True)
+    config = {key: value for key, value in vars(args).items() if key not in ("out", "baseline")}
+    with open(args.out, 'w') as f:
+        json.dump({"environment": environment(), "config": config, "results": rows}, f, indent=1)
+    results = pd.DataFrame(rows)
+    print(results.drop(columns=["objective", "bound"]).to_markdown(index=False))
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as f:
+            baseline = pd.DataFrame(json.load(f)["results"])
+        print("\nRelative to {}\n".format(args.baseline))
+        print(compare(results, baseline).to_markdown(index=False))
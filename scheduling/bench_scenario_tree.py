@@ -0,0 +1,85 @@
+import math
+import tempfile
+import yaml
+import pandas as pd
+from stoch_duration_v1 import Model2P
+from synthetic import write_instance
+from bench_scaling import bench_parser, solve_case, solver_row
+
+# Benchmark: Model2P Build Time, Model Size and Solve Time vs Number of Scenarios
+# Each Size Is Also Solved With the Events Listed in Reverse, Which Must Not Change the Objective.
+# Linked Scenario Pairs (Non-Anticipativity Links) of Binary Events Equal (S/2) x log2 S.
+
+# Binary Bypass Events on the examples/schedV3 Portfolio: (Project, Resolves After Task, Bypassed Tasks)
+EVENTS = [
+    ("regsize", "T04_Eval_Pass_A", ["T05_Soln_Pass_B", "T06_Eval_Pass_B"]),
+    ("longasap", "T04_Eval_Pass_A", ["T07_Soln_Pass_C", "T08_Eval_Pass_C"]),
+    ("long", "T04_Eval_Pass_A", ["T07_Soln_Pass_C", "T08_Eval_Pass_C"]),
+    ("short", "T03_Soln_Pass_A", ["T11_Clinical_Study_Report"]),
+    ("longasap", "T09_Clinical_Study_Design", ["T11_Clinical_Study_Report"]),
+    ("long", "T09_Clinical_Study_Design", ["T11_Clinical_Study_Report"]),
+    ("regsize", "T09_Clinical_Study_Design", ["T12_Documentation_to_Client"]),
+    ]
+
+def scenario_tree(n_events, bypass_probability=0.3):
+    return [
+        {
+            "event": "E{}_{}".format(e, project),
+            "resolves_after": {"project": project, "task": resolves_after},
+            "outcomes": [
+                {"name": "B{}".format(e), "probability": 1 - bypass_probability},
+                {"name": "X{}".format(e), "probability": bypass_probability,
+                 "bypass": [[project, task] for task in bypass]},
+                ]
+        }
+        for e, (project, resolves_after, bypass) in enumerate(EVENTS[:n_events])
+        ]
+
+def run(model_input_file, max_time):
+    mod, build_s = solve_case(Model2P, model_input_file, max_time)
+    proto = mod.model.Proto()
+    n_scenarios = len(mod.prob)
+    return {
+        "scenarios": n_scenarios,
+        "tree_nodes": len(mod.scenario_tree.nodes),
+        "linked_pairs": sum(len(node.scenarios) - 1 for node in mod.scenario_tree.nodes),
+        "half_s_log2_s": round(n_scenarios * math.log2(n_scenarios) / 2),
+        "all_pairs": n_scenarios * (n_scenarios - 1) // 2,
+        "variables": len(proto.variables),
+        "constraints": len(proto.constraints),
+        "build_s": build_s,
+        **solver_row(mod.solver),
+        }
+
+if __name__ == "__main__":
+    parser = bench_parser("Scale Model2P over scenario trees", max_time=60.0)
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[2, 8, 32, 128], help="powers of two, up to 128")
+    args = parser.parse_args()
+
+    with open("scheduling/stoch_duration_example_V1.yml", 'r') as f:
+        model_input = yaml.safe_load(f)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_scenarios in args.scenarios:
+            events = scenario_tree(int(math.log2(n_scenarios)))
+            runs = []
+            for order, tree in (("listed", events), ("reversed", events[::-1])):
+                model_input_file = write_instance(
+                    "{}/s{}_{}".format(tmpdir, n_scenarios, order),
+                    "bench",
+                    pd.read_csv(model_input['project_attrs'], index_col=[0]),
+                    pd.read_csv(model_input['project_reqs'], index_col=[0,1,2]),
+                    pd.read_csv(model_input['resource_attrs'], index_col=[0]),
+                    pd.read_csv(model_input['resource_busy'], index_col=[0]),
+                    model_input["date0_str"],
+                    scenario_tree=tree
+                    )
+                runs.append(run(model_input_file, args.max_time))
+            row, reversed_run = runs
+            row["reversed_objective"] = reversed_run["objective"]
+            # Event Order Carries No Information: Proven Optima Must Agree
+            if row["status"] == reversed_run["status"] == "OPTIMAL" and abs(row["objective"] - reversed_run["objective"]) > 1e-6:
+                raise RuntimeError("{} Scenarios: Objective {} Changes to {} With Events Reversed".format(
+                    n_scenarios, row["objective"], reversed_run["objective"]))
+            rows.append(row)
+    print(pd.DataFrame(rows).to_markdown(index=False))
@@ -0,0 +1,42 @@
+import tempfile
+import pandas as pd
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from solver_profiles import PROFILES
+from synthetic import copy_config
+from bench_scaling import bench_parser, synthetic_instance, solve_case, solver_row
+
+# Benchmark: Solver Profiles on Example and Synthetic Instances
+# Note: deterministic-replay Interprets --max-time as Deterministic Time; With Fewer Cores
+# Than Workers its Wall Time Can Be Much Longer Than --max-time
+
+def run(model_class, model_input_file, profile, max_time):
+    mod, _ = solve_case(model_class, model_input_file, max_time, profile)
+    row = {"profile": profile, "workers": mod.solver.parameters.num_workers, **solver_row(mod.solver)}
+    found = row["objective"] is not None
+    row["gap"] = abs(row["objective"] - row["bound"]) / max(abs(row["objective"]), 1) if found else None
+    return row
+
+if __name__ == "__main__":
+    parser = bench_parser("Compare solver profiles", projects=[20, 60], resources=3, days=60, max_time=30.0, seed=0)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        instances = [
+            ("schedV2", Model, copy_config("scheduling/one_period_v2_example.yml", tmpdir + "/schedV2", "bench")),
+            ("schedV3", Model2P, copy_config("scheduling/stoch_duration_example_V1.yml", tmpdir + "/schedV3", "bench")),
+            ]
+        for n_projects in args.projects:
+            model_input_file, _ = synthetic_instance(
+                "{}/p{}".format(tmpdir, n_projects), n_projects, args.resources, args.days, args.seed
+                )
+            instances.append(("synthetic_{}".format(n_projects), Model, model_input_file))
+        for instance, model_class, model_input_file in instances:
+            for profile in args.profiles:
+                row = {"instance": instance}
+                row.update(run(model_class, model_input_file, profile, args.max_time))
+                rows.append(row)
+                print(row, flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
@@ -0,0 +1,54 @@
+import tempfile
+import pandas as pd
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from synthetic import portfolio, busy_calendar, stoch_task, write_instance
+from bench_scaling import bench_parser, solve_case, solver_row
+
+# Benchmark: Time to Prove Optimality With and Without Symmetry Breaking
+# Portfolios of Cloned Project Templates (Same Attributes and Requirements per Copy)
+
+def cloned_portfolio(n_templates: int, copies: int, n_resources: int, seed: int) -> tuple:
+    "Seeded Portfolio of n_templates Projects, Each Repeated copies Times"
+    project_attrs, project_reqs, resource_attrs = portfolio(n_templates, n_resources, tasks_per_project=(3, 6), seed=seed)
+    attrs = pd.concat([project_attrs.rename(lambda p: "{}_{}".format(p, c)) for c in range(copies)])
+    reqs = pd.concat([project_reqs.rename(lambda p: "{}_{}".format(p, c), level="Project") for c in range(copies)])
+    return attrs.sort_index(), reqs.sort_index(level="Project", sort_remaining=False), resource_attrs
+
+def run(model_class, model_input_file: str, break_symmetry: bool, max_time: float) -> dict:
+    mod, _ = solve_case(model_class, model_input_file, max_time, break_symmetry=break_symmetry)
+    symmetry = getattr(mod, "symmetry", {"projects": [], "resources": []})
+    return {
+        "model": model_class.__name__,
+        "break_symmetry": break_symmetry,
+        "project_groups": len(symmetry["projects"]),
+        **solver_row(mod.solver),
+        "branches": mod.solver.NumBranches(),
+        "conflicts": mod.solver.NumConflicts(),
+        }
+
+if __name__ == "__main__":
+    parser = bench_parser(
+        "Time to proof with and without symmetry breaking on cloned project templates",
+        resources=3, days=60, max_time=60.0, seed=0
+        )
+    parser.add_argument("--templates", type=int, default=3, help="distinct project templates")
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 2, 4], help="copies of each template")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for copies in args.copies:
+            project_attrs, project_reqs, resource_attrs = cloned_portfolio(args.templates, copies, args.resources, args.seed)
+            model_input_file = write_instance(
+                "{}/c{}".format(tmpdir, copies), "bench",
+                project_attrs, project_reqs, resource_attrs,
+                busy_calendar(resource_attrs, args.days, seed=args.seed),
+                render="off", stoch_task=stoch_task(project_reqs, seed=args.seed)
+                )
+            for model_class in (Model, Model2P):
+                for break_symmetry in (False, True):
+                    row = dict(projects=len(project_attrs), copies=copies, **run(model_class, model_input_file, break_symmetry, args.max_time))
+                    rows.append(row)
+                    print(row, flush=True)
+    print(pd.DataFrame(rows).to_markdown(index=False))
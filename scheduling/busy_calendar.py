@@ -0,0 +1,37 @@
+from collections import namedtuple
+
+BusyInterval = namedtuple('BusyInterval', 'start length demand')
+
+def compile_busy_profile(profile) -> list:
+    """
+    Compile a day-by-day demand profile into a minimal set of fixed intervals.
+
+    The profile is read as a skyline: each rise opens a layer of demand and each
+    drop closes (or trims) the layers above the new level. Summing the demand of
+    the returned intervals over any day reproduces the profile exactly, so they
+    can replace the one-interval-per-day encoding in AddCumulative.
+    """
+    out = []
+    stack = []          # Open Layers as [start, demand], Bottom First
+    level = 0
+    for t, height in enumerate(list(profile) + [0]):
+        height = int(height)
+        while level > height:
+            start, demand = stack[-1]
+            cut = min(demand, level - height)
+            out.append(BusyInterval(start, t - start, cut))
+            if cut == demand:
+                stack.pop()
+            else:
+                stack[-1][1] = demand - cut
+            level -= cut
+        if height > level:
+            stack.append([t, height - level])
+            level = height
+    return sorted(out)
+
+def busy_intervals(profile, compress: bool=True) -> list:
+    "Fixed Intervals for Prior Commitments, Compressed or One Per Busy Day"
+    if compress:
+        return compile_busy_profile(profile)
+    return [BusyInterval(t, 1, int(demand)) for t, demand in enumerate(profile) if demand > 0]
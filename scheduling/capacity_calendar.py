@@ -0,0 +1,80 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+
+# Time-Varying Resource Capacity From a Compact Calendar
+# A Calendar CSV Lists Ranges of Days With the Capacity of a Resource Over Them (Later Rows
+# Override Earlier Ones; Days Outside Any Range Keep the Capacity in resource_attrs):
+#   Resource,Start,End,Capacity
+#   Planner,2023-05-29,2023-06-02,1          Vacation: One Planner Off, End Day Included
+#   Generative,2023-06-05,2023-06-16,6       Contractor: One Extra Generative Resource
+# Each Resource's Cumulative Constraint Keeps One Capacity, Its Peak; the Capacity Not Available
+# on a Day (Peak - Calendar Capacity) Joins the Prior Commitments of resource_busy, so Both Are
+# Compiled Together Into the Fewest Fixed Intervals (busy_calendar.compile_busy_profile).
+# A Peak Above resource_attrs Is Only There Within Its Range: Every Later Day Carries the Load
+# Peak - resource_attrs, so Models Extend the Load Out to Their Horizon (calendar_days Gives the
+# Days the Horizon Counts, Like the Length of resource_busy Without a Calendar).
+
+CALENDAR_COLUMNS = ["Resource", "Start", "End", "Capacity"]
+
+def read_calendar(filename: str) -> pd.DataFrame:
+    calendar = pd.read_csv(filename, parse_dates=["Start", "End"])
+    missing = set(CALENDAR_COLUMNS) - set(calendar.columns)
+    if missing:
+        raise ValueError("Capacity Calendar {}: Missing Columns {}".format(filename, sorted(missing)))
+    return calendar[CALENDAR_COLUMNS]
+
+def capacity_profile(calendar: pd.DataFrame, capacity: pd.Series, datetime_0: date, days: int=0) -> pd.DataFrame:
+    """
+    Capacity per Day (Days After datetime_0) and Resource, Covering at Least days and the Last
+    Calendar Day; Ranges Before Day 0 Are Cut
+    """
+    t0 = pd.Timestamp(datetime_0)
+    start = (pd.to_datetime(calendar["Start"]) - t0).dt.days.to_numpy()
+    end = (pd.to_datetime(calendar["End"]) - t0).dt.days.to_numpy() + 1
+    unknown = set(calendar["Resource"]) - set(capacity.index)
+    if unknown:
+        raise ValueError("Unknown Resources in Capacity Calendar: {}".format(sorted(unknown)))
+    days = max([days] + end.tolist())
+    profile = np.tile(capacity.to_numpy(dtype=np.int64), (days, 1))
+    columns = capacity.index.get_indexer(calendar["Resource"])
+    for r, s, e, c in zip(columns.tolist(), start.tolist(), end.tolist(), calendar["Capacity"].tolist()):
+        profile[max(s, 0):max(e, 0), r] = c
+    return pd.DataFrame(profile, columns=capacity.index)
+
+def calendar_days(calendar: pd.DataFrame, datetime_0: date, days: int=0) -> int:
+    "Days Covered by days of Prior Commitments and the Calendar (Up to Its Last Day)"
+    end = (pd.to_datetime(calendar["End"]) - pd.Timestamp(datetime_0)).dt.days + 1
+    return max([days] + end.tolist())
+
+def apply_calendar(
+        resource_attrs: pd.DataFrame,
+        resource_busy: pd.DataFrame,
+        calendar: pd.DataFrame,
+        datetime_0: date,
+        days: int=0) -> tuple:
+    """
+    Resource Attributes With Capacity Raised to Each Resource's Peak and Prior Load per Day
+    (resource_busy Plus Capacity Not Available), Extended to the Last Calendar Day and to days
+    """
+    profile = capacity_profile(calendar, resource_attrs["Capacity"], datetime_0, max(days, len(resource_busy)))
+    peak = profile.max()
+    busy = np.zeros(profile.shape, dtype=np.int64)
+    known = [resource for resource in profile.columns if resource in resource_busy]
+    busy[:len(resource_busy), profile.columns.get_indexer(known)] = resource_busy[known].to_numpy()
+    load = busy + (peak.to_numpy() - profile.to_numpy())
+    over = load > peak.to_numpy()
+    if over.any():
+        day, r = np.argwhere(over)[0].tolist()
+        raise ValueError("Prior Commitments of {} on Day {} Exceed Its Calendar Capacity {}".format(
+            profile.columns[r], day, profile.iat[day, r]))
+    resource_attrs = resource_attrs.copy()
+    resource_attrs["Capacity"] = peak
+    return resource_attrs, pd.DataFrame(load, index=pd.RangeIndex(len(load), name="Day"), columns=profile.columns)
+
+def extend_load(resource_busy: pd.DataFrame, days: int) -> pd.DataFrame:
+    "Calendar Load Extended to days, Each New Day Carrying the Load of the Last (Peak - resource_attrs)"
+    if days <= len(resource_busy):
+        return resource_busy
+    index = np.minimum(np.arange(days), len(resource_busy) - 1)
+    return pd.DataFrame(resource_busy.to_numpy()[index], index=pd.RangeIndex(days, name="Day"), columns=resource_busy.columns)
@@ -0,0 +1,308 @@
+from one_period_v2 import Model
+from stoch_duration_v1 import Model2P
+from option_table import OptionTable, contiguous
+from task_windows import task_windows, completion_bounds
+from input_cache import apply_table_changes
+from capacity_calendar import extend_load
+import pandas as pd
+import numpy as np
+
+# What-If Edits of a Built Model, in Place on Its CpModel, Followed by a Warm-Started Re-Solve
+# Each Edit Replaces Only the Affected Constraints (Cleared Constraints Remain as Empty Slots in
+# the Proto), Shifts Only the Affected Objective Terms and Rewrites Variable Domains From the
+# Recomputed Task Windows. Removed Projects Keep Their Rows in the Option Table (and Their Now
+# Unconstrained Variables), so Option and Task Group Indices Stay Stable Across Edits.
+# Usage:
+#   mod = EditableModel('one_period_v2_example')
+#   mod.get_inputs(); mod.build_model(); mod.solve()
+#   mod.update_deadline('long', 45); mod.update_capacity('Planner', 3)
+#   mod.resolve(max_time=10)
+
+def add_objective(proto, expr, sign: int=1) -> None:
+    """
+    Add sign * expr to the (Minimized) Objective of a CpModelProto, Merging Coefficients of
+    Variables Already in It; an Integer Objective Becomes Floating Point if Needed
+    """
+    coeffs, constant, is_integer = expr.GetFloatVarValueMap()
+    if not proto.HasField("floating_point_objective") and not is_integer:
+        # Move Integer Objective (Value = scaling_factor * (Terms + offset)) to Floating Point
+        scale = proto.objective.scaling_factor or 1
+        floating = proto.floating_point_objective
+        floating.vars.extend(proto.objective.vars)
+        floating.coeffs.extend(scale * c for c in proto.objective.coeffs)
+        floating.offset = scale * proto.objective.offset
+        proto.ClearField("objective")
+    if proto.HasField("floating_point_objective"):
+        objective, scale = proto.floating_point_objective, 1
+    else:
+        objective, scale = proto.objective, proto.objective.scaling_factor or 1
+    terms = dict(zip(objective.vars, objective.coeffs))
+    for var, coeff in coeffs.items():
+        terms[var.Index()] = terms.get(var.Index(), 0) + sign * coeff / scale
+    terms = {var: coeff for var, coeff in terms.items() if coeff != 0}
+    if objective is proto.objective:
+        terms = {var: int(round(coeff)) for var, coeff in terms.items()}
+    objective.ClearField("vars")
+    objective.ClearField("coeffs")
+    objective.vars.extend(terms.keys())
+    objective.coeffs.extend(terms.values())
+    objective.offset += sign * constant / scale
+
+def set_domain(var, lb: int, ub: int) -> None:
+    var.Proto().ClearField("domain")
+    var.Proto().domain.extend([lb, ub])
+
+
+class WhatIf(object):
+    "Edits Shared by the Editable Models; Subclasses Map Projects and Resources to Model Keys"
+
+    # Edits Can Make Interchangeable Projects or Resources Differ, or Shrink the Capacity That
+    # Made an Option Dominated: Both Stay Off
+    def keep_symmetry_off(self, value):
+        if value:
+            raise ValueError("What-If Edits Can Make Interchangeable Projects or Resources Differ: Set break_symmetry to False")
+
+    def keep_presolve_off(self, value):
+        if value:
+            raise ValueError("What-If Edits Can Shrink the Capacity That Made an Option Dominated: Set presolve_options to False")
+
+    break_symmetry = property(lambda self: False, keep_symmetry_off)
+    presolve_options = property(lambda self: False, keep_presolve_off)
+
+    def update_deadline(self, project: str, deadline: int):
+        self.project_attrs = apply_table_changes(self.project_attrs, [[project, "Deadline", deadline]])
+        self.set_deadline_constraint(project)
+        self.set_completion_domains(project)
+
+    def update_penalty(self, project: str, delay_penalty=None, early_bonus=None):
+        changes = [
+            [project, column, value]
+            for column, value in (("Delay Penalty", delay_penalty), ("Early Bonus", early_bonus))
+            if value is not None
+            ]
+        add_objective(self.model.Proto(), self.project_cost(project), -1)
+        self.project_attrs = apply_table_changes(self.project_attrs, changes)
+        add_objective(self.model.Proto(), self.project_cost(project))
+        self.set_completion_domains(project)
+
+    def update_capacity(self, resource: str, capacity: int):
+        self.resource_attrs = apply_table_changes(self.resource_attrs, [[resource, "Capacity", capacity]])
+        self.set_capacity_constraint(resource)
+        self.refresh_domains()
+
+    def update_busy(self, resource: str, profile):
+        "Replace the Busy Calendar of a Resource (Days Beyond profile Become Free)"
+        profile = np.asarray(profile, dtype=np.int64)
+        if len(profile) > len(self.resource_busy):
+            raise ValueError("Busy Profile of {} Has {} Days, the Calendar Only {}".format(
+                resource, len(profile), len(self.resource_busy)))
+        self.resource_busy = self.resource_busy.copy()
+        self.resource_busy[resource] = np.pad(profile, (0, len(self.resource_busy) - len(profile)))
+        self.set_busy_intervals(resource)
+        self.set_capacity_constraint(resource)
+        self.refresh_domains()
+
+    def remove_project(self, project: str):
+        "Drop a Project From Capacity Constraints and Objective; Its Variables Stay Unconstrained"
+        if project not in self.projects:
+            raise KeyError("Project {} Not in Model".format(project))
+        add_objective(self.model.Proto(), self.project_cost(project), -1)
+        for resource in self.drop_project(project):
+            self.set_capacity_constraint(resource)
+        self.projects.remove(project)
+        self.project_attrs = self.project_attrs.drop(project)
+
+    def add_project(self, project: str, attrs: dict, reqs: pd.DataFrame):
+        """
+        Add a Project Given Its Attributes (Deadline, Delay Penalty, Early Bonus) and Requirements
+        (Columns Task, Resource, Duration, Units; Tasks in Precedence Order)
+        """
+        if project in self.options.projects:
+            raise ValueError("Project {} Is or Was Already in the Model".format(project))
+        new_attrs = pd.DataFrame(
+            {column: [attrs[column]] for column in self.project_attrs.columns},
+            index=pd.Index([project], name=self.project_attrs.index.name)
+            )
+        self.project_attrs = pd.concat([self.project_attrs, new_attrs])
+        self.project_reqs = pd.concat([self.project_reqs, contiguous(self.new_reqs(project, pd.DataFrame(reqs)))])
+        self.set_options(OptionTable(self.project_reqs, self.resource_attrs))
+        self.refresh_domains()
+        self.set_project_variables(project)
+        self.projects.append(project)
+        self.set_precedence_constraints([project])
+        self.set_resource_constraints([project])
+        self.set_deadline_constraint(project)
+        add_objective(self.model.Proto(), self.project_cost(project))
+        for resource in pd.unique(pd.DataFrame(reqs)["Resource"]):
+            self.set_capacity_constraint(resource)
+
+    def set_options(self, options):
+        self.options = options
+
+    def refresh_domains(self):
+        "Recompute Horizon and Task Windows, Then Rewrite the Domains of All Projects' Variables"
+        self.horizon = self.get_horizon()
+        if self.resource_calendar is not None and self.horizon > len(self.resource_busy):
+            # Capacity Above resource_attrs Stays Unavailable Out to the Longer Horizon
+            self.resource_busy = extend_load(self.resource_busy, self.horizon)
+            for resource in self.resources:
+                self.set_busy_intervals(resource)
+                self.set_capacity_constraint(resource)
+        self.windows = task_windows(self.options, self.resource_busy, self.resource_attrs["Capacity"], self.horizon)
+        for project in self.projects:
+            self.set_task_domains(project)
+            self.set_completion_domains(project)
+
+    def hint_solution(self):
+        "Hint Every Variable With Its Value in the Last Solution, Clamped to Its Current Domain"
+        response = self.solver.ResponseProto()
+        self.model.ClearHints()
+        proto = self.model.Proto()
+        hint = proto.solution_hint
+        for i, value in enumerate(response.solution):
+            domain = proto.variables[i].domain
+            hint.vars.append(i)
+            hint.values.append(min(max(value, domain[0]), domain[-1]))
+        return len(response.solution)
+
+    def resolve(self, max_time: int=10, profile: str=None):
+        "Re-Solve the Edited Model, Warm-Started From the Last Solution if There Was One"
+        if self.solver.ResponseProto().solution:
+            self.hint_solution()
+        self.solve(max_time, profile)
+
+
+class EditableModel(WhatIf, Model):
+    "one_period_v2.Model With In-Place What-If Edits"
+
+    def get_horizon(self):
+        return self.project_reqs["Duration"].sum() + self.busy_days
+
+    def new_reqs(self, project, reqs):
+        reqs = reqs.assign(Project=project).set_index(self.project_reqs.index.names)
+        return reqs[self.project_reqs.columns]
+
+    def drop_project(self, project):
+        "Clear the Deadline Constraint and Forget the Variables of a Project; Returns the Resources It Used"
+        self.deadline_constraint.pop(project).Proto().Clear()
+        intervals = {tstruct.interval.Index() for tstruct in self.assign[project]}
+        resources = []
+        for resource, needs in self.resource_needs.items():
+            kept = [need for need in needs if need[0].Index() not in intervals]
+            if len(kept) < len(needs):
+                needs[:] = kept
+                resources.append(resource)
+        for key in [key for key in self.resource_choice if key[0] == project]:
+            del self.resource_choice[key]
+        del self.assign[project], self.task_times[project], self.project_completion[project]
+        return resources
+
+    def set_task_domains(self, project):
+        windows = self.windows
+        for k, task_win in zip(self.options.chain("", project), self.task_times[project]):
+            set_domain(task_win.start, windows.start_lb[k].item(), windows.start_ub[k].item())
+            set_domain(task_win.end, windows.end_lb[k].item(), windows.end_ub[k].item())
+
+    def set_completion_domains(self, project):
+        pdata = self.project_attrs.loc[project]
+        early, tardy = completion_bounds(
+            self.windows, self.options.last_task["", project],
+            pdata["Deadline"], pdata["Delay Penalty"], pdata["Early Bonus"], self.horizon
+            )
+        set_domain(self.project_completion[project].early, *early)
+        set_domain(self.project_completion[project].tardy, *tardy)
+
+
+class EditableModel2P(WhatIf, Model2P):
+    """
+    stoch_duration_v1.Model2P With In-Place What-If Edits
+    Projects Named in the Scenario Tree (Resolving or Bypassed Tasks) Cannot Be Removed; Added
+    Projects Have the Same Requirements in Every Scenario. Nonanticipativity Helper Variables
+    Keep Their Build-Time Horizon
+    """
+
+    def get_horizon(self):
+        return self.project_reqs.groupby('Scenario')["Duration"].sum().max() + self.busy_days
+
+    def new_reqs(self, project, reqs):
+        reqs = pd.concat([reqs.assign(Scenario=scenario, Project=project) for scenario in self.prob])
+        return reqs.set_index(self.project_reqs.index.names)[self.project_reqs.columns]
+
+    def add_project(self, project: str, attrs: dict, reqs: pd.DataFrame):
+        super().add_project(project, attrs, reqs)
+        self.set_information_constraints([project])
+
+    def remove_project(self, project: str):
+        for event in self.scenario_tree.events:
+            named = [event.resolves_after] + [tp for outcome in event.outcomes for tp in outcome.bypass]
+            if project in [tp[0] for tp in named]:
+                raise ValueError("Project {} Is Part of Event {}".format(project, event.name))
+        super().remove_project(project)
+
+    def set_options(self, options):
+        self.options = options
+        self.registry.resize(options)
+
+    def drop_project(self, project):
+        "Clear the Deadline Constraints and Forget the Variables of a Project; Returns the Resources It Used"
+        chains = [self.options.chain_id(scenario, project) for scenario in self.prob]
+        for index in self.registry.deadline[chains].tolist():
+            self.model.Proto().constraints[index].Clear()
+        rows = self.registry.drop(chains)
+        return self.options.resources[np.unique(self.options.resource[rows])].to_list()
+
+    def refresh_domains(self):
+        super().refresh_domains()
+        for urt in self.node_urt:
+            set_domain(urt, 0, self.horizon+1)
+
+    def set_task_domains(self, project):
+        windows, reg = self.windows, self.registry
+        for scenario in self.prob:
+            for k in self.options.chain(scenario, project):
+                end_lb, end_ub = windows.end_lb[k].item(), windows.end_ub[k].item()
+                set_domain(reg.var(reg.start[k]), windows.start_lb[k].item(), windows.start_ub[k].item())
+                set_domain(reg.var(reg.end[k]), end_lb, end_ub)
+                rows = reg.option_rows(k)
+                if len(rows) > 1:
+                    for rt_end in reg.option_end[rows.start:rows.stop].tolist():
+                        set_domain(reg.var(rt_end), end_lb, end_ub)
+
+    def set_completion_domains(self, project):
+        pdata = self.project_attrs.loc[project]
+        reg = self.registry
+        for scenario in self.prob:
+            c = self.options.chain_id(scenario, project)
+            early, tardy = completion_bounds(
+                self.windows, self.options.last_task[scenario, project],
+                pdata["Deadline"], pdata["Delay Penalty"], pdata["Early Bonus"], self.horizon
+                )
+            set_domain(reg.var(reg.early[c]), *early)
+            set_domain(reg.var(reg.tardy[c]), *tardy)
+
+
+if __name__ == "__main__":
+    import time
+    import yaml
+    # Inputs of the One Period Example, Without Writing Its Report
+    with open("scheduling/one_period_v2_example.yml", 'r') as f:
+        model_input = yaml.safe_load(f)
+    mod = EditableModel('one_period_v2_example')
+    mod.render = "off"
+    inputs = mod.input_cache.bundle(model_input)
+    mod.set_inputs(*inputs[:4], model_input["date0_str"])
+    mod.build_model()
+    mod.solve()
+    edits = [
+        ("update_deadline", ("long", 30)),
+        ("update_penalty", ("short", 2, None)),
+        ("update_capacity", ("Planner", 3)),
+        ("remove_project", ("regsize",)),
+        ]
+    for edit, args in edits:
+        t0 = time.perf_counter()
+        getattr(mod, edit)(*args)
+        t1 = time.perf_counter()
+        mod.resolve(max_time=10)
+        print("{}{}: {} {:,.1f} (Edit {:.3f}s, Re-Solve {:.2f}s)".format(
+            edit, args, mod.solver.StatusName(), mod.solver.ObjectiveValue(), t1 - t0, time.perf_counter() - t1))
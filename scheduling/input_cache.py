@@ -0,0 +1,128 @@
+from collections import namedtuple, OrderedDict
+import hashlib
+import os
+import tempfile
+import pandas as pd
+
+# Content-Hashed Cache of Parsed Model Inputs
+# Tables Are Keyed by the SHA-256 Digest of Their CSV File (Plus Any Changes Applied to Them),
+# Held in an LRU Dictionary and, if a Cache Directory is Given, Pickled to Disk (Written to a
+# Temporary File, Then Renamed, so Concurrent Readers Never See Partial Pickles) so That Other
+# Processes Skip Parsing. Cached Frames Are Frozen: Their Column Arrays Are Read-Only, Derive
+# Variants With apply_table_changes (or .copy()) Instead of Editing Them.
+
+InputBundle = namedtuple('InputBundle', 'project_attrs project_reqs resource_attrs resource_busy key')
+
+TABLES = {
+    "project_attrs": [0],
+    "project_reqs": [0,1,2],
+    "resource_attrs": [0],
+    "resource_busy": [0],
+    }
+
+def file_digest(filename: str) -> str:
+    sha = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def frame_digest(df: pd.DataFrame) -> str:
+    "SHA-256 Digest of a Table's Index and Values (Equal Tables, Equal Digests, However Read or Changed)"
+    sha = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    sha.update(repr(list(df.columns)).encode())
+    return sha.hexdigest()
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    "Frame Equal to df With Read-Only Column Arrays, so In-Place Edits of Shared Frames Fail"
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+def apply_table_changes(df: pd.DataFrame, changes: list) -> pd.DataFrame:
+    "Copy of df With Changes Applied; Each Change is [Row Label..., Column, Value]"
+    df = df.copy()
+    for change in changes:
+        *row, column, value = change
+        if isinstance(value, float) and pd.api.types.is_integer_dtype(df[column]) and not value.is_integer():
+            df[column] = df[column].astype(float)
+        df.loc[tuple(row) if len(row) > 1 else row[0], column] = value
+    return df
+
+
+class InputCache(object):
+
+    def __init__(self, max_entries: int=64, path: str=None) -> None:
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def get(self, key: tuple, build):
+        "Cached Value for key, Built (and Frozen if a DataFrame) on a Miss"
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return self.entries[key]
+        filename = None
+        if self.path is not None:
+            name = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+            filename = os.path.join(self.path, "{}.pkl".format(name))
+        if filename is not None and os.path.exists(filename):
+            value = pd.read_pickle(filename)
+            self.stats["disk_hits"] += 1
+        else:
+            value = build()
+            self.stats["misses"] += 1
+            if filename is not None:
+                self.write(value, filename)
+        if isinstance(value, pd.DataFrame):
+            value = freeze(value)
+        self.entries[key] = value
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return value
+
+    def write(self, value, filename: str) -> None:
+        "Pickle value to a Temporary File in the Cache Directory, Then Rename It to filename"
+        fd, temporary = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+        try:
+            pd.to_pickle(value, temporary)
+            os.replace(temporary, filename)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def table(self, filename: str, table: str, changes: list=None) -> tuple:
+        "Parsed (and Changed) Table With Its Cache Key"
+        key = (table, file_digest(filename))
+        df = self.get(key, lambda: pd.read_csv(filename, index_col=TABLES[table]))
+        if changes:
+            base = df
+            key = key + (repr(changes),)
+            df = self.get(key, lambda: apply_table_changes(base, changes))
+        return df, key
+
+    def bundle(self, model_input: dict) -> InputBundle:
+        """
+        Input Tables Named in model_input, With Optional table_changes:
+        {Table: [[Row Label..., Column, Value], ...]}
+        """
+        changes = model_input.get("table_changes") or {}
+        unknown = set(changes) - set(TABLES)
+        if unknown:
+            raise ValueError("table_changes: Unknown Tables {}".format(sorted(unknown)))
+        tables, keys = {}, []
+        for table in TABLES:
+            tables[table], key = self.table(model_input[table], table, changes.get(table))
+            keys.append(key)
+        return InputBundle(key=tuple(keys), **tables)
+
+
+default_cache = InputCache()
@@ -0,0 +1,174 @@
+from collections import namedtuple
+import cProfile
+import functools
+import io
+import json
+import platform
+import pstats
+import re
+import resource
+import time
+import pandas as pd
+
+# Phase Instrumentation for the Model Lifecycle
+# Wraps the Phase Methods of a Model Instance (get_inputs, build_model and its steps, solve,
+# collect_results, ..., report_results) to Record Wall Time, CPU Time and Peak RSS per Call;
+# Nested Calls Are Recorded With Their Parent Phase. During solve, CP-SAT's Search Log is
+# Captured for Presolve Time and Objective / Bound Progress; Response Statistics Are Kept.
+# Once the Model Has a report_path, {name}_phases.csv and {name}_phases.json Are Rewritten
+# After Each Top-Level Phase. An Opt-In cProfile of One Phase Goes to {name}_{phase}.prof
+# and {name}_{phase}_profile.txt.
+
+PHASES = [
+    "get_inputs", "set_inputs", "build_model", "set_model_variables", "set_precedence_constraints",
+    "set_resource_constraints", "set_information_constraints", "set_objective", "set_symmetry_constraints",
+    "set_solution_hints", "solve", "extract_results", "collect_results", "project_report", "utilization",
+    "resource_report", "report_results",
+    ]
+RESPONSE_STATS = [
+    "num_booleans", "num_integers", "num_conflicts", "num_branches", "num_binary_propagations",
+    "num_integer_propagations", "num_restarts", "num_lp_iterations", "wall_time", "user_time",
+    "deterministic_time", "gap_integral",
+    ]
+
+PhaseStat = namedtuple('PhaseStat', 'phase parent depth wall_s cpu_s peak_rss_mb rss_growth_mb')
+Progress = namedtuple('Progress', 'time_s event best bound_lb bound_ub worker')
+
+PRESOLVE_LINE = re.compile(r"^Starting presolve at ([\d.]+)s")
+SEARCH_LINE = re.compile(r"^Starting (?:sequential )?search at ([\d.]+)s")
+PROGRESS_LINE = re.compile(r"^#(\d+|Bound|Done)\s+([\d.]+)s\s+(?:best:(\S+))?\s*(?:next:\[([^\]]*)\])?\s*(.*)$")
+
+def max_rss_mb() -> float:
+    "Peak Resident Set Size of This Process (ru_maxrss is in KB on Linux, Bytes on macOS)"
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20 if platform.system() == "Darwin" else 1 << 10)
+
+def parse_number(text: str):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+def parse_search_log(lines: list) -> tuple:
+    "Presolve Time (Seconds) and Progress Rows From CP-SAT Search Log Lines"
+    presolve_start = search_start = None
+    progress = []
+    for line in lines:
+        presolve, search = PRESOLVE_LINE.match(line), SEARCH_LINE.match(line)
+        if presolve:
+            presolve_start = float(presolve.group(1))
+        if search:
+            search_start = float(search.group(1))
+        match = PROGRESS_LINE.match(line)
+        if match:
+            event, t, best, bounds, worker = match.groups()
+            lb, ub = (bounds.split(",") + [None])[:2] if bounds else (None, None)
+            progress.append(Progress(
+                float(t), "solution" if event.isdigit() else event.lower(),
+                parse_number(best), parse_number(lb), parse_number(ub), worker.strip()
+                ))
+    presolve_s = None if presolve_start is None or search_start is None else search_start - presolve_start
+    return presolve_s, progress
+
+
+class Instrumentation(object):
+    """
+    Phase Recorder of One Model; profile_phase Names a Phase to Run Under cProfile
+    (Its First Call Only)
+    """
+
+    def __init__(self, model, profile_phase: str=None, phases: list=PHASES) -> None:
+        self.model = model
+        self.profile_phase = profile_phase
+        self.profile = None
+        self.stats = []
+        self.stack = []
+        self.log = []
+        self.solver_stats = {}
+        self.progress = []
+        for phase in phases:
+            if hasattr(model, phase):
+                setattr(model, phase, self.wrap(phase, getattr(model, phase)))
+
+    def wrap(self, phase: str, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            profiler = None
+            if phase == self.profile_phase and self.profile is None:
+                profiler = cProfile.Profile()
+            parent = self.stack[-1] if self.stack else None
+            self.stack.append(phase)
+            rss0, cpu0, wall0 = max_rss_mb(), time.process_time(), time.perf_counter()
+            try:
+                if profiler is not None:
+                    profiler.enable()
+                return method(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                    self.profile = pstats.Stats(profiler)
+                wall, cpu, rss = time.perf_counter() - wall0, time.process_time() - cpu0, max_rss_mb()
+                self.stack.pop()
+                self.stats.append(PhaseStat(phase, parent, len(self.stack), wall, cpu, rss, rss - rss0))
+                if phase == "solve":
+                    self.record_solver()
+                if not self.stack:
+                    self.write()
+        return timed
+
+    def attach(self, solver) -> None:
+        "Capture the Search Log of solver (Call Before Solve)"
+        self.log = []
+        if not solver.parameters.log_search_progress:
+            solver.parameters.log_search_progress = True
+            solver.parameters.log_to_stdout = False
+        solver.log_callback = self.log.append
+
+    def record_solver(self) -> None:
+        solver = getattr(self.model, "solver", None)
+        if solver is None:
+            return
+        response = solver.ResponseProto()
+        presolve_s, self.progress = parse_search_log(self.log)
+        self.solver_stats = {stat: getattr(response, stat) for stat in RESPONSE_STATS}
+        self.solver_stats.update(
+            status=solver.StatusName(),
+            objective=response.objective_value,
+            best_bound=response.best_objective_bound,
+            presolve_s=presolve_s,
+            )
+
+    def table(self) -> pd.DataFrame:
+        "Phase Calls in Completion Order"
+        return pd.DataFrame(self.stats, columns=PhaseStat._fields).round(4)
+
+    def summary(self) -> dict:
+        return {
+            "model": self.model.name,
+            "phases": self.table().to_dict(orient="records"),
+            "solver": self.solver_stats,
+            "progress": [p._asdict() for p in self.progress],
+            }
+
+    def file_prefix(self) -> str:
+        report_path = getattr(self.model, "report_path", None)
+        return None if report_path is None else report_path.format(self.model.name)
+
+    def write(self) -> list:
+        "Write Phase Table (CSV), Summary (JSON) and Profile, if the Model Has a report_path"
+        prefix = self.file_prefix()
+        if prefix is None:
+            return []
+        self.table().to_csv(prefix + "_phases.csv", index=False)
+        with open(prefix + "_phases.json", 'w') as f:
+            json.dump(self.summary(), f, indent=1)
+        files = [prefix + "_phases.csv", prefix + "_phases.json"]
+        if self.profile is not None:
+            profile_file = "{}_{}.prof".format(prefix, self.profile_phase)
+            self.profile.dump_stats(profile_file)
+            out = io.StringIO()
+            pstats.Stats(profile_file, stream=out).sort_stats("cumulative").print_stats(30)
+            with open("{}_{}_profile.txt".format(prefix, self.profile_phase), 'w') as f:
+                f.write(out.getvalue())
+            files += [profile_file, "{}_{}_profile.txt".format(prefix, self.profile_phase)]
+        return files
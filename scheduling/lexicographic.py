@@ -0,0 +1,145 @@
+import math
+from collections import namedtuple
+from ortools.sat.python import cp_model
+import numpy as np
+
+# Lexicographic (Hierarchical) Objectives
+# Stages Are Solved in Order, Each With Its Own Time Limit: a Stage Minimizes Its Objective, Then
+# Its Value (Optimal, or the Incumbent if the Time Limit Hit First) Is Kept as a Constraint,
+# Loosened by a Relative tolerance, and the Next Stage Starts From the Stage's Solution as a Hint.
+# A Stage Finding No Solution Ends the Sequence; the Model Then Keeps the Solver (Solution and
+# Status) of the Last Solved Stage.
+# Objectives Are Terms of the Weighted Objective, Given by the Models' objective_terms():
+#   tardiness       Tardy Days (Expected Over Scenarios)
+#   delay_penalty   Delay Penalty x Tardy Days
+#   early_bonus     - Early Bonus x Early Days
+#   resource_cost   Resource Cost per Day x Units x Duration of the Chosen Options
+#   cost            resource_cost + delay_penalty + early_bonus: the Weighted Objective
+# Configuration (YAML), Stage Settings Besides objective Optional:
+#   lexicographic:
+#     - {objective: tardiness, max_time: 20, tolerance: 0.0}
+#     - {objective: cost, max_time: 60, profile: fast-feasible}
+# Kept Stage Values Need Integer Coefficients: Fractional Ones (Scenario Probabilities) Are Scaled
+# by the Smallest Power of Ten Making Them Integral, up to MAX_SCALE, Then Rounded.
+# Earliness and Tardiness Are Tied Only by deadline + tardy - early == end; the Weighted Objective
+# Keeps One of Them at Zero as Delay Penalty Exceeds Early Bonus, but a Stage Such as early_bonus
+# Alone Would Not: Stages Therefore Also Hold early > 0 => tardy == 0 per Completion (the
+# tardiness and early_bonus Terms List Their Variables in the Same Order, One Pair per Completion).
+
+Term = namedtuple('Term', 'variables coefficients offset')
+Stage = namedtuple('Stage', 'objective max_time tolerance profile')
+StageResult = namedtuple('StageResult', 'objective status value bound wall_time')
+
+OBJECTIVES = ["tardiness", "delay_penalty", "early_bonus", "resource_cost", "cost"]
+MAX_SCALE = 10**6
+
+def parse_stages(stages: list, max_time: float=100, profile: str=None) -> list:
+    "Stages From Objective Names or Dictionaries of Stage Settings; max_time and profile Are Defaults"
+    parsed = []
+    for stage in stages:
+        stage = {"objective": stage} if isinstance(stage, str) else dict(stage)
+        if stage.get("objective") not in OBJECTIVES:
+            raise ValueError("Unknown Lexicographic Objective {!r}; Choose From {}".format(stage.get("objective"), OBJECTIVES))
+        parsed.append(Stage(stage["objective"], stage.get("max_time", max_time), stage.get("tolerance", 0.0), stage.get("profile", profile)))
+    if not parsed:
+        raise ValueError("No Lexicographic Stages")
+    return parsed
+
+def stage_terms(terms: dict) -> dict:
+    "Model Terms Plus Their Sum cost (the Weighted Objective)"
+    parts = [terms[name] for name in ("resource_cost", "delay_penalty", "early_bonus")]
+    terms = dict(terms)
+    terms["cost"] = Term(
+        [v for term in parts for v in term.variables],
+        [c for term in parts for c in term.coefficients],
+        sum(term.offset for term in parts)
+        )
+    return terms
+
+def integer_coefficients(coefficients: list) -> tuple:
+    "Smallest Power of Ten (up to MAX_SCALE) Making the Coefficients Integral, and the Scaled Coefficients"
+    c = np.asarray(coefficients, dtype=float)
+    scale = 1
+    while scale < MAX_SCALE and not np.allclose(c * scale, np.rint(c * scale), rtol=0, atol=1e-9):
+        scale *= 10
+    return scale, np.rint(c * scale).astype(np.int64).tolist()
+
+def hint_solution(model, solution) -> None:
+    "Replace the Solution Hints of model by a Full Solution (Values of All Variables)"
+    hint = model.Proto().solution_hint
+    hint.Clear()
+    hint.vars.extend(range(len(solution)))
+    hint.values.extend(solution)
+
+def split_completion(model, terms: dict) -> None:
+    "Earliness and Tardiness of Each Completion Never Both Positive: early = max(0, deadline - end)"
+    for early, tardy in zip(terms["early_bonus"].variables, terms["tardiness"].variables):
+        is_early = model.NewBoolVar("")
+        model.Add(tardy == 0).OnlyEnforceIf(is_early)
+        model.Add(early == 0).OnlyEnforceIf(is_early.Not())
+
+def solve_lexicographic(mod, stages: list, max_time: float=100, profile: str=None) -> list:
+    """
+    Solve a Built Model's Stages in Order (See Module Comment); Return a StageResult per Stage
+    Solved. Values Kept by a Previous Call Are Dropped First; the Last Stage Solved Stays the Objective
+    """
+    stages = parse_stages(stages, max_time, profile)
+    model = mod.model
+    terms = stage_terms(mod.objective_terms())
+    if getattr(mod, "stage_model", None) is model:
+        for index in mod.stage_constraints:
+            model.Proto().constraints[index].Clear()
+    else:
+        # First Lexicographic Solve of This Built Model
+        split_completion(model, terms)
+        mod.stage_model = model
+    mod.stage_constraints = []
+    results = []
+    for n, stage in enumerate(stages):
+        term = terms[stage.objective]
+        last = n == len(stages) - 1
+        if last:
+            # Natural Units: the Reported Objective Is the Stage Objective
+            scale, expr = 1, cp_model.LinearExpr.WeightedSum(term.variables, term.coefficients)
+            model.Minimize(expr + term.offset)
+        else:
+            scale, coefficients = integer_coefficients(term.coefficients)
+            expr = cp_model.LinearExpr.WeightedSum(term.variables, coefficients)
+            model.Minimize(expr)
+            # Solver Reports the Objective in Natural Units: scaling_factor x (expr + offset)
+            model.Proto().objective.offset = term.offset * scale
+            model.Proto().objective.scaling_factor = 1 / scale
+        kept = (mod.solver, mod.status) if n > 0 else None
+        mod.set_solver(stage.max_time, stage.profile)
+        mod.status = mod.solver.Solve(model)
+        solved = mod.status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        results.append(StageResult(
+            stage.objective, mod.solver.StatusName(),
+            mod.solver.ObjectiveValue() if solved else None,
+            mod.solver.BestObjectiveBound() if solved else None,
+            round(mod.solver.WallTime(), 3)
+            ))
+        if not solved and n > 0:
+            # Keep the Previous Stage's Solution
+            mod.solver, mod.status = kept
+        if last or not solved:
+            break
+        # Keep the Stage Value and Start the Next Stage From This Solution
+        value = mod.solver.Value(expr)
+        limit = math.floor(value + stage.tolerance * abs(value))
+        mod.stage_constraints.append(model.Add(expr <= limit).Index())
+        hint_solution(model, mod.solver.ResponseProto().solution)
+    print(mod.solver.ResponseStats())
+    return results
+
+def stage_report(stages: list) -> str:
+    "Report Lines of the Stages of a Lexicographic Solve (Empty if None)"
+    out = ""
+    for n, stage in enumerate(stages or []):
+        if stage.value is None:
+            out += '\t- Stage {} ({}): {}, {:.2f}s\n'.format(n + 1, stage.objective, stage.status, stage.wall_time)
+            if n > 0:
+                out += '\t- Solution of Stage {} ({}) Kept\n'.format(n, stages[n - 1].objective)
+        else:
+            out += '\t- Stage {} ({}): {}, Value {:,.3f}, Bound {:,.3f}, {:.2f}s\n'.format(n + 1, *stage)
+    return out
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+# Monte Carlo Duration Scenarios With k-Medoids Reduction
+# Durations of the project_reqs Rows Are Drawn K Times, Then Reduced to a Few Representative
+# Samples (Medoids, so Every Kept Scenario Is an Actual Draw) Weighted by the Share of Samples
+# Closest to Them; the Stochastic Planner Builds One Scenario per Medoid. Draws Are Shared by
+# the Options of a Task, so a Hard Task Takes Longer on Whichever Resource Does It. The
+# resolves_after Task Keeps Its Duration in Every Sample: Scenarios Are Told Apart Only Once It
+# Ends, so It Must End on the Same Day in All of Them.
+# Configuration (YAML):
+#   duration_uncertainty:
+#     distribution: triangular     triangular: Mode = Duration, Range [low, high] x Duration
+#     low: 0.8                     lognormal: Median = Duration, Log-Scale Spread sigma
+#     high: 1.6
+#     sigma: 0.3
+#     samples: 500                 K Sampled Duration Vectors
+#     scenarios: 6                 Representative Scenarios Kept
+#     seed: 0
+#     resolves_after: {project: regsize, task: T04_Eval_Pass_A}
+#     parameters: params.csv       Optional per Row: Project, Task, Resource and Any of
+#                                  Distribution, Low, High, Sigma
+
+DISTRIBUTIONS = ["triangular", "lognormal"]
+DEFAULTS = {"distribution": "triangular", "low": 0.8, "high": 1.5, "sigma": 0.25, "samples": 500, "scenarios": 6, "seed": 0}
+
+def duration_parameters(project_reqs: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """
+    Distribution, Low, High and Sigma of Each project_reqs Row: Configuration Defaults, Then per
+    Row Overrides; the resolves_after Task Gets a Zero-Width Triangular Range (Its Duration)
+    """
+    config = dict(DEFAULTS, **config)
+    params = pd.DataFrame({
+        "Distribution": config["distribution"],
+        "Low": float(config["low"]),
+        "High": float(config["high"]),
+        "Sigma": float(config["sigma"]),
+        }, index=project_reqs.index)
+    if config.get("parameters"):
+        rows = pd.read_csv(config["parameters"], index_col=[0,1,2])
+        params.update(rows.reindex(params.index)[[c for c in params.columns if c in rows.columns]])
+    if config.get("resolves_after"):
+        resolves_after = (config["resolves_after"]["project"], config["resolves_after"]["task"])
+        params.loc[params.index.droplevel(-1) == resolves_after, ["Distribution", "Low", "High"]] = ["triangular", 1.0, 1.0]
+    unknown = set(params["Distribution"]) - set(DISTRIBUTIONS)
+    if unknown:
+        raise ValueError("Unknown Duration Distributions {}; Choose From {}".format(sorted(unknown), DISTRIBUTIONS))
+    return params
+
+def sample_durations(project_reqs: pd.DataFrame, params: pd.DataFrame, samples: int, seed: int=0) -> np.ndarray:
+    "Integer Durations (samples x Rows, at Least 1 Day); One Uniform and One Normal Draw per Task and Sample"
+    rng = np.random.default_rng(seed)
+    tasks, names = pd.factorize(project_reqs.index.droplevel(-1))
+    u = rng.random((samples, len(names)))[:, tasks]
+    z = rng.standard_normal((samples, len(names)))[:, tasks]
+    mode = project_reqs["Duration"].to_numpy(dtype=float)
+    low, high = mode * params["Low"].to_numpy(), mode * params["High"].to_numpy()
+    # Triangular Inverse CDF (Zero-Width Ranges Stay at the Mode)
+    width = np.maximum(high - low, 1e-9)
+    split = (mode - low) / width
+    triangular = np.where(
+        u < split,
+        low + np.sqrt(u * width * (mode - low)),
+        high - np.sqrt((1 - u) * width * (high - mode)),
+        )
+    lognormal = mode * np.exp(params["Sigma"].to_numpy() * z)
+    durations = np.where((params["Distribution"] == "triangular").to_numpy(), triangular, lognormal)
+    return np.maximum(np.rint(durations), 1).astype(np.int64)
+
+def pairwise_distance(x: np.ndarray) -> np.ndarray:
+    "Euclidean Distances Between the Rows of x"
+    x = x.astype(float)
+    norms = (x * x).sum(axis=1)
+    return np.sqrt(np.maximum(norms[:, None] + norms[None, :] - 2 * x @ x.T, 0))
+
+def k_medoids(x: np.ndarray, k: int, seed: int=0, max_iter: int=100) -> tuple:
+    """
+    Medoid Row Indices and Cluster Label of Each Row of x: k-means++ Seeding, Then Alternating
+    Assignment and Medoid Update Until the Medoids Settle
+    """
+    n = len(x)
+    k = min(k, n)
+    rng = np.random.default_rng(seed)
+    distance = pairwise_distance(x)
+    medoids = [int(rng.integers(n))]
+    for _ in range(1, k):
+        nearest = distance[:, medoids].min(axis=1) ** 2
+        if nearest.sum() == 0:
+            break
+        medoids.append(int(rng.choice(n, p=nearest / nearest.sum())))
+    medoids = np.array(medoids)
+    for _ in range(max_iter):
+        labels = distance[:, medoids].argmin(axis=1)
+        update = medoids.copy()
+        for j in range(len(medoids)):
+            members = np.flatnonzero(labels == j)
+            if not len(members):
+                continue
+            update[j] = members[distance[np.ix_(members, members)].sum(axis=1).argmin()]
+        if np.array_equal(update, medoids):
+            break
+        medoids = update
+    return medoids, distance[:, medoids].argmin(axis=1)
+
+def reduce_scenarios(durations: np.ndarray, k: int, seed: int=0) -> tuple:
+    "Representative Duration Vectors (Medoids) and Their Probabilities (Share of Samples Nearest Each)"
+    medoids, labels = k_medoids(durations, k, seed)
+    probability = np.bincount(labels, minlength=len(medoids)) / len(durations)
+    return durations[medoids], probability
+
+def duration_scenarios(config: dict, project_reqs: pd.DataFrame) -> tuple:
+    """
+    Sampled and Reduced Duration Scenarios of the duration_uncertainty Configuration:
+    Durations (Scenarios x Sorted project_reqs Rows) and Probabilities
+    """
+    config = dict(DEFAULTS, **config)
+    project_reqs = project_reqs.sort_index()
+    params = duration_parameters(project_reqs, config)
+    samples = sample_durations(project_reqs, params, int(config["samples"]), int(config["seed"]))
+    return reduce_scenarios(samples, int(config["scenarios"]), int(config["seed"]))
@@ -1,12 +1,15 @@
 from ortools.sat.python import cp_model
 from utils import read_resource_input, read_task_input, read_project_input
+from busy_calendar import busy_intervals
+from option_table import OptionTable
+from task_windows import task_windows, completion_bounds
+from solver_profiles import set_solver_parameters
+from utilization import utilization_table, need_indices
+from rendering import Renderer, save_timetable, save_utilization, utilization_figure
 import yaml
 from datetime import datetime, timedelta
 from collections import namedtuple
 import sys
-import plotly.express as px
-import plotly.io as pio
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
@@ -17,6 +20,8 @@ Task = namedtuple('Task','name resource units interval is_active')
 class Model(object):
 
     resource_units_per_task = 1
+    compress_busy = True
+    render = "sync"
 
     def __init__(self, name: str) -> None:
         self.name = name
@@ -28,6 +33,9 @@ class Model(object):
         # Import Model Inputs
         with open(model_input_file, 'r') as f:
             model_input = yaml.safe_load(f)
+        self.solver_config = model_input.get("solver", {})
+        self.render = model_input.get("render", self.render)
+        self.renderer = Renderer(self.render)
 
         repfile = open(self.report_file, "w")
         print("## Model Inputs", file=repfile)
@@ -40,7 +48,7 @@ class Model(object):
             model_input, 
             self.datetime_0, 
             self.init_t_max, 
-            plotfile="examples/schedV1/"+rpu_image_file,
+            plotfile="examples/schedV1/"+rpu_image_file if self.renderer.enabled else None,
             show_utilization_plot=False
             )
         self.task_resource_options = read_task_input(model_input['resources'])
@@ -54,8 +62,28 @@ class Model(object):
         
         print("\n"*3, file=repfile)
         print("### Resource Utilization At Time 0", file=repfile)
-        print("![Resource Prior Utilization]({})".format(rpu_image_file), file=repfile)
+        if self.renderer.enabled:
+            print("![Resource Prior Utilization]({})".format(rpu_image_file), file=repfile)
         repfile.close()
+        self.set_task_windows()
+
+    def set_task_windows(self):
+        "Earliest Start / Latest Finish per Task Within the Planning Horizon"
+        reqs = pd.DataFrame(
+            [(pname, task, resource, duration, self.resource_units_per_task)
+             for pname, proj in self.projects.items()
+             for task, duration in proj.task_sequence
+             for resource in self.task_resource_options[task]],
+            columns=["Project","Task","Resource","Duration","Units"]
+            )
+        attrs = pd.DataFrame(
+            {"Capacity": [res.capacity for res in self.resources.values()], "Cost per Day": 0},
+            index=list(self.resources)
+            )
+        days = max(len(res.state0) for res in self.resources.values())
+        busy = pd.DataFrame({name: res.state0 + [0]*(days-len(res.state0)) for name, res in self.resources.items()})
+        self.options = OptionTable(reqs, attrs)
+        self.windows = task_windows(self.options, busy, attrs["Capacity"], self.horizon)
 
     def set_model_variables(self):
         self.assign = {}
@@ -66,17 +94,24 @@ class Model(object):
 
         # Collect New Variables for Task: Start, End, Interval, Select if Optional
         # Collect New Variables for Resource Needs
+        start_lb, start_ub = self.windows.start_lb.tolist(), self.windows.start_ub.tolist()
+        end_lb, end_ub = self.windows.end_lb.tolist(), self.windows.end_ub.tolist()
         for pname, proj in self.projects.items():
             self.assign[pname] = []
             self.task_times[pname] = []
+            last_task = self.options.last_task["", pname]
+            early, tardy = completion_bounds(
+                self.windows, last_task, proj.deadline, proj.delay_penalty, proj.early_bonus, self.horizon
+                )
             self.project_completion[pname] = CompletionWin(
-                self.model.NewIntVar(0, self.horizon, "{}_earliness".format(pname)),
-                self.model.NewIntVar(0, self.horizon, "{}_tardiness".format(pname))
+                self.model.NewIntVar(*early, "{}_earliness".format(pname)),
+                self.model.NewIntVar(*tardy, "{}_tardiness".format(pname))
                 )
-            for task, duration in proj.task_sequence:
+            first_task = last_task - len(proj.task_sequence) + 1
+            for k, (task, duration) in enumerate(proj.task_sequence, start=first_task):
                 prefix = "{}_{}_".format(pname,task)
-                dv_start = self.model.NewIntVar(0, self.horizon, prefix + 'start')
-                dv_end = self.model.NewIntVar(0, self.horizon, prefix + 'end')
+                dv_start = self.model.NewIntVar(start_lb[k], start_ub[k], prefix + 'start')
+                dv_end = self.model.NewIntVar(end_lb[k], end_ub[k], prefix + 'end')
                 self.task_times[pname].append(TaskWin(dv_start, dv_end))
                 is_one_resource_task = (len(self.task_resource_options[task]) == 1)
                 for resource in self.task_resource_options[task]:
@@ -96,11 +131,10 @@ class Model(object):
 
         # Account for Additional Needs Due to Initial Commitment
         for res in self.resources.values():
-            for t, demand in enumerate(res.state0):
-                task = "t{:2d}".format(t)
-                ivname = "occupied_{}_{}_interval".format(t,res.name)
-                if demand > 0:
-                    self.resource_needs.setdefault(res.name,[]).append((self.model.NewIntervalVar(t, 1, t+1, ivname), demand))
+            for busy in busy_intervals(res.state0, self.compress_busy):
+                ivname = "occupied_{}_{}_{}_interval".format(busy.start,busy.length,res.name)
+                dv_busy = self.model.NewIntervalVar(busy.start, busy.length, busy.start+busy.length, ivname)
+                self.resource_needs.setdefault(res.name,[]).append((dv_busy, busy.demand))
 
     def get_project_endtime(self, projname):
         return self.task_times[projname][-1].end
@@ -139,10 +173,13 @@ class Model(object):
         self.set_resource_constraints()
         self.set_objective()
 
-    def solve(self, max_time: int=100):
+    def solve(self, max_time: int=100, profile: str=None):
         self.solver = cp_model.CpSolver()
-        # Set Processing Time Limit
-        self.solver.parameters.max_time_in_seconds = max_time
+        # Set Processing Time Limit and Search Profile (From YAML solver Section Unless Given)
+        solver_config = dict(self.solver_config)
+        if profile is not None:
+            solver_config["profile"] = profile
+        set_solver_parameters(self.solver.parameters, max_time, **solver_config)
         self.status = self.solver.Solve(self.model)
         print(self.solver.ResponseStats())
 
@@ -164,18 +201,7 @@ class Model(object):
                     self.__tograph__.append(row)
 
             df = pd.DataFrame(self.__tograph__)
-            fig = px.timeline(
-                df.loc[df["Is_Active"],:], 
-                x_start="Start", 
-                x_end="Finish", 
-                y="Project", 
-                color="Task",
-                pattern_shape="Resource",
-                pattern_shape_sequence=["x", "", "+"],
-                color_discrete_sequence=px.colors.qualitative.Light24
-            )
-            fig.update_yaxes(categoryorder="category descending")
-            pio.write_image(fig, "examples/schedV1/{}_timetable.png".format(self.name), width=1080, height=720)
+            self.renderer.submit(save_timetable, df, "examples/schedV1/{}_timetable.png".format(self.name))
 
             out += '\t- Optimal Objective Value: {:,.3f}\n'.format(self.solver.ObjectiveValue())
             out += '\t- Optimal Objective Bound: {:,.3f}\n'.format(self.solver.BestObjectiveBound())
@@ -198,26 +224,16 @@ class Model(object):
             out += fmt.format(pname, proj_end, self.solver.Value(earliness), self.solver.Value(tardiness))
         return out
     
-    def resource_report(self):
-        cols = [(resource, s) for resource in self.resources for s in ['state0','state1']]
-        utilization = pd.DataFrame(0, index=np.arange(self.makespan+1), columns=pd.MultiIndex.from_tuples(cols))
+    def utilization(self):
+        "Daily Utilization per Resource Up to the Makespan: state0 Prior Commitments, state1 Total Load"
+        busy = {res.name: res.state0 for res in self.resources.values()}
+        utilization = utilization_table(busy, need_indices(self.resource_needs), self.makespan+1, self.model.Proto(), self.solver.ResponseProto())
         utilization.columns.names = ['Resource','State']
-        for res in self.resources.values():
-            for i, x in enumerate(res.state0):
-                utilization.loc[i,(res.name,'state0')] += x
-            for iv, units in self.resource_needs[res.name]:
-                start = self.solver.Value(iv.StartExpr())
-                end = self.solver.Value(iv.EndExpr())
-                for i in range(start,end):
-                    utilization.loc[i,(res.name,'state1')] += units
-        color_dict = {'state0':'grey', 'state1':'green'}
-        utilization.index = [self.get_date(t).strftime("%b %d") for t in utilization.index]
-        fig, axs = plt.subplots(len(self.resources), 1, figsize=(8,12), sharex=True)
-        fig.autofmt_xdate(rotation=90)
-        for i, rname in enumerate(self.resources):
-            utilization.loc[:,(rname,'state1')] -= utilization.loc[:,(rname,'state0')]
-            utilization[rname].plot.bar(stacked=True, title=rname, width=1, grid=True, color=color_dict, ax=axs[i])
-        return fig
+        utilization.index = pd.Index([self.get_date(t) for t in utilization.index], name="Date")
+        return utilization
+
+    def resource_report(self, utilization=None):
+        return utilization_figure(self.utilization() if utilization is None else utilization)
     
     def report_results(self):
         repfile = open(self.report_file, "a")
@@ -226,12 +242,17 @@ class Model(object):
         print(self.project_report() , file=repfile)
         print("## Optimal Timetable" , file=repfile)
         timetable_file = "{}_timetable.png".format(self.name)
-        print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
+        if self.renderer.enabled:
+            print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
         print("## Optimal Resource Utilization" , file=repfile)
         utilization_file = "{}_utilization.png".format(self.name)
-        fig = self.resource_report()
-        fig.savefig("examples/schedV1/{}".format(utilization_file), dpi=72)
-        print("![Utilization]({})\n\n\n".format(utilization_file) , file=repfile)
+        utilization_csv = "{}_utilization.csv".format(self.name)
+        utilization = self.utilization()
+        utilization.to_csv("examples/schedV1/{}".format(utilization_csv))
+        self.renderer.submit(save_utilization, utilization, "examples/schedV1/{}".format(utilization_file), None)
+        if self.renderer.enabled:
+            print("![Utilization]({})\n".format(utilization_file) , file=repfile)
+        print("[Daily Utilization (CSV)]({})\n\n\n".format(utilization_csv) , file=repfile)
         repfile.close()
 
 
@@ -241,4 +262,4 @@ if __name__ == "__main__":
     mod.build_model()
     mod.solve()
     mod.report_results()
-
+    mod.renderer.wait()
@@ -1,38 +1,116 @@
 from ortools.sat.python import cp_model
+from option_table import OptionTable, contiguous
+from busy_calendar import busy_intervals
+from capacity_calendar import read_calendar, calendar_days, apply_calendar
+from symmetry import project_templates, interchangeable_resources, first_choice, symmetry_report
+from task_windows import task_windows, completion_bounds
+from option_presolve import remove_dominated, REMOVED_COLUMNS
+from solver_profiles import set_solver_parameters
+from utilization import results_utilization
+from results_table import results_table, assignment_table, completion_table, CHAIN_VALUES
+from rendering import Renderer, save_timetable, save_utilization, utilization_figure
+from input_cache import default_cache
+from warm_start import load_assignment, previous_choices, match_tasks
+from instrumentation import Instrumentation
+from results_store import ResultsStore
+from streaming import SolutionStream, stream_solutions
+from lexicographic import Term, solve_lexicographic, stage_report
 import yaml
 from datetime import datetime, timedelta
 from collections import namedtuple
-import plotly.express as px
-import plotly.io as pio
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
 CompletionWin = namedtuple('CompletionWin', 'early tardy')
 TaskWin = namedtuple('TaskWin', 'start end')
-Task = namedtuple('Task','name resource units interval is_active')
+Task = namedtuple('Task','name resource units interval is_active option')
 
 class Model(object):
 
+    compress_busy = True
+    break_symmetry = True
+    presolve_options = True
+    lexicographic = None
+    render = "sync"
+    results_store = None
+    instrument = False
+    profile_phase = None
+    solver_config = {}
+    warm_start = None
+    input_cache = default_cache
+
     def __init__(self, name: str) -> None:
         self.name = name
         self.model = cp_model.CpModel()
+        # Phase Timing, Memory and Solver Statistics (Written Next to the Report)
+        self.instrumentation = Instrumentation(self, self.profile_phase) if self.instrument else None
 
-    def get_inputs(self):
+    def get_inputs(self, model_input_file: str=None):
         # Import Model Inputs
-        with open("scheduling/{}.yml".format(self.name), 'r') as f:
+        if model_input_file is None:
+            model_input_file = "scheduling/{}.yml".format(self.name)
+        with open(model_input_file, 'r') as f:
             model_input = yaml.safe_load(f)
+        self.solver_config = model_input.get("solver", {})
+        self.warm_start = model_input.get("warm_start")
+        self.render = model_input.get("render", self.render)
+        self.results_store = model_input.get("results_store", self.results_store)
+        self.model_input_file = model_input_file
+        self.break_symmetry = model_input.get("break_symmetry", self.break_symmetry)
+        self.presolve_options = model_input.get("presolve_options", self.presolve_options)
+        self.lexicographic = model_input.get("lexicographic", self.lexicographic)
+        inputs = self.input_cache.bundle(model_input)
+        self.set_inputs(
+            inputs.project_attrs,
+            inputs.project_reqs,
+            inputs.resource_attrs,
+            inputs.resource_busy,
+            model_input["date0_str"],
+            model_input["report_path"],
+            read_calendar(model_input["resource_calendar"]) if model_input.get("resource_calendar") else None
+            )
 
-        self.project_attrs = pd.read_csv(model_input['project_attrs'], index_col=[0])
+    def set_inputs(
+            self,
+            project_attrs: pd.DataFrame,
+            project_reqs: pd.DataFrame,
+            resource_attrs: pd.DataFrame,
+            resource_busy: pd.DataFrame,
+            date0_str: str,
+            report_path: str=None,
+            resource_calendar: pd.DataFrame=None):
+        """
+        Ingest In-Memory Input Tables; Model Inputs Are Reported Only if report_path is Given
+        A resource_calendar (See capacity_calendar) Varies Capacity Over Time
+        """
+        self.datetime_0 = datetime.strptime(date0_str, "%Y-%m-%d").date()
+        self.project_attrs = project_attrs
         self.projects = self.project_attrs.index.to_list()
-        self.project_reqs = pd.read_csv(model_input['project_reqs'], index_col=[0,1,2])
-        self.resource_attrs = pd.read_csv(model_input['resource_attrs'], index_col=[0])
-        self.resource_busy = pd.read_csv(model_input['resource_busy'], index_col=[0])
-        self.task_choice = self.project_reqs.groupby(['Project','Task']).size()
-        self.resources = self.resource_attrs.index.to_list()
+        self.project_reqs = contiguous(project_reqs)
         # Upper Limit for Project Completion
-        self.horizon = self.project_reqs["Duration"].sum() + len(self.resource_busy)
-        self.report_path = model_input["report_path"]
+        self.resource_calendar = resource_calendar
+        self.busy_days = len(resource_busy)
+        if resource_calendar is not None:
+            self.busy_days = calendar_days(resource_calendar, self.datetime_0, self.busy_days)
+        self.horizon = self.project_reqs["Duration"].sum() + self.busy_days
+        if resource_calendar is not None:
+            resource_attrs, resource_busy = apply_calendar(resource_attrs, resource_busy, resource_calendar, self.datetime_0, self.horizon)
+        self.resource_attrs = resource_attrs
+        self.resource_busy = resource_busy
+        self.resources = self.resource_attrs.index.to_list()
+        self.options = OptionTable(self.project_reqs, self.resource_attrs)
+        # Earliest Start / Latest Finish per Task
+        self.windows = task_windows(self.options, self.resource_busy, self.resource_attrs["Capacity"], self.horizon)
+        self.removed_options = pd.DataFrame(columns=REMOVED_COLUMNS)
+        if self.presolve_options:
+            self.presolve()
+        self.task_choice = self.project_reqs.groupby(['Project','Task']).size()
+        # Set Parameters
+        self.get_date = lambda d: self.datetime_0 + timedelta(days=d)
+        self.report_path = report_path
+        self.renderer = Renderer(self.render)
+        if report_path is None:
+            return
 
         self.report_file = self.report_path.format(self.name+"_report.md")
         repfile = open(self.report_file, "w")
@@ -43,38 +121,59 @@ class Model(object):
         self.project_reqs.reset_index().to_markdown(repfile, index=False)        
         print("\n\n### Resource Attributes\n", file=repfile)
         self.resource_attrs.to_markdown(repfile)
-        # Set Parameters
-        self.datetime_0 = datetime.strptime(model_input["date0_str"], "%Y-%m-%d").date()
-        self.get_date = lambda d: self.datetime_0 + timedelta(days=d)
+        if self.presolve_options:
+            print("\n\n### Presolve: Removed {} of {} Options\n".format(*self.presolved), file=repfile)
+            if len(self.removed_options):
+                self.removed_options.to_markdown(repfile, index=False)
         repfile.close()
 
-    def set_model_variables(self):
+    def presolve(self):
+        "Remove Dominated and Over-Capacity Options (See option_presolve); the Horizon Stays"
+        self.project_reqs, self.removed_options = remove_dominated(
+            self.project_reqs, self.options, self.windows, self.resource_attrs, self.resource_busy
+            )
+        self.presolved = (self.options.n_options - len(self.project_reqs), self.options.n_options)
+        if len(self.removed_options):
+            self.options = OptionTable(self.project_reqs, self.resource_attrs)
+            self.windows = task_windows(self.options, self.resource_busy, self.resource_attrs["Capacity"], self.horizon)
 
-        # Project Earliness and Tardiness
-        self.project_completion = {}
-        for pname in self.projects:
-            self.project_completion[pname] = CompletionWin(
-                self.model.NewIntVar(0, self.horizon, "{}_earliness".format(pname)),
-                self.model.NewIntVar(0, self.horizon, "{}_tardiness".format(pname))
-                )
-            
-        # Collect New Variables for Task: Start, End, Interval, Select if Optional
+    def set_model_variables(self):
+        # Collect New Variables for Project Completion and Tasks: Start, End, Interval, Select if Optional
         # Collect New Variables for Resource Needs
+        self.project_completion = {}
         self.task_times = {}
         self.assign = {}
         self.resource_needs = {resource:[] for resource in self.resources}
         self.resource_choice = {}
+        for project in self.options.projects.to_list():
+            self.set_project_variables(project)
+        # Account for Additional Needs Due to Initial Commitment
+        for resource in self.resources:
+            self.set_busy_intervals(resource)
 
-        for (project, task), pdata in self.project_reqs.groupby(["Project","Task"], sort=False):
+    def set_project_variables(self, pname):
+        # Project Earliness and Tardiness
+        pdata = self.project_attrs.loc[pname]
+        early, tardy = completion_bounds(
+            self.windows, self.options.last_task["", pname], 
+            pdata["Deadline"], pdata["Delay Penalty"], pdata["Early Bonus"], self.horizon
+            )
+        self.project_completion[pname] = CompletionWin(
+            self.model.NewIntVar(*early, "{}_earliness".format(pname)),
+            self.model.NewIntVar(*tardy, "{}_tardiness".format(pname))
+            )
+        # Task Start, End, Interval per Option, Select if Optional
+        windows = self.windows
+        for group in self.options.task_groups(self.options.chain("", pname)):
+            project, task, k = group.project, group.task, group.index
             task_label = "{}_{}_".format(project,task)
-            dv_start = self.model.NewIntVar(0, self.horizon, task_label + 'start')
-            dv_end = self.model.NewIntVar(0, self.horizon, task_label + 'end')
+            dv_start = self.model.NewIntVar(windows.start_lb[k].item(), windows.start_ub[k].item(), task_label + 'start')
+            dv_end = self.model.NewIntVar(windows.end_lb[k].item(), windows.end_ub[k].item(), task_label + 'end')
             self.task_times.setdefault(project, []).append(TaskWin(dv_start, dv_end))
-            has_multiple_options = (len(pdata) > 1)
-            for resource in pdata.index.get_level_values("Resource"):
+            has_multiple_options = (len(group.options) > 1)
+            for option in group.options:
+                resource, duration, units = option.resource, option.duration, option.units
                 resource_label = "{}_{}_{}_".format(project, task, resource)
-                duration = self.project_reqs.loc[(project,task,resource),"Duration"]
-                units = self.project_reqs.loc[(project,task,resource),"Units"]
                 if has_multiple_options:
                     dv_select = self.model.NewBoolVar(resource_label + "indicator")
                     dv_interval = self.model.NewOptionalIntervalVar(
@@ -84,110 +183,225 @@ class Model(object):
                 else:
                     dv_select = None
                     dv_interval = self.model.NewIntervalVar(dv_start, duration, dv_end, resource_label + "_interval")
-                self.assign.setdefault(project, []).append(Task(task, resource, units, dv_interval, dv_select))
+                self.assign.setdefault(project, []).append(Task(task, resource, units, dv_interval, dv_select, option.index))
                 self.resource_needs.setdefault(resource, []).append((dv_interval, units))
 
-        # Account for Additional Needs Due to Initial Commitment
-        for resource in self.resources:
-            for t, demand in enumerate(self.resource_busy[resource].values):
-                task = "t{:2d}".format(t)
-                ivname = "occupied_{}_{}_interval".format(t,resource)
-                if demand > 0:
-                    self.resource_needs.setdefault(resource,[]).append((self.model.NewIntervalVar(t, 1, t+1, ivname), demand))
+    def set_busy_intervals(self, resource):
+        "Fixed Intervals for the Prior Commitments of a Resource, Replacing Any Previous Ones"
+        needs = self.resource_needs.setdefault(resource,[])
+        for dv_busy, _ in needs:
+            if dv_busy.Name().startswith("occupied_"):
+                self.model.Proto().constraints[dv_busy.Index()].Clear()
+        # Cleared Intervals Lose Their Names
+        needs[:] = [need for need in needs if need[0].Name()]
+        for busy in busy_intervals(self.resource_busy[resource].values, self.compress_busy):
+            ivname = "occupied_{}_{}_{}_interval".format(busy.start,busy.length,resource)
+            dv_busy = self.model.NewIntervalVar(busy.start, busy.length, busy.start+busy.length, ivname)
+            needs.append((dv_busy, busy.demand))
 
     def get_project_endtime(self, projname):
         return self.task_times[projname][-1].end
     
-    def set_precedence_constraints(self):
-        for task_seq in self.task_times.values():
+    def set_precedence_constraints(self, projects: list=None):
+        for project in self.projects if projects is None else projects:
+            task_seq = self.task_times[project]
             # NOTE: ensure len(task_seq) >= 1
             for i in range(len(task_seq)-1):
                 self.model.Add(task_seq[i].end <= task_seq[i+1].start)
 
-    def set_resource_constraints(self):
+    def set_resource_constraints(self, projects: list=None):
         # Enforce One Resource Per Task
-        for _, idlist in self.resource_choice.items():
-            self.model.AddBoolXOr(*idlist)
+        for (project, _), idlist in self.resource_choice.items():
+            if projects is None or project in projects:
+                self.model.AddBoolXOr(*idlist)
+        if projects is not None:
+            return
         # Disjunctive Constraint: Enforce Resource Capacity Limit Over All Intervals
+        self.capacity_constraint = {}
         for resource in self.resources:
-            intervals, utilization = zip(*self.resource_needs[resource])
-            self.model.AddCumulative(
-                intervals, 
-                utilization, 
-                self.resource_attrs.loc[resource, "Capacity"]
-                )
+            self.set_capacity_constraint(resource)
+
+    def set_capacity_constraint(self, resource):
+        "Cumulative Constraint Over All Intervals Needing a Resource, Replacing Any Previous One"
+        if resource in self.capacity_constraint:
+            self.capacity_constraint.pop(resource).Proto().Clear()
+        if not self.resource_needs[resource]:
+            return
+        intervals, utilization = zip(*self.resource_needs[resource])
+        self.capacity_constraint[resource] = self.model.AddCumulative(
+            intervals, 
+            utilization, 
+            self.resource_attrs.loc[resource, "Capacity"]
+            )
+
+    def set_deadline_constraint(self, project):
+        "Deadline Constraint of a Project, Replacing Any Previous One"
+        if project in self.deadline_constraint:
+            self.deadline_constraint.pop(project).Proto().Clear()
+        deadline = self.project_attrs.loc[project,"Deadline"]
+        earliness, tardiness = self.project_completion[project]
+        self.deadline_constraint[project] = self.model.Add(deadline + tardiness - earliness == self.get_project_endtime(project))
+
+    def project_cost(self, project):
+        "Resource Cost + Delay Penalty - Early Bonus of a Project"
+        resource_cost = []
+        for tstruct in self.assign[project]:
+            cost_per_task = self.options.cost[tstruct.option].item()
+            resource_cost.append(cost_per_task if tstruct.is_active is None else cost_per_task * tstruct.is_active)
+        pdata = self.project_attrs.loc[project]
+        return (
+            sum(resource_cost) +
+            pdata["Delay Penalty"] * self.project_completion[project].tardy 
+            - pdata["Early Bonus"] * self.project_completion[project].early
+            )
+
+    def objective_terms(self) -> dict:
+        "Tardiness, Delay Penalty, Early Bonus and Resource Cost as Linear Terms (See lexicographic)"
+        active, cost, offset = [], [], 0
+        for tasks in self.assign.values():
+            for tstruct in tasks:
+                cost_per_task = self.options.cost[tstruct.option].item()
+                if tstruct.is_active is None:
+                    offset += cost_per_task
+                else:
+                    active.append(tstruct.is_active)
+                    cost.append(cost_per_task)
+        pdata = self.project_attrs.loc[self.projects]
+        tardy = [self.project_completion[project].tardy for project in self.projects]
+        early = [self.project_completion[project].early for project in self.projects]
+        return {
+            "tardiness": Term(tardy, [1] * len(tardy), 0),
+            "delay_penalty": Term(tardy, pdata["Delay Penalty"].tolist(), 0),
+            "early_bonus": Term(early, (-pdata["Early Bonus"]).tolist(), 0),
+            "resource_cost": Term(active, cost, offset),
+            }
 
     def set_objective(self):
         # Deadline Contraints
+        self.deadline_constraint = {}
         for project in self.projects:
-            deadline = self.project_attrs.loc[project,"Deadline"]
-            earliness, tardiness = self.project_completion[project]
-            self.model.Add(deadline + tardiness - earliness == self.get_project_endtime(project))
+            self.set_deadline_constraint(project)
         # Objective: Minimize Resource Cost + Delay Penalty - Early Bonus
-        resource_cost = []
-        for project in self.projects:
-            for tstruct in self.assign[project]:
-                cpd = self.resource_attrs.loc[tstruct.resource, "Cost per Day"]
-                duration = tstruct.interval.SizeExpr()
-                cost_per_task = cpd * tstruct.units * duration
-                resource_cost.append(cost_per_task if tstruct.is_active is None else cost_per_task * tstruct.is_active)
-                
-        self.model.Minimize(
-            sum(resource_cost) +
-            sum(
-                pdata["Delay Penalty"] * self.project_completion[project].tardy 
-                - pdata["Early Bonus"] * self.project_completion[project].early
-                for project, pdata in self.project_attrs.iterrows()
-                )
-            )
+        self.model.Minimize(sum(self.project_cost(project) for project in self.projects))
 
     def build_model(self):
         self.set_model_variables()
         self.set_precedence_constraints()
         self.set_resource_constraints()
         self.set_objective()
+        if self.break_symmetry:
+            self.set_symmetry_constraints()
+        if self.warm_start is not None:
+            self.set_solution_hints(self.warm_start)
+
+    def set_symmetry_constraints(self):
+        "Summed Task Starts of Interchangeable Projects Rise in Order; the First Task Offering Interchangeable Resources Uses the First"
+        self.symmetry = {
+            "projects": project_templates(self.project_attrs, self.project_reqs),
+            "resources": interchangeable_resources(self.options, self.resource_attrs, self.resource_busy),
+            }
+        for group in self.symmetry["projects"]:
+            starts = [sum(task_win.start for task_win in self.task_times[project]) for project in group]
+            for start_1, start_2 in zip(starts[:-1], starts[1:]):
+                self.model.Add(start_1 <= start_2)
+        is_active = {tstruct.option: tstruct.is_active for tasks in self.assign.values() for tstruct in tasks}
+        for group in self.symmetry["resources"]:
+            choices = [is_active[i] for i in first_choice(self.options, group)]
+            for choice_1, choice_2 in zip(choices[:-1], choices[1:]):
+                self.model.Add(choice_1 >= choice_2)
 
-    def solve(self, max_time: int=100):
+    def set_solution_hints(self, assignment_file: str):
+        "Hint Task Times and Resource Choices From a Previous Run's Assignment File"
+        self.model.ClearHints()
+        choices = previous_choices(load_assignment(assignment_file), self.datetime_0)
+        task_win, options = {}, {}
+        for project, tasks in self.assign.items():
+            for tstruct in tasks:
+                options.setdefault(("", project, tstruct.name), []).append(tstruct)
+            names = dict.fromkeys(tstruct.name for tstruct in tasks)
+            task_win.update({("", project, name): win for name, win in zip(names, self.task_times[project])})
+        matched, summary = match_tasks(choices, list(task_win))
+        for key, (resource, start, _) in matched.items():
+            chosen = [tstruct for tstruct in options[key] if tstruct.resource == resource]
+            self.model.AddHint(task_win[key].start, start)
+            if chosen:
+                self.model.AddHint(task_win[key].end, start + self.options.duration[chosen[0].option].item())
+            for tstruct in options[key]:
+                if tstruct.is_active is not None:
+                    self.model.AddHint(tstruct.is_active, tstruct.resource == resource)
+        print("Warm Start: {} Tasks Hinted, {} Tasks Added, {} Tasks Removed".format(*summary))
+        return summary
+
+    def set_solver(self, max_time: int=100, profile: str=None):
         self.solver = cp_model.CpSolver()
-        # Set Processing Time Limit
-        self.solver.parameters.max_time_in_seconds = max_time
+        # Set Processing Time Limit and Search Profile (From YAML solver Section Unless Given)
+        solver_config = dict(self.solver_config)
+        if profile is not None:
+            solver_config["profile"] = profile
+        set_solver_parameters(self.solver.parameters, max_time, **solver_config)
+        if self.instrumentation is not None:
+            self.instrumentation.attach(self.solver)
+        self.results = None
+
+    def solve(self, max_time: int=100, profile: str=None):
+        "Solve the Objective, or the Stages of self.lexicographic in Order (max_time and profile Are Stage Defaults)"
+        if self.lexicographic:
+            self.stages = solve_lexicographic(self, self.lexicographic, max_time, profile)
+            return
+        self.stages = None
+        self.set_solver(max_time, profile)
         self.status = self.solver.Solve(self.model)
         print(self.solver.ResponseStats())
 
+    def solve_stream(self, max_time: int=100, profile: str=None, gap: float=None, patience: float=None):
+        """
+        Solve in a Background Thread, Yielding Each Improving Solution as an Incumbent;
+        Stop Early at Relative gap or After patience Seconds Without Improvement
+        """
+        self.set_solver(max_time, profile)
+        self.solution_stream = SolutionStream(self.stream_options(), gap)
+        try:
+            yield from stream_solutions(self.solver, self.model, self.solution_stream, patience)
+        finally:
+            self.status = self.solver.ResponseProto().status
+
+    def stream_options(self):
+        "Task Options Reported by solve_stream: ((Project, Task, Resource), Start, End, Is Active)"
+        return [
+            ((pname, tstruct.name, tstruct.resource), tstruct.interval.StartExpr(), tstruct.interval.EndExpr(), tstruct.is_active)
+            for pname in self.assign
+            for tstruct in self.assign[pname]
+            ]
+
+    def extract_results(self) -> pd.DataFrame:
+        "Read the Solution at Once Into the Columnar Results Table self.results (One Row per Task Option)"
+        indices = []
+        for project, tasks in self.assign.items():
+            first = self.options.chain("", project).start
+            task_times, completion = self.task_times[project], self.project_completion[project]
+            chain = (task_times[-1].end.Index(), completion.early.Index(), completion.tardy.Index())
+            for tstruct in tasks:
+                task_win = task_times[self.options.option_task[tstruct.option] - first]
+                is_active = -1 if tstruct.is_active is None else tstruct.is_active.Index()
+                indices.append((tstruct.option, task_win.start.Index(), task_win.end.Index(), is_active) + chain)
+        indices = np.array(indices, dtype=np.int64).reshape(-1, 7)
+        self.results = results_table(self.options, self.solver.ResponseProto().solution, *indices.T)
+        return self.results
+
     def collect_results(self):
         out = "\n"*3
         if self.status == cp_model.OPTIMAL or self.status == cp_model.FEASIBLE:
             out += '- Solution Status: {}\n'.format(self.solver.StatusName())
-            self.__tograph__ = []
-            for pname in self.assign:
-                for tstruct in self.assign[pname]:
-                    start = tstruct.interval.StartExpr()
-                    end = tstruct.interval.EndExpr()
-                    row = {'Project': pname}
-                    row["Task"] = tstruct.name
-                    row["Resource"] = tstruct.resource
-                    row["Start"] = self.get_date(self.solver.Value(start))
-                    row["Finish"] = self.get_date(self.solver.Value(end))
-                    row["Is_Active"] = True if tstruct.is_active is None else bool(self.solver.Value(tstruct.is_active))
-                    self.__tograph__.append(row)
-
-            df = pd.DataFrame(self.__tograph__)
-            fig = px.timeline(
-                df.loc[df["Is_Active"],:], 
-                x_start="Start", 
-                x_end="Finish", 
-                y="Project", 
-                color="Task",
-                pattern_shape="Resource",
-                pattern_shape_sequence=["x", "", "+"],
-                color_discrete_sequence=px.colors.qualitative.Light24
-            )
-            fig.update_yaxes(categoryorder="category descending")
+            df = assignment_table(self.extract_results(), self.datetime_0, scenario=False)
+            # Persist Assignment for Warm Starts of Later Runs
+            df.to_csv(self.report_path.format("{}_assignment.csv".format(self.name)), index=False)
             filename = self.report_path.format("{}_timetable.png".format(self.name))
-            pio.write_image(fig, filename, width=1080, height=720)
+            self.renderer.submit(save_timetable, df, filename)
 
             out += '\t- Optimal Objective Value: {:,.3f}\n'.format(self.solver.ObjectiveValue())
             out += '\t- Optimal Objective Bound: {:,.3f}\n'.format(self.solver.BestObjectiveBound())
+            out += stage_report(getattr(self, "stages", None))
+            out += symmetry_report(getattr(self, "symmetry", None))
         else:
             out += '- No solution found.\n'
         
@@ -200,33 +414,23 @@ class Model(object):
         out += fmt.format("Project", "Completion", "Early", "Tardy")
         out += fmt.format(":------", "---------:", "----:", "----:")
         self.makespan = 0
+        completion = completion_table(self.results).set_index("Project")
         for pname in self.projects:
-            proj_end = self.solver.Value(self.get_project_endtime(pname))
-            earliness, tardiness = self.project_completion[pname]
+            proj_end, earliness, tardiness = completion.loc[pname, CHAIN_VALUES].tolist()
             self.makespan = max(self.makespan, proj_end)
-            out += fmt.format(pname, proj_end, self.solver.Value(earliness), self.solver.Value(tardiness))
+            out += fmt.format(pname, proj_end, earliness, tardiness)
         return out
     
-    def resource_report(self):
-        cols = [(resource, s) for resource in self.resources for s in ['state0','state1']]
-        utilization = pd.DataFrame(0, index=np.arange(self.makespan+1), columns=pd.MultiIndex.from_tuples(cols))
+    def utilization(self):
+        "Daily Utilization per Resource Up to the Makespan: state0 Prior Commitments, state1 Total Load"
+        busy = {resource: self.resource_busy[resource].values for resource in self.resources}
+        utilization = results_utilization(self.results, busy, self.makespan+1)
         utilization.columns.names = ['Resource','State']
-        for resource in self.resources:
-            for i, x in enumerate(self.resource_busy[resource].values):
-                utilization.loc[i,(resource,'state0')] += x
-            for iv, units in self.resource_needs[resource]:
-                start = self.solver.Value(iv.StartExpr())
-                end = self.solver.Value(iv.EndExpr())
-                for i in range(start,end):
-                    utilization.loc[i,(resource,'state1')] += units
-        color_dict = {'state0':'grey', 'state1':'green'}
-        utilization.index = [self.get_date(t).strftime("%b %d") for t in utilization.index]
-        fig, axs = plt.subplots(len(self.resources), 1, figsize=(8,12), sharex=True)
-        fig.autofmt_xdate(rotation=90)
-        for i, rname in enumerate(self.resources):
-            utilization.loc[:,(rname,'state1')] -= utilization.loc[:,(rname,'state0')]
-            utilization[rname].plot.bar(stacked=True, title=rname, width=1, grid=True, color=color_dict, ax=axs[i])
-        return fig
+        utilization.index = pd.Index([self.get_date(t) for t in utilization.index], name="Date")
+        return utilization
+
+    def resource_report(self, utilization=None):
+        return utilization_figure(self.utilization() if utilization is None else utilization)
     
     def report_results(self):
         repfile = open(self.report_file, "a")
@@ -235,13 +439,24 @@ class Model(object):
         print(self.project_report() , file=repfile)
         print("\n\n## Optimal Timetable" , file=repfile)
         timetable_file = "{}_timetable.png".format(self.name)
-        print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
+        if self.renderer.enabled:
+            print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
         print("\n\n## Optimal Resource Utilization" , file=repfile)
         utilization_file = "{}_utilization.png".format(self.name)
-        fig = self.resource_report()
-        fig.savefig(self.report_path.format(utilization_file), dpi=72)
-        print("![Utilization]({})\n\n\n".format(utilization_file) , file=repfile)
+        utilization_csv = "{}_utilization.csv".format(self.name)
+        utilization = self.utilization()
+        utilization.to_csv(self.report_path.format(utilization_csv))
+        self.renderer.submit(save_utilization, utilization, self.report_path.format(utilization_file), None)
+        if self.renderer.enabled:
+            print("![Utilization]({})\n".format(utilization_file) , file=repfile)
+        print("[Daily Utilization (CSV)]({})\n\n\n".format(utilization_csv) , file=repfile)
+        if self.instrumentation is not None:
+            print("[Phase Timings (CSV)]({0}_phases.csv), [Phase and Solver Statistics (JSON)]({0}_phases.json)\n".format(self.name) , file=repfile)
         repfile.close()
+        # Append the Run to the Results Store (History Across Runs)
+        if self.results_store is not None:
+            with ResultsStore(self.results_store) as store:
+                self.run_id = store.record(self, utilization)
 
 
 if __name__ == "__main__":
@@ -249,4 +464,5 @@ if __name__ == "__main__":
     mod.get_inputs()
     mod.build_model()
     mod.solve()
-    mod.report_results()
\ No newline at end of file
+    mod.report_results()
+    mod.renderer.wait()
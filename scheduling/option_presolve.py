@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Presolve: Remove Provably Dominated Task Options Before Model Building
+# Option B of a Task Is Dominated by Option A of the Same Task When A Is No Longer and No
+# Costlier (Ties Broken by Input Order) and A's Resource Never Runs Short While the Task Can Run:
+# Over the Task's Window (task_windows) Its Free Capacity (Capacity - resource_busy) Covers the
+# Largest Units Every Task Whose Window Holds the Day Could Ask of It. Any Schedule Using B Then
+# Stays Feasible and No Costlier With A Instead (Same Start, No Later End), so an Optimal Schedule
+# Survives the Removal. Options Needing More Units Than Their Resource's Capacity Never Fit and Go
+# Too, Unless No Other Option Is Left. With Several Scenarios, Nonanticipativity Ties Task Ends:
+# A Must Then Take Exactly as Long as B, and a project_reqs Row Goes Only if Removable in Every
+# Scenario and Equally Long in All of Them.
+
+REMOVED_COLUMNS = ["Project", "Task", "Resource", "Duration", "Units", "Cost", "Reason", "Kept Resource"]
+
+def short_days(options, windows, resource_attrs: pd.DataFrame, resource_busy: pd.DataFrame) -> np.ndarray:
+    """
+    Prefix Count (Scenarios x Resources x Days + 1) of Days a Resource May Run Short: Its Free
+    Capacity Is Less Than the Summed Largest Units of the Task Groups Whose Window Holds the Day
+    """
+    days = int(windows.end_ub.max()) + 1 if options.n_tasks else 1
+    resources = options.resources
+    capacity = resource_attrs["Capacity"].reindex(resources).to_numpy(dtype=np.int64)
+    busy = np.zeros((len(resources), days), dtype=np.int64)
+    known = [resource for resource in resources if resource in resource_busy]
+    n = min(len(resource_busy), days)
+    busy[resources.get_indexer(known), :n] = resource_busy[known].to_numpy()[:n].T
+    # Largest Units per Task Group and Resource, Added Over the Task Group's Window
+    units = pd.Series(options.units).groupby([options.option_task, options.resource]).max()
+    task, resource = (units.index.get_level_values(level).to_numpy() for level in (0, 1))
+    scenario = options.task_scenario[task]
+    demand = np.zeros((len(options.scenarios), len(resources), days + 1), dtype=np.int64)
+    np.add.at(demand, (scenario, resource, windows.start_lb[task]), units.to_numpy())
+    np.add.at(demand, (scenario, resource, windows.end_ub[task]), -units.to_numpy())
+    short = demand.cumsum(axis=2)[:, :, :days] > (capacity[:, None] - busy)[None]
+    count = np.zeros(demand.shape, dtype=np.int64)
+    np.cumsum(short, axis=2, out=count[:, :, 1:])
+    return count
+
+def dominated_options(options, windows, resource_attrs: pd.DataFrame, resource_busy: pd.DataFrame) -> pd.DataFrame:
+    "Removable Options (Index: Option Row) With the Reason and the Option Kept in Their Place"
+    n = options.n_options
+    same_duration = len(options.scenarios) > 1
+    capacity = resource_attrs["Capacity"].reindex(options.resources).to_numpy(dtype=np.int64)
+    fits = options.units <= capacity[options.resource]
+    # A Can Stand in for Other Options if Its Resource Never Runs Short Over the Task's Window
+    k = options.option_task
+    short = short_days(options, windows, resource_attrs, resource_busy)
+    s = options.task_scenario[k]
+    ample = fits & (short[s, options.resource, windows.end_ub[k]] == short[s, options.resource, windows.start_lb[k]])
+    # All Ordered Pairs (i, j) of Options of the Same Task Group
+    size = options.task_size[k]
+    i = np.repeat(np.arange(n), size)
+    j = options.task_offset[k][i] + np.arange(len(i)) - np.repeat(np.cumsum(size) - size, size)
+    duration, cost = options.duration, options.cost
+    shorter = duration[j] == duration[i] if same_duration else duration[j] <= duration[i]
+    dominates = (
+        (j != i) & ample[j] & shorter & (cost[j] <= cost[i]) &
+        ((duration[j] < duration[i]) | (cost[j] < cost[i]) | (j < i))
+        )
+    over = ~fits[i] & fits[j]
+    kept = np.full(n, -1)
+    reason = np.full(n, "", dtype=object)
+    for mask, why in ((dominates, "Dominated"), (over, "Over Capacity")):
+        rows, first = np.unique(i[mask], return_index=True)
+        kept[rows], reason[rows] = j[mask][first], why
+    removed = np.flatnonzero(kept >= 0)
+    frame = options.label_frame().iloc[removed]
+    frame["Duration"] = duration[removed]
+    frame["Units"] = options.units[removed]
+    frame["Cost"] = cost[removed]
+    frame["Reason"] = reason[removed]
+    frame["Kept Resource"] = options.resources[options.resource[kept[removed]]]
+    return frame
+
+def remove_dominated(project_reqs: pd.DataFrame, options, windows, resource_attrs: pd.DataFrame, resource_busy: pd.DataFrame) -> tuple:
+    """
+    project_reqs Without Removable Options and the Removed (Project, Task, Resource) Rows; With
+    Several Scenarios a Row Goes Only if Removable and Equally Long in Every Scenario Holding It
+    """
+    removed = dominated_options(options, windows, resource_attrs, resource_busy)
+    labels = options.label_frame().assign(Duration=options.duration, Removed=False)
+    labels.loc[removed.index, "Removed"] = True
+    by_row = labels.groupby(["Project", "Task", "Resource"], sort=False).agg(
+        Removed=("Removed", "all"), Durations=("Duration", "nunique"))
+    drop = by_row.index[by_row["Removed"] & (by_row["Durations"] == 1)]
+    keys = project_reqs.index.droplevel("Scenario") if "Scenario" in project_reqs.index.names else project_reqs.index
+    if not len(drop):
+        return project_reqs, pd.DataFrame(columns=REMOVED_COLUMNS)
+    removed = removed.drop_duplicates(["Project", "Task", "Resource"]).set_index(["Project", "Task", "Resource"])
+    return project_reqs[~keys.isin(drop)], removed.loc[drop].reset_index()[REMOVED_COLUMNS]
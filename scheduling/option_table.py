@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+Option = namedtuple('Option', 'index resource duration units cost')
+TaskGroup = namedtuple('TaskGroup', 'index scenario project task options')
+
+def contiguous(project_reqs: pd.DataFrame) -> pd.DataFrame:
+    """
+    project_reqs With the Rows of Each Task, and the Tasks of Each (Scenario, Project), Made
+    Consecutive: Stable Sort by Order of First Appearance (as groupby(sort=False) Groups Them)
+    """
+    index = project_reqs.index
+    names = [name for name in ("Scenario", "Project", "Task") if name in index.names]
+    codes = [pd.factorize(pd.MultiIndex.from_arrays([index.get_level_values(n) for n in names[:i+1]]))[0] for i in range(len(names))]
+    order = np.lexsort(codes[::-1])
+    if (order == np.arange(len(order))).all():
+        return project_reqs
+    return project_reqs.iloc[order]
+
+
+class OptionTable(object):
+    """
+    Array-backed table of task options (one row per project_reqs row).
+
+    Scenario/project/task/resource labels are integer coded, durations, units
+    and resource costs are held in NumPy columns. Consecutive rows with the same
+    (scenario, project, task) form a task group; consecutive task groups with the
+    same (scenario, project) form a task chain, numbered in input order; last_task
+    maps (scenario, project) to the final task group of its chain. Built once per input set, so that
+    model building never has to query the project_reqs MultiIndex. Rows of a task group and task
+    groups of a chain must be consecutive (see contiguous).
+    """
+
+    def __init__(self, project_reqs: pd.DataFrame, resource_attrs: pd.DataFrame) -> None:
+        reqs = project_reqs.reset_index()
+        if "Scenario" not in reqs.columns:
+            reqs.insert(0, "Scenario", "")
+        self.n_options = len(reqs)
+
+        # Integer Codes in Order of First Appearance (Resources Follow resource_attrs)
+        self.scenario, self.scenarios = pd.factorize(reqs["Scenario"])
+        self.project, self.projects = pd.factorize(reqs["Project"])
+        self.task, self.tasks = pd.factorize(reqs["Task"])
+        self.resources = resource_attrs.index
+        self.resource = self.resources.get_indexer(reqs["Resource"])
+        if (self.resource < 0).any():
+            unknown = reqs.loc[self.resource < 0, "Resource"].unique()
+            raise ValueError("Unknown Resources in Project Requirements: {}".format(list(unknown)))
+
+        # Option Columns
+        self.duration = reqs["Duration"].to_numpy(dtype=np.int64)
+        self.units = reqs["Units"].to_numpy(dtype=np.int64)
+        self.cost_per_day = resource_attrs["Cost per Day"].to_numpy()[self.resource]
+        self.cost = self.cost_per_day * self.units * self.duration
+
+        # Task Groups: Runs of Rows With Same Scenario, Project, Task
+        key = np.stack([self.scenario, self.project, self.task])
+        new_task = np.ones(self.n_options, dtype=bool)
+        new_task[1:] = (key[:,1:] != key[:,:-1]).any(axis=0)
+        self.task_offset = np.append(np.flatnonzero(new_task), self.n_options)
+        first = self.task_offset[:-1]
+        self.n_tasks = len(first)
+        self.task_scenario = self.scenario[first]
+        self.task_project = self.project[first]
+        self.task_name = self.task[first]
+        self.task_size = np.diff(self.task_offset)
+        if self.n_tasks != len(np.unique(key, axis=1).T):
+            raise ValueError("Rows of a Task Are Not Consecutive in Project Requirements; See option_table.contiguous")
+
+        # Task Chains: Runs of Task Groups With Same Scenario, Project
+        new_chain = np.ones(self.n_tasks, dtype=bool)
+        new_chain[1:] = (
+            (self.task_scenario[1:] != self.task_scenario[:-1]) |
+            (self.task_project[1:] != self.task_project[:-1])
+            )
+        self.chain_offset = np.append(np.flatnonzero(new_chain), self.n_tasks)
+        self.n_chains = len(self.chain_offset) - 1
+        if self.n_chains != len(np.unique(key[:2, first], axis=1).T):
+            raise ValueError("Tasks of a Project Are Not Consecutive in Project Requirements; See option_table.contiguous")
+        self.chain_scenario = self.task_scenario[self.chain_offset[:-1]]
+        self.chain_project = self.task_project[self.chain_offset[:-1]]
+        # Task Group of Each Option, Task Chain of Each Task Group
+        self.option_task = np.repeat(np.arange(self.n_tasks), self.task_size)
+        self.task_chain = np.repeat(np.arange(self.n_chains), np.diff(self.chain_offset))
+        last = self.chain_offset[1:] - 1
+        self.last_task = dict(zip(
+            zip(self.scenarios[self.task_scenario[last]], self.projects[self.task_project[last]]),
+            last.tolist()
+            ))
+
+        # Python Lists for Fast Scalar Access in Model Building Loops
+        self._labels = (self.scenarios.to_list(), self.projects.to_list(), self.tasks.to_list())
+        self._groups = list(zip(self.task_scenario.tolist(), self.task_project.tolist(), self.task_name.tolist()))
+        self._offsets = self.task_offset.tolist()
+        self._rows = list(zip(
+            range(self.n_options),
+            self.resources[self.resource].to_list(),
+            self.duration.tolist(),
+            self.units.tolist(),
+            self.cost.tolist()
+            ))
+
+    def option(self, i: int) -> Option:
+        return Option(*self._rows[i])
+
+    def label_frame(self) -> pd.DataFrame:
+        "Scenario, Project, Task and Resource of Each Option"
+        return pd.DataFrame({
+            "Scenario": self.scenarios[self.scenario],
+            "Project": self.projects[self.project],
+            "Task": self.tasks[self.task],
+            "Resource": self.resources[self.resource],
+            })
+
+    def chain_id(self, scenario: str, project: str) -> int:
+        "Number of the Task Chain of (scenario, project)"
+        return self.task_chain[self.last_task[scenario, project]].item()
+
+    def chain(self, scenario: str, project: str) -> range:
+        "Task Group Indices of the Task Chain of (scenario, project)"
+        c = self.chain_id(scenario, project)
+        return range(self.chain_offset[c].item(), self.chain_offset[c+1].item())
+
+    def task_groups(self, tasks: range=None):
+        "Yield Task Groups in Input Order (or Those Indexed by tasks), Each With Its List of Options"
+        scenarios, projects, names = self._labels
+        offsets = self._offsets
+        for k in range(self.n_tasks) if tasks is None else tasks:
+            s, p, t = self._groups[k]
+            options = [Option(*row) for row in self._rows[offsets[k]:offsets[k+1]]]
+            yield TaskGroup(k, scenarios[s], projects[p], names[t], options)
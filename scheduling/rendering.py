@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor, Future, wait
+import multiprocessing
+import atexit
+
+# Rendering Stage for Report Charts: Off (Data Only), Synchronous or in a Background Process Pool
+# Chart Functions Take Plain Data (Assignment and Utilization Tables), so Jobs Pickle to Workers
+# Plotting Libraries Are Imported by the Chart Functions Only, Keeping Headless Runs Light
+
+RENDER_MODES = ("off", "sync", "background")
+
+_pool = None
+
+def get_pool(max_workers: int=None) -> ProcessPoolExecutor:
+    "Shared Worker Pool; Spawned Workers Do Not Inherit the Solver's Threads"
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(shutdown_pool)
+    return _pool
+
+def shutdown_pool() -> None:
+    "Finish Pending Charts and Stop the Shared Workers (Run at Exit)"
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+
+def timetable_figure(assignment, y: str="Project", markers: list=()):
+    "Gantt Chart of Active Task Options; markers: Dates Marked as Uncertainty Resolution"
+    import plotly.express as px
+    fig = px.timeline(
+        assignment.loc[assignment["Is_Active"],:],
+        x_start="Start",
+        x_end="Finish",
+        y=y,
+        color="Task",
+        pattern_shape="Resource",
+        pattern_shape_sequence=["x", "", "+"],
+        color_discrete_sequence=px.colors.qualitative.Light24
+    )
+    fig.update_yaxes(categoryorder="category descending")
+    for urt in markers:
+        fig.add_vline(x=urt, line_dash="dot", line_color="white")
+        fig.add_annotation(
+            dict(x=urt,y=-1.0,text="Uncertainty Resolution",xanchor='center',font=dict(size=15))
+            )
+    return fig
+
+def save_timetable(assignment, filename: str, y: str="Project", markers: list=()) -> str:
+    import plotly.io as pio
+    pio.write_image(timetable_figure(assignment, y, markers), filename, width=1080, height=720)
+    return filename
+
+def utilization_figure(utilization, markers: dict=None):
+    """
+    Stacked Daily Utilization, One Panel per Resource (Rows) and Scenario (Columns)
+    markers: {Scenario: [Day]} Marked as Uncertainty Resolution
+    """
+    import matplotlib.pyplot as plt
+    color_dict = {'state0':'grey', 'state1':'green'}
+    labels = [t.strftime("%b %d") for t in utilization.index]
+    multi = "Scenario" in utilization.columns.names
+    scenarios = utilization.columns.unique("Scenario").to_list() if multi else [None]
+    resources = utilization.columns.unique("Resource").to_list()
+    fig, axs = plt.subplots(len(resources), len(scenarios), figsize=(16,12) if multi else (8,12), sharex=True, squeeze=False)
+    fig.autofmt_xdate(rotation=90)
+    for i, rname in enumerate(resources):
+        for j, scenario in enumerate(scenarios):
+            panel = (utilization[scenario][rname] if multi else utilization[rname]).copy()
+            panel.index = labels
+            panel['state1'] -= panel['state0']
+            ttl = "{}_{}".format(scenario, rname) if multi else rname
+            panel.plot.bar(stacked=True, title=ttl, width=1, grid=True, color=color_dict, ax=axs[i,j])
+            yannot = panel.sum(1).max()
+            for urt in (markers or {}).get(scenario, []):
+                axs[i,j].axvline(urt, color='red', linestyle=':', lw=2)
+                axs[i,j].text(urt, yannot, "Uncertainty\nResolution", ha='center', va='top',
+                              bbox=dict(facecolor='white',boxstyle='square',edgecolor='red',pad=0.2))
+    return fig
+
+def save_utilization(utilization, filename: str, markers: dict=None) -> str:
+    import matplotlib.pyplot as plt
+    fig = utilization_figure(utilization, markers)
+    fig.savefig(filename, dpi=72)
+    plt.close(fig)
+    return filename
+
+
+class Renderer(object):
+    "Run Chart Jobs According to mode: 'off', 'sync' or 'background'"
+
+    def __init__(self, mode: str="sync", max_workers: int=None) -> None:
+        mode = "off" if mode in (None, False) else mode
+        if mode not in RENDER_MODES:
+            raise ValueError("Unknown render mode {!r}, expected one of {}".format(mode, RENDER_MODES))
+        self.mode = mode
+        self.max_workers = max_workers
+        self.jobs = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        if self.mode == "off":
+            return None
+        if self.mode == "background":
+            job = get_pool(self.max_workers).submit(fn, *args, **kwargs)
+        else:
+            job = Future()
+            job.set_result(fn(*args, **kwargs))
+        self.jobs.append(job)
+        return job
+
+    def wait(self) -> list:
+        "Block Until All Submitted Charts Are Written; Return Their File Names"
+        wait(self.jobs)
+        return [job.result() for job in self.jobs]
@@ -0,0 +1,251 @@
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from input_cache import file_digest, frame_digest
+from instrumentation import RESPONSE_STATS
+
+# Persistent Store of Solved Runs (SQLite, One File for Any Number of Runs)
+# report_results Appends One Run When the Model Has a results_store (YAML Key results_store:
+# Path of the Database File). Tables:
+#   runs          One Row per Run: Name, Model, Time, Configuration File and Digest, Time 0,
+#                 Status, Objective, Bound, Gap and CP-SAT Response Statistics
+#   inputs        Digest and Row Count of Each Input Table of a Run (Same Digest, Same Table)
+#   assignments   One Row per Task Option of the Results Table, With ISO Start and Finish Dates
+#   utilization   One Row per Day, Scenario and Resource: state0 Prior Commitments, state1 Total Load
+# Queries Filter by Run, Project, Resource and Date Range Through Indices, Dates Being ISO Strings
+# That Sort as Dates; With chunksize, Rows Are Read in Chunks Instead of All at Once.
+# Usage (From Repository Root):
+#   python scheduling/results_store.py runs.sqlite runs --name stoch_duration_example_V1
+#   python scheduling/results_store.py runs.sqlite assignments --project regsize --start 2023-06-01
+
+INPUT_TABLES = ["project_attrs", "project_reqs", "resource_attrs", "resource_busy"]
+RUN_FIELDS = ["name", "model", "created", "config_file", "config_digest", "datetime_0", "status", "objective", "bound", "gap"] + RESPONSE_STATS
+ASSIGNMENT_FIELDS = [
+    "Scenario", "Project", "Task", "Resource", "Option", "Duration", "Units", "Cost",
+    "Start", "Finish", "Start_Date", "Finish_Date", "Is_Active", "Completion", "Early", "Tardy",
+    ]
+UTILIZATION_FIELDS = ["Scenario", "Resource", "Date", "state0", "state1"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT, {runs}
+    );
+CREATE TABLE IF NOT EXISTS inputs (
+    run_id INTEGER REFERENCES runs(run_id), table_name TEXT, digest TEXT, n_rows INTEGER
+    );
+CREATE TABLE IF NOT EXISTS assignments (
+    run_id INTEGER REFERENCES runs(run_id), {assignments}
+    );
+CREATE TABLE IF NOT EXISTS utilization (
+    run_id INTEGER REFERENCES runs(run_id), {utilization}
+    );
+CREATE INDEX IF NOT EXISTS runs_name ON runs (name, created);
+CREATE INDEX IF NOT EXISTS inputs_run ON inputs (run_id);
+CREATE INDEX IF NOT EXISTS inputs_digest ON inputs (digest);
+CREATE INDEX IF NOT EXISTS assignments_run ON assignments (run_id);
+CREATE INDEX IF NOT EXISTS assignments_project ON assignments (Project, run_id);
+CREATE INDEX IF NOT EXISTS assignments_resource ON assignments (Resource, Start_Date);
+CREATE INDEX IF NOT EXISTS utilization_run ON utilization (run_id, Resource, Date);
+CREATE INDEX IF NOT EXISTS utilization_resource ON utilization (Resource, Date);
+""".format(
+    runs=", ".join(RUN_FIELDS),
+    assignments=", ".join(ASSIGNMENT_FIELDS),
+    utilization=", ".join(UTILIZATION_FIELDS),
+    )
+
+def run_row(mod) -> dict:
+    "Run Metadata and Solver Statistics of a Solved Model"
+    config_file = getattr(mod, "model_input_file", None)
+    row = dict.fromkeys(RUN_FIELDS)
+    row.update(
+        name=mod.name,
+        model="{}.{}".format(type(mod).__module__, type(mod).__name__),
+        created=datetime.now().isoformat(timespec="seconds"),
+        config_file=config_file,
+        config_digest=None if config_file is None else file_digest(config_file),
+        datetime_0=mod.datetime_0.isoformat(),
+        status=mod.solver.StatusName(),
+        )
+    if row["status"] in ("OPTIMAL", "FEASIBLE"):
+        response = mod.solver.ResponseProto()
+        row.update({stat: getattr(response, stat) for stat in RESPONSE_STATS})
+        row.update(objective=response.objective_value, bound=response.best_objective_bound)
+        row["gap"] = abs(row["objective"] - row["bound"]) / max(abs(row["objective"]), 1)
+    return row
+
+def assignment_rows(results: pd.DataFrame, datetime_0) -> pd.DataFrame:
+    "Results Table With ISO Start and Finish Dates, in Store Column Order"
+    t0 = pd.Timestamp(datetime_0)
+    df = results.copy()
+    for column in ("Start", "Finish"):
+        dates = t0 + pd.to_timedelta(df[column].to_numpy(), unit="D")
+        df[column + "_Date"] = dates.strftime("%Y-%m-%d")
+    df["Is_Active"] = df["Is_Active"].astype(int)
+    return df[ASSIGNMENT_FIELDS]
+
+def utilization_rows(utilization: pd.DataFrame) -> pd.DataFrame:
+    "Daily Utilization (Columns (Scenario,) Resource, State) in Long Format, One Row per Day and Key"
+    dates = np.array([d.isoformat() for d in utilization.index], dtype=object)
+    frames = []
+    for key in dict.fromkeys(column[:-1] for column in utilization.columns):
+        scenario, resource = key if len(key) == 2 else ("",) + key
+        frames.append(pd.DataFrame({
+            "Scenario": scenario, "Resource": resource, "Date": dates,
+            "state0": utilization[key + ("state0",)].to_numpy(),
+            "state1": utilization[key + ("state1",)].to_numpy(),
+            }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=UTILIZATION_FIELDS)
+
+
+class ResultsStore(object):
+    "Append-Only SQLite Store of Runs With Indexed Queries"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Several Batch Workers May Write; WAL Lets Readers Proceed While One Writes
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(self, mod, utilization: pd.DataFrame=None) -> int:
+        "Append a Solved Model: Metadata, Input Digests, Results Table and utilization; Returns the run_id"
+        row = run_row(mod)
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs ({}) VALUES ({})".format(", ".join(row), ", ".join("?" * len(row))),
+                list(row.values())
+                )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO inputs VALUES (?, ?, ?, ?)",
+                [(run_id, table, frame_digest(getattr(mod, table)), len(getattr(mod, table))) for table in INPUT_TABLES]
+                )
+            if getattr(mod, "results", None) is not None:
+                self.insert("assignments", run_id, assignment_rows(mod.results, mod.datetime_0))
+            if utilization is not None:
+                self.insert("utilization", run_id, utilization_rows(utilization))
+        return run_id
+
+    def insert(self, table: str, run_id: int, df: pd.DataFrame) -> None:
+        sql = "INSERT INTO {} VALUES ({})".format(table, ", ".join("?" * (len(df.columns) + 1)))
+        columns = [np.full(len(df), run_id).tolist()] + [df[column].tolist() for column in df.columns]
+        self.connection.executemany(sql, zip(*columns))
+
+    def query(self, sql: str, params: list, chunksize: int=None):
+        "DataFrame of a Query, or an Iterator of DataFrames of chunksize Rows"
+        return pd.read_sql_query(sql, self.connection, params=params, chunksize=chunksize)
+
+    def runs(self, name: str=None, model: str=None, since: str=None, until: str=None, digest: str=None) -> pd.DataFrame:
+        "Runs by Name, Model Class, Creation Time Range (ISO) or Input Table Digest"
+        where, params = [], []
+        for clause, value in (
+                ("name = ?", name), ("model LIKE ?", None if model is None else "%" + model),
+                ("created >= ?", since), ("created <= ?", until),
+                ("run_id IN (SELECT run_id FROM inputs WHERE digest = ?)", digest)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = "SELECT * FROM runs" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY run_id"
+        return self.query(sql, params)
+
+    def inputs(self, run: int) -> pd.DataFrame:
+        return self.query("SELECT table_name, digest, n_rows FROM inputs WHERE run_id = ?", [run])
+
+    def filters(self, run, scenario: str, resource: str) -> tuple:
+        where, params = [], []
+        if run is not None:
+            runs = [run] if np.isscalar(run) else list(run)
+            where.append("run_id IN ({})".format(", ".join("?" * len(runs))))
+            params += [int(r) for r in runs]
+        for column, value in (("Scenario", scenario), ("Resource", resource)):
+            if value is not None:
+                where.append("{} = ?".format(column))
+                params.append(value)
+        return where, params
+
+    def assignments(
+            self,
+            run=None,
+            project: str=None,
+            resource: str=None,
+            start: str=None,
+            end: str=None,
+            scenario: str=None,
+            active_only: bool=False,
+            chunksize: int=None):
+        """
+        Task Options of One or Several Runs (run: run_id or List), Filtered by Project, Resource,
+        Scenario and Date Range: Options Scheduled Over Any Day of [start, end] (ISO Dates)
+        """
+        where, params = self.filters(run, scenario, resource)
+        for clause, value in (("Project = ?", project), ("Finish_Date > ?", start), ("Start_Date <= ?", end)):
+            if value is not None:
+                where.append(clause)
+                params.append(str(value))
+        if active_only:
+            where.append("Is_Active = 1")
+        sql = "SELECT * FROM assignments" + (" WHERE " + " AND ".join(where) if where else "")
+        return self.query(sql, params, chunksize)
+
+    def utilization(
+            self,
+            run=None,
+            resource: str=None,
+            start: str=None,
+            end: str=None,
+            scenario: str=None,
+            chunksize: int=None):
+        "Daily Utilization of One or Several Runs, Filtered by Resource, Scenario and Dates in [start, end]"
+        where, params = self.filters(run, scenario, resource)
+        for clause, value in (("Date >= ?", start), ("Date <= ?", end)):
+            if value is not None:
+                where.append(clause)
+                params.append(str(value))
+        sql = "SELECT * FROM utilization" + (" WHERE " + " AND ".join(where) if where else "")
+        return self.query(sql, params, chunksize)
+
+    def assignment(self, run: int) -> pd.DataFrame:
+        "Assignment of a Run as Read by warm_start.load_assignment, for Warm Starts From the Store"
+        df = self.assignments(run)
+        df["Start"] = pd.to_datetime(df["Start_Date"])
+        df["Finish"] = pd.to_datetime(df["Finish_Date"])
+        df["Is_Active"] = df["Is_Active"].astype(bool)
+        return df[["Scenario", "Project", "Task", "Resource", "Start", "Finish", "Is_Active"]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the runs of a results store")
+    parser.add_argument("store", help="SQLite file written by report_results")
+    parser.add_argument("table", choices=["runs", "assignments", "utilization"])
+    parser.add_argument("--name", default=None, help="runs: model instance name")
+    parser.add_argument("--run", type=int, nargs="+", default=None, help="run ids")
+    parser.add_argument("--project", default=None)
+    parser.add_argument("--resource", default=None)
+    parser.add_argument("--scenario", default=None)
+    parser.add_argument("--start", default=None, help="first date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="last date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    with ResultsStore(args.store) as store:
+        if args.table == "runs":
+            df = store.runs(name=args.name)
+        elif args.table == "assignments":
+            df = store.assignments(args.run, args.project, args.resource, args.start, args.end, args.scenario)
+        else:
+            df = store.utilization(args.run, args.resource, args.start, args.end, args.scenario)
+    print(df.to_markdown(index=False))
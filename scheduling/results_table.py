@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+# One-Shot Extraction of a Solution Into a Columnar Results Table
+# All Values Are Read at Once From the Solver's Solution Vector (Indexed by Proto Variable
+# Index) Into NumPy Columns, One Row per Task Option:
+#   Scenario, Project, Task, Resource     Labels ("" Scenario for Single Period Models)
+#   Option, Duration, Units, Cost         OptionTable Row and Its Inputs
+#   Start, Finish, Is_Active              Solved Days After Time 0 and Selection
+#   Completion, Early, Tardy              Solved Completion Day, Earliness and Tardiness of the
+#                                         Option's Scenario / Project
+# Columns Are Plain Strings, Integers, Floats and Booleans, so the Table Goes to Parquet or
+# Arrow as Is (DataFrame.to_parquet With pyarrow Installed). Assignment, Timetable, Completion
+# Report and Utilization Are Derived From the Table Without Further Solver Queries.
+
+LABELS = ["Scenario", "Project", "Task", "Resource"]
+CHAIN_VALUES = ["Completion", "Early", "Tardy"]
+
+def read_values(solution, indices, absent: int=1) -> np.ndarray:
+    "Values of the Variables With Proto indices; -1 (No Variable, e.g. Always Active) Reads as absent"
+    indices = np.asarray(indices, dtype=np.int64)
+    return np.where(indices >= 0, np.asarray(solution, dtype=np.int64)[indices], absent)
+
+def results_table(options, solution, rows, start, finish, active, completion, early, tardy) -> pd.DataFrame:
+    """
+    Results Table of the OptionTable rows, Given per Row the Proto Indices of Its Start and
+    Finish Variables, Selection Literal (-1: Always Active) and Its Chain's Completion,
+    Earliness and Tardiness Variables
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    table = options.label_frame().iloc[rows].reset_index(drop=True)
+    table["Option"] = rows
+    table["Duration"] = options.duration[rows]
+    table["Units"] = options.units[rows]
+    table["Cost"] = options.cost[rows]
+    table["Start"] = read_values(solution, start)
+    table["Finish"] = read_values(solution, finish)
+    table["Is_Active"] = read_values(solution, active).astype(bool)
+    for column, indices in zip(CHAIN_VALUES, (completion, early, tardy)):
+        table[column] = read_values(solution, indices)
+    return table
+
+def assignment_table(results: pd.DataFrame, datetime_0, scenario: bool=True) -> pd.DataFrame:
+    "Task Options With Start and Finish Dates, as Persisted for Warm Starts and Drawn in Timetables"
+    columns = LABELS if scenario else LABELS[1:]
+    df = results[columns + ["Is_Active"]].copy()
+    t0 = pd.Timestamp(datetime_0)
+    df.insert(len(columns), "Start", t0 + pd.to_timedelta(results["Start"].to_numpy(), unit="D"))
+    df.insert(len(columns) + 1, "Finish", t0 + pd.to_timedelta(results["Finish"].to_numpy(), unit="D"))
+    return df
+
+def completion_table(results: pd.DataFrame) -> pd.DataFrame:
+    "Completion, Earliness and Tardiness per Scenario and Project, in Order of First Appearance"
+    return results.drop_duplicates(["Scenario", "Project"])[["Scenario", "Project"] + CHAIN_VALUES].reset_index(drop=True)
@@ -0,0 +1,177 @@
+from one_period_v2 import Model
+from collections import namedtuple
+import contextlib
+import io
+import time
+import pandas as pd
+import numpy as np
+
+# Rolling-Horizon Decomposition of one_period_v2.Model
+# Each Window Model Holds the Unfrozen Tasks Whose Earliest Start Falls Inside the Window.
+# Tasks Starting Before the Window's Commit Day (Window Minus Overlap) Are Frozen, Their
+# Resource Use Moves Into the Busy Calendar and the Window Advances to the Commit Day.
+# The Frozen Schedule is Stitched Into a Fixed Full Model for Reporting.
+
+FrozenTask = namedtuple('FrozenTask', 'resource start end units')
+WindowStat = namedtuple('WindowStat', 'start commit projects tasks frozen status objective wall_time')
+
+class WindowModel(Model):
+    "one_period_v2.Model Over a Subset of Tasks, With Project Release Times"
+
+    # Release Times Tell Otherwise Identical Projects Apart: Symmetry Breaking Stays Off
+    def keep_symmetry_off(self, value):
+        if value:
+            raise ValueError("Window Models Tell Projects Apart by Release Times: Set break_symmetry to False")
+
+    break_symmetry = property(lambda self: False, keep_symmetry_off)
+
+    def __init__(self, name: str, release: dict) -> None:
+        super().__init__(name)
+        self.release = release
+
+    def set_precedence_constraints(self, projects: list=None):
+        super().set_precedence_constraints(projects)
+        # First Unfrozen Task Starts After the Project's Last Frozen Task
+        for project in self.projects if projects is None else projects:
+            if self.release.get(project, 0) > 0:
+                self.model.Add(self.task_times[project][0].start >= self.release[project])
+
+
+class RollingHorizon(object):
+
+    def __init__(self, name: str, window: int=30, overlap: int=10) -> None:
+        if not 0 <= overlap < window:
+            raise ValueError("Need 0 <= overlap < window, got window={} overlap={}".format(window, overlap))
+        self.name = name
+        self.window = window
+        self.overlap = overlap
+
+    def get_inputs(self, model_input_file: str=None):
+        # Full Model Holds the Inputs and Receives the Stitched Schedule
+        self.full = Model(self.name)
+        self.full.get_inputs(model_input_file)
+        # The Stitched Schedule Need Not Follow a Symmetry Breaking Order
+        self.full.break_symmetry = False
+        reqs = self.full.project_reqs
+        self.min_duration = reqs["Duration"].groupby(["Project","Task"], sort=False).min()
+        self.chains = {
+            project: tasks.index.get_level_values("Task").to_list()
+            for project, tasks in self.min_duration.groupby(level="Project", sort=False)
+            }
+
+    def busy_calendar(self) -> pd.DataFrame:
+        "Prior Commitments Plus Resource Use of Frozen Tasks"
+        resource_busy = self.full.resource_busy
+        days = max([len(resource_busy)] + [ftask.end for ftask in self.frozen.values()])
+        busy = np.zeros((days, len(self.full.resources)), dtype=int)
+        busy[:len(resource_busy)] = resource_busy[self.full.resources].to_numpy()
+        column = {resource: r for r, resource in enumerate(self.full.resources)}
+        for ftask in self.frozen.values():
+            busy[ftask.start:ftask.end, column[ftask.resource]] += ftask.units
+        return pd.DataFrame(busy, columns=self.full.resources)
+
+    def window_tasks(self, start: int) -> tuple:
+        """
+        Unfrozen Tasks Whose Earliest Start (Release Plus Minimal Durations Along the Chain)
+        Falls Before the End of the Window; Return (Tasks, Release per Project, Tail per Project)
+        With Tail the Minimal Duration of the Deferred Rest of the Chain
+        """
+        tasks, release, tail = [], {}, {}
+        for project, chain in self.chains.items():
+            rest = [task for task in chain if (project, task) not in self.frozen]
+            if not rest:
+                continue
+            ready = max([0] + [self.frozen[project, task].end for task in chain if (project, task) in self.frozen])
+            earliest = ready
+            n_tasks = 0
+            for task in rest:
+                if earliest >= start + self.window:
+                    break
+                earliest += self.min_duration[project, task]
+                n_tasks += 1
+            if n_tasks == 0:
+                continue
+            tasks += [(project, task) for task in rest[:n_tasks]]
+            release[project] = ready
+            tail[project] = int(sum(self.min_duration[project, task] for task in rest[n_tasks:]))
+        return tasks, release, tail
+
+    def solve_window(self, start: int, max_time: int, profile: str=None) -> WindowStat:
+        tasks, release, tail = self.window_tasks(start)
+        commit = start + self.window - self.overlap
+        last_window = len(tasks) + len(self.frozen) == len(self.min_duration)
+        if not tasks:
+            return WindowStat(start, commit, 0, 0, 0, "EMPTY", None, 0.0)
+        full = self.full
+        project_reqs = full.project_reqs[full.project_reqs.index.droplevel("Resource").isin(tasks)]
+        # Deferred Tasks Delay Completion by at Least Their Tail: Shift Deadlines Accordingly
+        project_attrs = full.project_attrs.loc[list(release)].copy()
+        project_attrs["Deadline"] -= pd.Series(tail)
+        t0 = time.perf_counter()
+        mod = WindowModel("{}_window_{}".format(self.name, start), release)
+        mod.solver_config = full.solver_config
+        mod.compress_busy = full.compress_busy
+        with contextlib.redirect_stdout(io.StringIO()):
+            mod.set_inputs(project_attrs, project_reqs, full.resource_attrs, self.busy_calendar(), full.datetime_0.strftime("%Y-%m-%d"))
+            mod.build_model()
+            mod.solve(max_time=max_time, profile=profile)
+        status = mod.solver.StatusName()
+        if status not in ("OPTIMAL", "FEASIBLE"):
+            raise RuntimeError("Window Starting Day {}: No Solution ({})".format(start, status))
+        results = mod.extract_results()
+        frozen = results.loc[results["Is_Active"] & ((results["Start"] < commit) | last_window)]
+        columns = [frozen[column].tolist() for column in ["Project", "Task", "Resource", "Start", "Finish", "Units"]]
+        for project, task, *values in zip(*columns):
+            self.frozen[project, task] = FrozenTask(*values)
+        n_frozen = len(frozen)
+        return WindowStat(
+            start, commit, len(release), len(tasks), n_frozen, status,
+            mod.solver.ObjectiveValue(), round(time.perf_counter() - t0, 3)
+            )
+
+    def fix_schedule(self):
+        "Fix Start Times and Resource Choices of the Full Model to the Frozen Schedule"
+        full = self.full
+        full.model.ClearHints()
+        for project, chain in self.chains.items():
+            for task, win in zip(chain, full.task_times[project]):
+                full.model.Add(win.start == self.frozen[project, task].start)
+                full.model.AddHint(win.start, self.frozen[project, task].start)
+            for tstruct in full.assign[project]:
+                if tstruct.is_active is not None:
+                    chosen = tstruct.resource == self.frozen[project, tstruct.name].resource
+                    full.model.Add(tstruct.is_active == chosen)
+                    full.model.AddHint(tstruct.is_active, int(chosen))
+
+    def solve(self, max_time: int=10, profile: str=None):
+        "Solve Window by Window (max_time Seconds Each), Then Stitch Into the Full Model"
+        self.frozen = {}
+        self.window_stats = []
+        start = 0
+        while len(self.frozen) < len(self.min_duration):
+            self.window_stats.append(self.solve_window(start, max_time, profile))
+            print("Window Day {start}-{commit}: {tasks} Tasks, {frozen} Frozen, {status}".format(**self.window_stats[-1]._asdict()))
+            start += self.window - self.overlap
+        self.full.build_model()
+        self.fix_schedule()
+        self.full.solve(max_time=max_time, profile=profile)
+
+    def window_report(self):
+        out = "\n"*3
+        out += "### Rolling Horizon Windows (Window {} Days, Overlap {} Days)\n\n".format(self.window, self.overlap)
+        out += pd.DataFrame(self.window_stats).to_markdown(index=False)
+        return out
+
+    def report_results(self):
+        self.full.report_results()
+        repfile = open(self.full.report_file, "a")
+        print(self.window_report(), file=repfile)
+        repfile.close()
+
+
+if __name__ == "__main__":
+    mod = RollingHorizon('rolling_horizon_example', window=20, overlap=5)
+    mod.get_inputs()
+    mod.solve()
+    mod.report_results()
+    mod.full.renderer.wait()
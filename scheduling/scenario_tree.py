@@ -0,0 +1,155 @@
+from collections import namedtuple
+from itertools import product
+import pandas as pd
+from monte_carlo import duration_scenarios
+from input_cache import file_digest
+
+Outcome = namedtuple('Outcome', 'name probability bypass durations', defaults=[None])
+Event = namedtuple('Event', 'name resolves_after outcomes')
+Node = namedtuple('Node', 'event resolves_after scenarios')
+
+class ScenarioTree(object):
+    """
+    Scenario tree built from a sequence of uncertain events.
+
+    Each event has a set of outcomes (probability plus the tasks bypassed when
+    it occurs, or the durations of all project_reqs rows it sets) and is
+    resolved when a given (project, task) ends. Scenarios are
+    all combinations of outcomes. Events are revealed when their resolving
+    task ends, whatever their list order: a node holds the scenarios that
+    differ only in the outcome of one event (one node per event and outcomes
+    of the other events), which stay alike until that event resolves. Linking
+    the first scenario of each node to the others is all the information
+    non-anticipativity constraints need. A resolving task must run in every
+    scenario: no outcome may bypass it.
+    """
+
+    def __init__(self, events: list) -> None:
+        if not events:
+            raise ValueError("Scenario Tree Needs at Least One Uncertain Event")
+        for event in events:
+            for other in events:
+                for outcome in other.outcomes:
+                    if tuple(event.resolves_after) in [tuple(tp) for tp in outcome.bypass]:
+                        raise ValueError("Event {} Resolves After {}/{}, Which Outcome {} of Event {} Bypasses".format(
+                            event.name, *event.resolves_after, outcome.name, other.name))
+        self.events = events
+        self.prob = {}
+        self.bypass = {}
+        self.durations = {}
+        paths = list(product(*[event.outcomes for event in events]))
+        for path in paths:
+            scenario = self.scenario_name(path)
+            prob = 1.0
+            for outcome in path:
+                prob *= outcome.probability
+            self.prob[scenario] = prob
+            self.bypass[scenario] = [tp for outcome in path for tp in outcome.bypass]
+            self.durations[scenario] = next((o.durations for o in reversed(path) if o.durations is not None), None)
+        # Nodes: Scenarios Differing Only in the Outcome of One Event
+        self.nodes = []
+        for e, event in enumerate(events):
+            groups = {}
+            for path in paths:
+                context = tuple(outcome.name for i, outcome in enumerate(path) if i != e)
+                groups.setdefault(context, []).append(self.scenario_name(path))
+            for members in groups.values():
+                self.nodes.append(Node(event.name, event.resolves_after, members))
+
+    @staticmethod
+    def scenario_name(path) -> str:
+        return "-".join(outcome.name for outcome in path)
+
+    @property
+    def scenarios(self) -> list:
+        return list(self.prob)
+
+    def event_projects(self) -> list:
+        "Projects Named by the Events (Resolving or Bypassed Tasks), Which Tell Scenarios Apart"
+        named = [tp for event in self.events for tp in [event.resolves_after] + [
+            tp for outcome in event.outcomes for tp in outcome.bypass
+            ]]
+        return list(dict.fromkeys(project for project, _ in named))
+
+    def scenario_reqs(self, project_reqs: pd.DataFrame) -> pd.DataFrame:
+        "Project Requirements per Scenario, Sampled Durations Set (project_reqs Sorted) and Bypassed Tasks Removed"
+        if any(d is not None for d in self.durations.values()) and not project_reqs.index.is_monotonic_increasing:
+            raise ValueError("Sampled Durations Follow the Sorted Project Requirements; Sort project_reqs First")
+        out = {}
+        for s in self.prob:
+            reqs = project_reqs if self.durations[s] is None else project_reqs.assign(Duration=list(self.durations[s]))
+            out[s] = reqs.drop(self.bypass[s]).copy()
+        return pd.concat(out, names=['Scenario'])
+
+    @classmethod
+    def from_model_input(cls, model_input: dict, project_reqs: pd.DataFrame=None, cache=None, key: tuple=None):
+        """
+        Read scenario_tree (Inline List or CSV File) or Legacy Two-Scenario stoch_task Section,
+        Followed by Sampled Duration Scenarios of project_reqs if duration_uncertainty Is Given
+        (Held in cache, an InputCache, Under key of project_reqs if Given)
+        """
+        events = []
+        if "scenario_tree" in model_input:
+            tree = model_input["scenario_tree"]
+            if isinstance(tree, str):
+                events = cls.from_csv(tree).events
+            else:
+                for event in tree:
+                    resolves_after = (event['resolves_after']['project'], event['resolves_after']['task'])
+                    outcomes = [
+                        Outcome(o['name'], o['probability'], [tuple(tp) for tp in o.get('bypass', [])])
+                        for o in event['outcomes']
+                        ]
+                    events.append(Event(event['event'], resolves_after, outcomes))
+        elif "stoch_task" in model_input:
+            stoch_task = model_input["stoch_task"]
+            resolves_after = stoch_task['uncertainty_resolves_after']
+            events.append(Event(
+                "stoch_task",
+                (resolves_after['project'], resolves_after['task']),
+                [
+                    Outcome("BAU", 1 - stoch_task['bypass_probability'], []),
+                    Outcome("BYPASS", stoch_task['bypass_probability'], [tuple(tp) for tp in stoch_task['bypass']])
+                ]
+                ))
+        if "duration_uncertainty" in model_input:
+            events.append(cls.duration_event(model_input["duration_uncertainty"], project_reqs, cache, key))
+        return cls(events)
+
+    @staticmethod
+    def duration_event(config: dict, project_reqs: pd.DataFrame, cache=None, key: tuple=None) -> Event:
+        """
+        Event of Monte Carlo Duration Scenarios (See monte_carlo), Known Once config resolves_after
+        Ends; Sampled and Reduced Once per project_reqs key and Configuration if a cache Is Given
+        """
+        build = lambda: duration_scenarios(config, project_reqs)
+        if cache is None:
+            durations, probability = build()
+        else:
+            parameters = file_digest(config["parameters"]) if config.get("parameters") else None
+            durations, probability = cache.get(("duration_scenarios", key, repr(sorted(config.items())), parameters), build)
+        resolves_after = (config["resolves_after"]["project"], config["resolves_after"]["task"])
+        width = len(str(len(durations)))
+        outcomes = [
+            Outcome("MC{:0{}}".format(i + 1, width), p, [], tuple(d))
+            for i, (d, p) in enumerate(zip(durations.tolist(), probability.tolist()))
+            ]
+        return Event("durations", resolves_after, outcomes)
+
+    @classmethod
+    def from_csv(cls, filename: str):
+        """
+        Read Events From CSV With Columns:
+        Event, Resolves Project, Resolves Task, Outcome, Probability, Bypass Project, Bypass Task
+        (One Row per Bypassed Task; Blank Bypass Columns for Outcomes Without Bypass)
+        """
+        df = pd.read_csv(filename)
+        events = []
+        for event, edata in df.groupby("Event", sort=False):
+            resolves_after = tuple(edata[["Resolves Project","Resolves Task"]].iloc[0])
+            outcomes = []
+            for outcome, odata in edata.groupby("Outcome", sort=False):
+                bypass = [tuple(tp) for tp in odata[["Bypass Project","Bypass Task"]].dropna().itertuples(index=False)]
+                outcomes.append(Outcome(outcome, odata["Probability"].iloc[0], bypass))
+            events.append(Event(event, resolves_after, outcomes))
+        return cls(events)
@@ -0,0 +1,171 @@
+import argparse
+import contextlib
+import io
+import time
+import yaml
+import numpy as np
+import pandas as pd
+from monte_carlo import duration_parameters, sample_durations
+
+# Out-of-Sample Evaluation of a Solved Schedule by Vectorized List Scheduling
+# The Solved Plan of a Scenario (Chosen Resource of Each Task, Tasks Ranked by Solved Start) Is
+# Replayed Under Sampled Durations: Each Task in Rank Order Starts at the First Day, No Earlier
+# Than Its Solved Start (a Release Time) and the End of Its Predecessor, When Its Resource Has the
+# Units Free for Its Whole Duration, Given Prior Commitments (resource_busy) and the Tasks Placed
+# Before It (Serial Schedule Generation). Tasks Are Never Pulled Ahead of the Plan, so Draws
+# Equal to a Scenario's Durations Replay That Scenario's Plan Exactly.
+# The Task Loop Is Sequential; All Samples Advance Together as NumPy Arrays (Samples x Days),
+# Grouped by Duration so Window Checks Are Slices of a Prefix Sum. Samples Are Split Among
+# Scenarios by Probability. Per Sample: Makespan, Total Tardiness and Cost (Resource Cost +
+# Delay Penalty - Early Bonus, as in the Objective).
+# Usage (From Repository Root):
+#   python scheduling/simulation.py scheduling/stoch_duration_example_V1.yml --samples 100000
+
+def scenario_plan(results: pd.DataFrame, scenario: str) -> pd.DataFrame:
+    "Active Options of a Scenario in Rank Order (Solved Start, Then Chain Order) With the Rank of Each Task's Predecessor"
+    plan = results.loc[results["Is_Active"] & (results["Scenario"] == scenario)].reset_index(drop=True)
+    n = len(plan)
+    # Rows Are in Chain Order: the Previous Row of the Same Project Is the Predecessor
+    previous = np.where(plan.groupby("Project", sort=False).cumcount().to_numpy() > 0, np.arange(n) - 1, -1)
+    order = np.lexsort((np.arange(n), plan["Start"].to_numpy()))
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+    plan["Predecessor"] = np.where(previous >= 0, rank[previous], -1)
+    return plan.iloc[order].reset_index(drop=True)
+
+def list_schedule(
+        durations: np.ndarray,
+        resource: np.ndarray,
+        units: np.ndarray,
+        predecessor: np.ndarray,
+        capacity: np.ndarray,
+        busy: np.ndarray,
+        days: int=None,
+        release: np.ndarray=None) -> np.ndarray:
+    """
+    Start Days (Samples x Tasks) of Tasks Placed in Column Order: durations (Samples x Tasks),
+    resource (Index Into capacity and the Rows of busy), units, predecessor (Column, -1 if None)
+    and release (Earliest Start, Default 0) per Task; busy Holds the Prior Load per Resource and
+    Day. The Day Axis Starts at days (Default: Prior Commitments Plus All Durations Plus the Latest
+    Release) and Doubles Whenever a Task Finds No Window
+    """
+    n, n_tasks = durations.shape
+    if release is None:
+        release = np.zeros(n_tasks, dtype=np.int64)
+    if days is None:
+        days = busy.shape[1] + int(durations.sum(axis=1).max()) + int(release.max(initial=0)) + 1
+    days = max(days, busy.shape[1])
+    load = np.zeros((len(capacity), n, days), dtype=np.int32)
+    load[:, :, :busy.shape[1]] = busy[:, None, :]
+    start, finish = np.zeros((n, n_tasks), dtype=np.int64), np.zeros((n, n_tasks), dtype=np.int64)
+    blocked = np.zeros((n, days + 1), dtype=np.int32)
+    t = np.arange(days + 1, dtype=np.int32)
+    for j in range(n_tasks):
+        r, u, d = resource[j], units[j], durations[:, j]
+        earliest = np.full(n, release[j], dtype=np.int64)
+        if predecessor[j] >= 0:
+            np.maximum(earliest, finish[:, predecessor[j]], out=earliest)
+        # Blocked Days Prefix Sum: Window [s, s+d) Is Free iff blocked[s+d] == blocked[s]
+        np.cumsum(load[r] > capacity[r] - u, axis=1, dtype=np.int32, out=blocked[:, 1:])
+        for length in np.unique(d).tolist():
+            rows = np.flatnonzero(d == length)
+            if length > days:
+                return list_schedule(durations, resource, units, predecessor, capacity, busy, 2 * days, release)
+            window = blocked[rows, length:] == blocked[rows, :days + 1 - length]
+            window &= t[None, :days + 1 - length] >= earliest[rows, None]
+            first = window.argmax(axis=1)
+            if not window[np.arange(len(rows)), first].all():
+                return list_schedule(durations, resource, units, predecessor, capacity, busy, 2 * days, release)
+            start[rows, j] = first
+        finish[:, j] = start[:, j] + d
+        running = (t[None, :days] >= start[:, j, None]) & (t[None, :days] < finish[:, j, None])
+        np.add(load[r], u, out=load[r], where=running)
+    return start
+
+def simulate_plan(plan: pd.DataFrame, durations: np.ndarray, project_attrs: pd.DataFrame, capacity: np.ndarray, busy: np.ndarray, resources: pd.Index) -> pd.DataFrame:
+    "Makespan, Tardiness and Cost per Sample of a Plan Under durations (Samples x Plan Rows)"
+    resource = resources.get_indexer(plan["Resource"])
+    units = plan["Units"].to_numpy(dtype=np.int64)
+    # Day Axis Guess: Solved Makespan Stretched by the Largest Duration Ratio
+    stretch = (durations / plan["Duration"].to_numpy()).max()
+    days = int(plan["Finish"].max() * stretch) + 1
+    release = plan["Start"].to_numpy(dtype=np.int64)
+    start = list_schedule(durations, resource, units, plan["Predecessor"].to_numpy(), capacity, busy, days, release)
+    finish = start + durations
+    cost = (durations * (plan["Cost"] / plan["Duration"]).to_numpy()).sum(axis=1)
+    tardiness = np.zeros(len(durations))
+    for project, columns in plan.groupby("Project", sort=False).indices.items():
+        attrs = project_attrs.loc[project]
+        late = finish[:, columns].max(axis=1) - attrs["Deadline"]
+        tardy, early = np.maximum(late, 0), np.maximum(-late, 0)
+        tardiness += tardy
+        cost += attrs["Delay Penalty"] * tardy - attrs["Early Bonus"] * early
+    return pd.DataFrame({"Makespan": finish.max(axis=1), "Tardiness": tardiness, "Cost": cost})
+
+def simulate_model(
+        mod,
+        samples: int=10000,
+        config: dict=None,
+        base_reqs: pd.DataFrame=None,
+        seed: int=0,
+        chunk: int=25000) -> pd.DataFrame:
+    """
+    Makespan, Tardiness and Cost of a Solved Model's Plans Under samples Duration Draws (config
+    as duration_uncertainty, Defaults of monte_carlo); Each Sample Follows the Plan of a Scenario
+    Drawn by Probability. Draws Center on base_reqs Durations (Default: Each Plan's Own)
+    """
+    results = mod.results if getattr(mod, "results", None) is not None else mod.extract_results()
+    prob = getattr(mod, "prob", {"": 1.0})
+    rng = np.random.default_rng(seed)
+    counts = rng.multinomial(samples, np.array(list(prob.values())) / sum(prob.values()))
+    resources = mod.resource_attrs.index
+    capacity = mod.resource_attrs["Capacity"].to_numpy(dtype=np.int64)
+    busy = mod.resource_busy[resources].to_numpy(dtype=np.int64).T
+    frames = []
+    for i, (scenario, count) in enumerate(zip(prob, counts.tolist())):
+        if not count:
+            continue
+        plan = scenario_plan(results, scenario)
+        reqs = plan.set_index(["Project", "Task", "Resource"])[["Duration"]]
+        if base_reqs is not None:
+            reqs["Duration"] = base_reqs["Duration"].reindex(reqs.index).fillna(reqs["Duration"]).to_numpy()
+        params = duration_parameters(reqs, config or {})
+        for offset in range(0, count, chunk):
+            durations = sample_durations(reqs, params, min(chunk, count - offset), seed=[seed, i, offset])
+            df = simulate_plan(plan, durations, mod.project_attrs, capacity, busy, resources)
+            frames.append(df.assign(Scenario=scenario))
+    return pd.concat(frames, ignore_index=True)[["Scenario", "Makespan", "Tardiness", "Cost"]]
+
+def summary(simulated: pd.DataFrame) -> pd.DataFrame:
+    "Mean, Spread and Tail Percentiles of Makespan, Tardiness and Cost"
+    return simulated[["Makespan", "Tardiness", "Cost"]].describe(percentiles=[0.5, 0.9, 0.95, 0.99]).T
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a solved schedule under sampled task durations")
+    parser.add_argument("config", help="model configuration (YAML)")
+    parser.add_argument("--model", default="stoch_duration_v1", choices=["one_period_v2", "stoch_duration_v0", "stoch_duration_v1"])
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--max-time", type=float, default=60, help="solver time limit (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import importlib
+    import tempfile
+    from batch import MODELS
+    from synthetic import copy_config
+    module, class_name = MODELS[args.model]
+    mod = getattr(importlib.import_module(module), class_name)("simulation")
+    with open(args.config, 'r') as f:
+        model_input = yaml.safe_load(f)
+    # Model Input Report Goes to a Scratch Directory
+    with tempfile.TemporaryDirectory() as tmpdir, contextlib.redirect_stdout(io.StringIO()):
+        mod.get_inputs(copy_config(args.config, tmpdir, "simulation", render="off"))
+        mod.build_model()
+        mod.solve(max_time=args.max_time)
+    print("Solved: {} {:,.1f}".format(mod.solver.StatusName(), mod.solver.ObjectiveValue()))
+    base_reqs = pd.read_csv(model_input["project_reqs"], index_col=[0,1,2])
+    t0 = time.perf_counter()
+    simulated = simulate_model(mod, args.samples, model_input.get("duration_uncertainty"), base_reqs, args.seed)
+    print("Simulated {:,} Samples in {:.2f}s".format(len(simulated), time.perf_counter() - t0))
+    print(summary(simulated).to_markdown())
@@ -0,0 +1,51 @@
+import os
+
+# Named CP-SAT Search Presets
+# - fast-feasible: all cores, light LP relaxation, stop within 5% of the bound
+# - prove-optimal: all cores, full LP relaxation, no gap tolerance
+# - deterministic-replay: fixed seed and worker count, interleaved search and a
+#   deterministic time limit, so that reruns on any machine return the same schedule
+# Any CP-SAT parameter may be added; the ones below are the usual knobs.
+PROFILES = {
+    "default": {},
+    "fast-feasible": {
+        "num_workers": 0,
+        "linearization_level": 0,
+        "relative_gap_limit": 0.05,
+        },
+    "prove-optimal": {
+        "num_workers": 0,
+        "linearization_level": 2,
+        "relative_gap_limit": 0.0,
+        "absolute_gap_limit": 0.0,
+        },
+    "deterministic-replay": {
+        "num_workers": 8,
+        "random_seed": 0,
+        "interleave_search": True,
+        "deterministic_time": True,
+        },
+    }
+
+def profile_parameters(profile: str=None, **overrides) -> dict:
+    "Preset Parameters Updated With Overrides (num_workers 0 Means All Cores)"
+    if profile is not None and profile not in PROFILES:
+        raise ValueError("Unknown Solver Profile {!r}; Choose From {}".format(profile, list(PROFILES)))
+    params = dict(PROFILES.get(profile, {}))
+    params.update(overrides)
+    if params.get("num_workers") == 0:
+        params["num_workers"] = os.cpu_count() or 1
+    return params
+
+def set_solver_parameters(parameters, max_time: float, profile: str=None, **overrides) -> None:
+    """
+    Apply Time Limit and Solver Profile to CpSolver.parameters
+    (Deterministic Profiles Turn max_time Into a Deterministic Time Limit)
+    """
+    params = profile_parameters(profile, **overrides)
+    if params.pop("deterministic_time", False):
+        parameters.max_deterministic_time = max_time
+    else:
+        parameters.max_time_in_seconds = max_time
+    for key, value in params.items():
+        setattr(parameters, key, value)
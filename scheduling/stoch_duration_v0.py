@@ -1,28 +1,49 @@
 from ortools.sat.python import cp_model
+from option_table import OptionTable
+from busy_calendar import busy_intervals
+from task_windows import task_windows, completion_bounds
+from solver_profiles import set_solver_parameters
+from utilization import results_utilization
+from results_table import results_table, read_values, assignment_table, completion_table, CHAIN_VALUES
+from rendering import Renderer, save_timetable, save_utilization, utilization_figure
+from instrumentation import Instrumentation
+from results_store import ResultsStore
 import yaml
 from datetime import datetime, timedelta
 from collections import namedtuple
 from itertools import product
-import plotly.express as px
-import plotly.io as pio
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
 CompletionWin = namedtuple('CompletionWin', 'early tardy')
 TaskWin = namedtuple('TaskWin', 'start end')
-Task = namedtuple('Task','name resource units interval is_active')
+Task = namedtuple('Task','name resource units interval is_active option')
 
 class Model2P(object):
 
+    compress_busy = True
+    render = "sync"
+    results_store = None
+    instrument = False
+    profile_phase = None
+
     def __init__(self, name: str) -> None:
         self.name = name
         self.model = cp_model.CpModel()
+        # Phase Timing, Memory and Solver Statistics (Written Next to the Report)
+        self.instrumentation = Instrumentation(self, self.profile_phase) if self.instrument else None
 
-    def get_inputs(self):
+    def get_inputs(self, model_input_file: str=None):
         # Import Model Inputs
-        with open("scheduling/{}.yml".format(self.name), 'r') as f:
+        if model_input_file is None:
+            model_input_file = "scheduling/{}.yml".format(self.name)
+        with open(model_input_file, 'r') as f:
             model_input = yaml.safe_load(f)
+        self.solver_config = model_input.get("solver", {})
+        self.render = model_input.get("render", self.render)
+        self.results_store = model_input.get("results_store", self.results_store)
+        self.model_input_file = model_input_file
+        self.renderer = Renderer(self.render)
 
         self.project_attrs = pd.read_csv(model_input['project_attrs'], index_col=[0])
         self.projects = self.project_attrs.index.to_list()
@@ -37,8 +58,11 @@ class Model2P(object):
         self.resource_attrs = pd.read_csv(model_input['resource_attrs'], index_col=[0])
         self.resource_busy = pd.read_csv(model_input['resource_busy'], index_col=[0])
         self.resources = self.resource_attrs.index.to_list()
+        self.options = OptionTable(self.project_reqs, self.resource_attrs)
         # Upper Limit for Project Completion
         self.horizon = self.project_reqs.groupby('Scenario')["Duration"].sum().max() + len(self.resource_busy)
+        # Earliest Start / Latest Finish per Scenario and Task
+        self.windows = task_windows(self.options, self.resource_busy, self.resource_attrs["Capacity"], self.horizon)
         self.report_path = model_input["report_path"]
 
         self.report_file = self.report_path.format(self.name+"_report.md")
@@ -70,9 +94,14 @@ class Model2P(object):
         # Project Earliness and Tardiness
         self.project_completion = {}
         for scenario, project in product(self.prob.keys(), self.projects):
+            pdata = self.project_attrs.loc[project]
+            early, tardy = completion_bounds(
+                self.windows, self.options.last_task[scenario, project], 
+                pdata["Deadline"], pdata["Delay Penalty"], pdata["Early Bonus"], self.horizon
+                )
             self.project_completion[(scenario,project)] = CompletionWin(
-                self.model.NewIntVar(0, self.horizon, "{}_{}_earliness".format(scenario, project)),
-                self.model.NewIntVar(0, self.horizon, "{}_{}_tardiness".format(scenario, project))
+                self.model.NewIntVar(*early, "{}_{}_earliness".format(scenario, project)),
+                self.model.NewIntVar(*tardy, "{}_{}_tardiness".format(scenario, project))
                 )
             
         # Collect New Variables for Task: Start, End, Interval, Select if Optional
@@ -85,18 +114,20 @@ class Model2P(object):
 
         self.urt = self.model.NewIntVar(0, self.horizon+1, "uncertainty_resolution_time")
 
-        for (scenario, project, task), pdata in self.project_reqs.groupby(["Scenario","Project","Task"], sort=False):
+        start_lb, start_ub = self.windows.start_lb.tolist(), self.windows.start_ub.tolist()
+        end_lb, end_ub = self.windows.end_lb.tolist(), self.windows.end_ub.tolist()
+        for group in self.options.task_groups():
+            scenario, project, task, k = group.scenario, group.project, group.task, group.index
             task_label = "{}_{}_{}_".format(scenario,project,task)
-            dv_start = self.model.NewIntVar(0, self.horizon, task_label + 'start')
-            dv_end = self.model.NewIntVar(0, self.horizon, task_label + 'end')
+            dv_start = self.model.NewIntVar(start_lb[k], start_ub[k], task_label + 'start')
+            dv_end = self.model.NewIntVar(end_lb[k], end_ub[k], task_label + 'end')
             if project == self.uncertainty_resolution['project'] and task == self.uncertainty_resolution['task']:
                 self.info_revelation.append(dv_end)
             self.task_times.setdefault((scenario,project), []).append(TaskWin(dv_start, dv_end))
-            has_multiple_options = (len(pdata) > 1)
-            for resource in pdata.index.get_level_values("Resource"):
+            has_multiple_options = (len(group.options) > 1)
+            for option in group.options:
+                resource, duration, units = option.resource, option.duration, option.units
                 resource_label = "{}_{}_{}_{}_".format(scenario, project, task, resource)
-                duration = self.project_reqs.loc[(scenario, project,task,resource),"Duration"]
-                units = self.project_reqs.loc[(scenario, project,task,resource),"Units"]
                 if has_multiple_options:
                     dv_select = self.model.NewBoolVar(resource_label + "indicator")
                     dv_interval = self.model.NewOptionalIntervalVar(
@@ -106,16 +137,17 @@ class Model2P(object):
                 else:
                     dv_select = None
                     dv_interval = self.model.NewIntervalVar(dv_start, duration, dv_end, resource_label + "_interval")
-                self.assign.setdefault((scenario,project), []).append(Task(task, resource, units, dv_interval, dv_select))
+                self.assign.setdefault((scenario,project), []).append(Task(task, resource, units, dv_interval, dv_select, option.index))
                 self.resource_needs.setdefault((scenario, resource), []).append((dv_interval, units))
 
         # Account for Additional Needs Due to Initial Commitment
-        for scenario, resource in product(self.prob.keys(), self.resources):
-            for t, demand in enumerate(self.resource_busy[resource].values):
-                task = "t{:2d}".format(t)
-                ivname = "occupied_{}_{}_{}_interval".format(t,scenario,resource)
-                if demand > 0:
-                    self.resource_needs.setdefault((scenario, resource),[]).append((self.model.NewIntervalVar(t, 1, t+1, ivname), demand))
+        # Fixed Intervals Are Shared by All Scenarios
+        for resource in self.resources:
+            for busy in busy_intervals(self.resource_busy[resource].values, self.compress_busy):
+                ivname = "occupied_{}_{}_{}_interval".format(busy.start,busy.length,resource)
+                dv_busy = self.model.NewIntervalVar(busy.start, busy.length, busy.start+busy.length, ivname)
+                for scenario in self.prob:
+                    self.resource_needs.setdefault((scenario, resource),[]).append((dv_busy, busy.demand))
 
     def get_project_endtime(self, scenario, project):
         return self.task_times[scenario,project][-1].end
@@ -164,9 +196,7 @@ class Model2P(object):
         resource_cost = []
         for scenario, project in product(self.prob.keys(), self.projects):
             for tstruct in self.assign[(scenario, project)]:
-                cpd = self.resource_attrs.loc[tstruct.resource, "Cost per Day"]
-                duration = tstruct.interval.SizeExpr()
-                cost_per_task_0 = cpd * tstruct.units * duration
+                cost_per_task_0 = self.options.cost[tstruct.option].item()
                 cost_per_task = cost_per_task_0 if tstruct.is_active is None else cost_per_task_0 * tstruct.is_active
                 resource_cost.append(self.prob[scenario] * cost_per_task)
                 
@@ -189,50 +219,48 @@ class Model2P(object):
         self.set_information_constraints()
         self.set_objective()
 
-    def solve(self, max_time: int=100):
+    def solve(self, max_time: int=100, profile: str=None):
         self.solver = cp_model.CpSolver()
-        # Set Processing Time Limit
-        self.solver.parameters.max_time_in_seconds = max_time
+        # Set Processing Time Limit and Search Profile (From YAML solver Section Unless Given)
+        solver_config = dict(self.solver_config)
+        if profile is not None:
+            solver_config["profile"] = profile
+        set_solver_parameters(self.solver.parameters, max_time, **solver_config)
+        if self.instrumentation is not None:
+            self.instrumentation.attach(self.solver)
+        self.results = None
         self.status = self.solver.Solve(self.model)
         print(self.solver.ResponseStats())
 
+    def extract_results(self) -> pd.DataFrame:
+        """
+        Read the Solution at Once Into the Columnar Results Table self.results (One Row per Task
+        Option) and the Uncertainty Resolution Day Into self.resolution
+        """
+        indices = []
+        for (scenario, project), tasks in self.assign.items():
+            first = self.options.chain(scenario, project).start
+            task_times, completion = self.task_times[scenario, project], self.project_completion[scenario, project]
+            chain = (task_times[-1].end.Index(), completion.early.Index(), completion.tardy.Index())
+            for tstruct in tasks:
+                task_win = task_times[self.options.option_task[tstruct.option] - first]
+                is_active = -1 if tstruct.is_active is None else tstruct.is_active.Index()
+                indices.append((tstruct.option, task_win.start.Index(), task_win.end.Index(), is_active) + chain)
+        indices = np.array(indices, dtype=np.int64).reshape(-1, 7)
+        solution = self.solver.ResponseProto().solution
+        self.results = results_table(self.options, solution, *indices.T)
+        self.resolution = read_values(solution, [self.urt.Index()]).item()
+        return self.results
+
     def collect_results(self):
         out = "\n"*3
         if self.status == cp_model.OPTIMAL or self.status == cp_model.FEASIBLE:
             out += '- Solution Status: {}\n'.format(self.solver.StatusName())
-            self.__tograph__ = []
-            for scenario, pname in self.assign:
-                for tstruct in self.assign[scenario, pname]:
-                    start = tstruct.interval.StartExpr()
-                    end = tstruct.interval.EndExpr()
-                    row = {'Scenario': scenario, 'Project': pname}
-                    row["Task"] = tstruct.name
-                    row["Resource"] = tstruct.resource
-                    row["Start"] = self.get_date(self.solver.Value(start))
-                    row["Finish"] = self.get_date(self.solver.Value(end))
-                    row["Is_Active"] = True if tstruct.is_active is None else bool(self.solver.Value(tstruct.is_active))
-                    self.__tograph__.append(row)
-
-            df = pd.DataFrame(self.__tograph__)
+            df = assignment_table(self.extract_results(), self.datetime_0)
             df["Project_Scenario"] = df.apply(lambda x: "{Project:}_{Scenario:}".format(**x), axis=1)
-            fig = px.timeline(
-                df.loc[df["Is_Active"],:], 
-                x_start="Start", 
-                x_end="Finish", 
-                y="Project_Scenario", 
-                color="Task",
-                pattern_shape="Resource",
-                pattern_shape_sequence=["x", "", "+"],
-                color_discrete_sequence=px.colors.qualitative.Light24
-            )
-            fig.update_yaxes(categoryorder="category descending")
-            urt = self.get_date(self.solver.Value(self.urt))
-            fig.add_vline(x=urt, line_dash="dot", line_color="white")
-            fig.add_annotation(
-                dict(x=urt,y=-1.0,text="Uncertainty Resolution",xanchor='center',font=dict(size=15))
-                )
+            urt = self.get_date(self.resolution)
             filename = self.report_path.format("{}_timetable.png".format(self.name))
-            pio.write_image(fig, filename, width=1080, height=720)
+            self.renderer.submit(save_timetable, df, filename, "Project_Scenario", [urt])
 
             out += '\t- Optimal Objective Value: {:,.3f}\n'.format(self.solver.ObjectiveValue())
             out += '\t- Optimal Objective Bound: {:,.3f}\n'.format(self.solver.BestObjectiveBound())
@@ -248,47 +276,29 @@ class Model2P(object):
         out += fmt.format("Scenario", "Project", "Completion", "Early", "Tardy")
         out += fmt.format(":-------", ":------", "---------:", "----:", "----:")
         self.makespan = {scenario: 0 for scenario in self.prob}
+        completion = completion_table(self.results).set_index(["Scenario", "Project"])
         for scenario, project in product(self.prob.keys(), self.projects):
-            proj_end = self.solver.Value(self.get_project_endtime(scenario, project))
-            earliness, tardiness = self.project_completion[scenario, project]
+            proj_end, earliness, tardiness = completion.loc[(scenario, project), CHAIN_VALUES].tolist()
             self.makespan[scenario] = max(self.makespan[scenario], proj_end)
-            out += fmt.format(scenario, project, proj_end, self.solver.Value(earliness), self.solver.Value(tardiness))
+            out += fmt.format(scenario, project, proj_end, earliness, tardiness)
 
         out += "\n\n### Time Uncertainty Is Resolved\n\n"
-        out +=  str(self.get_date(self.solver.Value(self.urt)))
-        out +=  " (Or {} Days After Time 0)\n".format(self.solver.Value(self.urt))
+        out +=  str(self.get_date(self.resolution))
+        out +=  " (Or {} Days After Time 0)\n".format(self.resolution)
         return out
     
-    def resource_report(self):
-        cols = [(scenario, resource, s) 
-                for scenario in self.prob 
-                for resource in self.resources 
-                for s in ['state0','state1']]
-        utilization = pd.DataFrame(0, index=np.arange(max(self.makespan.values())+1), columns=pd.MultiIndex.from_tuples(cols))
+    def utilization(self):
+        "Daily Utilization per Scenario and Resource Up to the Longest Makespan: state0 Prior Commitments, state1 Total Load"
+        busy = {(scenario, resource): self.resource_busy[resource].values for scenario, resource in product(self.prob.keys(), self.resources)}
+        days = max(self.makespan.values())+1
+        utilization = results_utilization(self.results, busy, days)
         utilization.columns.names = ['Scenario','Resource','State']
-        for scenario, resource in product(self.prob.keys(), self.resources):
-            for i, x in enumerate(self.resource_busy[resource].values):
-                utilization.loc[i,(scenario, resource,'state0')] += x
-            for iv, units in self.resource_needs[scenario, resource]:
-                start = self.solver.Value(iv.StartExpr())
-                end = self.solver.Value(iv.EndExpr())
-                for i in range(start,end):
-                    utilization.loc[i,(scenario, resource,'state1')] += units
-        color_dict = {'state0':'grey', 'state1':'green'}
-        utilization.index = [self.get_date(t).strftime("%b %d") for t in utilization.index]
-        fig, axs = plt.subplots(len(self.resources), len(self.prob), figsize=(16,12), sharex=True)
-        fig.autofmt_xdate(rotation=90)
-        urt = self.solver.Value(self.urt)
-        for i, rname in enumerate(self.resources):
-            for j, scenario in enumerate(self.prob.keys()):
-                utilization.loc[:,(scenario, rname,'state1')] -= utilization.loc[:,(scenario, rname,'state0')]
-                ttl = "{}_{}".format(scenario, rname)
-                utilization[scenario][rname].plot.bar(stacked=True, title=ttl, width=1, grid=True, color=color_dict, ax=axs[i,j])
-                yannot = utilization[scenario][rname].sum(1).max()
-                axs[i,j].axvline(urt, color='red', linestyle=':', lw=2)
-                axs[i,j].text(urt, yannot, "Uncertainty\nResolution", ha='center', va='top', 
-                              bbox=dict(facecolor='white',boxstyle='square',edgecolor='red',pad=0.2))
-        return fig
+        utilization.index = pd.Index([self.get_date(t) for t in utilization.index], name="Date")
+        return utilization
+
+    def resource_report(self, utilization=None):
+        markers = {scenario: [self.resolution] for scenario in self.prob}
+        return utilization_figure(self.utilization() if utilization is None else utilization, markers)
     
     def report_results(self):
         repfile = open(self.report_file, "a")
@@ -297,13 +307,24 @@ class Model2P(object):
         print(self.project_report() , file=repfile)
         print("\n\n## Optimal Timetable" , file=repfile)
         timetable_file = "{}_timetable.png".format(self.name)
-        print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
+        if self.renderer.enabled:
+            print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
         print("\n\n## Optimal Resource Utilization" , file=repfile)
         utilization_file = "{}_utilization.png".format(self.name)
-        fig = self.resource_report()
-        fig.savefig(self.report_path.format(utilization_file), dpi=72)
-        print("![Utilization]({})\n\n\n".format(utilization_file) , file=repfile)
+        utilization_csv = "{}_utilization.csv".format(self.name)
+        utilization = self.utilization()
+        utilization.to_csv(self.report_path.format(utilization_csv))
+        self.renderer.submit(save_utilization, utilization, self.report_path.format(utilization_file), {scenario: [self.resolution] for scenario in self.prob})
+        if self.renderer.enabled:
+            print("![Utilization]({})\n".format(utilization_file) , file=repfile)
+        print("[Daily Utilization (CSV)]({})\n\n\n".format(utilization_csv) , file=repfile)
+        if self.instrumentation is not None:
+            print("[Phase Timings (CSV)]({0}_phases.csv), [Phase and Solver Statistics (JSON)]({0}_phases.json)\n".format(self.name) , file=repfile)
         repfile.close()
+        # Append the Run to the Results Store (History Across Runs)
+        if self.results_store is not None:
+            with ResultsStore(self.results_store) as store:
+                self.run_id = store.record(self, utilization)
 
 
 if __name__ == "__main__":
@@ -312,4 +333,5 @@ if __name__ == "__main__":
     mod.build_model()
     mod.solve()
     mod.collect_results()
-    mod.report_results()
\ No newline at end of file
+    mod.report_results()
+    mod.renderer.wait()
@@ -1,46 +1,94 @@
 from ortools.sat.python import cp_model
+from option_table import OptionTable
+from variable_registry import VariableRegistry
+from busy_calendar import busy_intervals
+from capacity_calendar import read_calendar, calendar_days, apply_calendar
+from symmetry import project_templates, interchangeable_resources, first_choice, symmetry_report
+from task_windows import task_windows, completion_bounds
+from option_presolve import remove_dominated, REMOVED_COLUMNS
+from scenario_tree import ScenarioTree
+from input_cache import default_cache
+from warm_start import load_assignment, previous_choices, match_tasks
+from solver_profiles import set_solver_parameters
+from utilization import results_utilization
+from results_table import results_table, read_values, assignment_table, completion_table, CHAIN_VALUES
+from rendering import Renderer, save_timetable, save_utilization, utilization_figure
+from instrumentation import Instrumentation
+from results_store import ResultsStore
+from streaming import SolutionStream, stream_solutions
+from lexicographic import Term, solve_lexicographic, stage_report
 import yaml
 from datetime import datetime, timedelta
-from collections import namedtuple
 from itertools import product
-import plotly.express as px
-import plotly.io as pio
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
-CompletionWin = namedtuple('CompletionWin', 'early tardy')
-TaskOption = namedtuple('TaskOption','resource interval is_active')
-Task = namedtuple('Task', 'task start end options mult')
-
 class Model2P(object):
 
+    compress_busy = True
+    break_symmetry = True
+    presolve_options = True
+    lexicographic = None
+    render = "sync"
+    results_store = None
+    instrument = False
+    profile_phase = None
+    input_cache = default_cache
+
     def __init__(self, name: str) -> None:
         self.name = name
         self.model = cp_model.CpModel()
+        # Phase Timing, Memory and Solver Statistics (Written Next to the Report)
+        self.instrumentation = Instrumentation(self, self.profile_phase) if self.instrument else None
 
-    def get_inputs(self):
+    def get_inputs(self, model_input_file: str=None):
         "Ingest Input Data"
         # Read Model Configuration Parameters
-        with open("scheduling/{}.yml".format(self.name), 'r') as f:
+        if model_input_file is None:
+            model_input_file = "scheduling/{}.yml".format(self.name)
+        with open(model_input_file, 'r') as f:
             model_input = yaml.safe_load(f)
-        # Read Project and Resource Data
-        self.project_attrs = pd.read_csv(model_input['project_attrs'], index_col=[0])
+        self.solver_config = model_input.get("solver", {})
+        self.warm_start = model_input.get("warm_start")
+        self.render = model_input.get("render", self.render)
+        self.results_store = model_input.get("results_store", self.results_store)
+        self.model_input_file = model_input_file
+        self.break_symmetry = model_input.get("break_symmetry", self.break_symmetry)
+        self.presolve_options = model_input.get("presolve_options", self.presolve_options)
+        self.lexicographic = model_input.get("lexicographic", self.lexicographic)
+        self.renderer = Renderer(self.render)
+        # Read Project and Resource Data (Shared With Other Instances Through the Input Cache)
+        inputs = self.input_cache.bundle(model_input)
+        self.project_attrs = inputs.project_attrs
         self.projects = self.project_attrs.index.to_list()
-        bau = pd.read_csv(model_input['project_reqs'], index_col=[0,1,2]).sort_index()
-        bypass = [tuple(p) for p in model_input['stoch_task']['bypass']]
-        self.project_reqs = pd.concat({"BAU":bau, "BYPASS":bau.drop(bypass).copy()}, names=['Scenario'])
-        self.resource_attrs = pd.read_csv(model_input['resource_attrs'], index_col=[0])
-        self.resource_busy = pd.read_csv(model_input['resource_busy'], index_col=[0])
-        self.resources = self.resource_attrs.index.to_list()
         # Read Stochastic Scenario Data
-        self.prob = {
-            "BAU":(1 - model_input["stoch_task"]['bypass_probability']), 
-            "BYPASS": model_input["stoch_task"]['bypass_probability']
-            }
-        self.uncertainty_resolution = model_input["stoch_task"]['uncertainty_resolves_after']
+        self.scenario_tree = ScenarioTree.from_model_input(model_input, inputs.project_reqs, self.input_cache, inputs.key[1])
+        self.project_reqs = self.input_cache.get(
+            ("scenario_reqs", inputs.key[1], repr(self.scenario_tree.events)),
+            lambda: self.scenario_tree.scenario_reqs(inputs.project_reqs.sort_index())
+            )
+        self.prob = self.scenario_tree.prob
+        self.datetime_0 = datetime.strptime(model_input["date0_str"], "%Y-%m-%d").date()
+        self.resource_attrs = inputs.resource_attrs
+        self.resource_busy = inputs.resource_busy
+        self.resource_calendar = read_calendar(model_input["resource_calendar"]) if model_input.get("resource_calendar") else None
         # Upper Limit for Project Completion
-        self.horizon = self.project_reqs.groupby('Scenario')["Duration"].sum().max() + len(self.resource_busy)
+        self.busy_days = len(self.resource_busy)
+        if self.resource_calendar is not None:
+            self.busy_days = calendar_days(self.resource_calendar, self.datetime_0, self.busy_days)
+        self.horizon = self.project_reqs.groupby('Scenario')["Duration"].sum().max() + self.busy_days
+        # Time-Varying Capacity: Unavailable Capacity Joins the Prior Commitments Out to the Horizon
+        if self.resource_calendar is not None:
+            self.resource_attrs, self.resource_busy = apply_calendar(
+                self.resource_attrs, self.resource_busy, self.resource_calendar, self.datetime_0, self.horizon
+                )
+        self.resources = self.resource_attrs.index.to_list()
+        self.options = OptionTable(self.project_reqs, self.resource_attrs)
+        # Earliest Start / Latest Finish per Scenario and Task
+        self.windows = task_windows(self.options, self.resource_busy, self.resource_attrs["Capacity"], self.horizon)
+        self.removed_options = pd.DataFrame(columns=REMOVED_COLUMNS)
+        if self.presolve_options:
+            self.presolve()
         # Set Report Path and Name
         self.report_path = model_input["report_path"]
         self.report_file = self.report_path.format(self.name+"_report.md")
@@ -53,168 +101,258 @@ class Model2P(object):
         self.project_reqs.reset_index().to_markdown(repfile, index=False)        
         print("\n\n### Resource Attributes\n", file=repfile)
         self.resource_attrs.to_markdown(repfile)
+        if self.presolve_options:
+            print("\n\n### Presolve: Removed {} of {} Options\n".format(*self.presolved), file=repfile)
+            if len(self.removed_options):
+                self.removed_options.to_markdown(repfile, index=False)
         print("\n\n### Stochastic Attributes\n", file=repfile)
-        print("\nBypass Tasks:", file=repfile)
-        for tp in model_input["stoch_task"]['bypass']:
-            print(*tp, file=repfile)
-        print("\nGiven Info After End Of", file=repfile, end=" ")
-        print(model_input["stoch_task"]['uncertainty_resolves_after']['project'], file=repfile, end=" ")
-        print(model_input["stoch_task"]['uncertainty_resolves_after']['task'], file=repfile)
+        for event in self.scenario_tree.events:
+            for outcome in event.outcomes:
+                if outcome.bypass:
+                    print("\nBypass Tasks:", file=repfile)
+                    for tp in outcome.bypass:
+                        print(*tp, file=repfile)
+            print("\nGiven Info After End Of", file=repfile, end=" ")
+            print(*event.resolves_after, file=repfile)
         print("\nWith Probabilities\n", file=repfile)
         for event, prob in self.prob.items():
             print("Event {:>8} -> Prob {:.1%}".format(event, prob), file=repfile)
         repfile.close()
         # Model Date Utilities
-        self.datetime_0 = datetime.strptime(model_input["date0_str"], "%Y-%m-%d").date()
         self.get_date = lambda d: self.datetime_0 + timedelta(days=d)
 
+    def presolve(self):
+        "Remove Options Dominated or Over Capacity in Every Scenario (See option_presolve); the Horizon Stays"
+        self.project_reqs, self.removed_options = remove_dominated(
+            self.project_reqs, self.options, self.windows, self.resource_attrs, self.resource_busy
+            )
+        self.presolved = (self.options.n_options - len(self.project_reqs), self.options.n_options)
+        if len(self.removed_options):
+            self.options = OptionTable(self.project_reqs, self.resource_attrs)
+            self.windows = task_windows(self.options, self.resource_busy, self.resource_attrs["Capacity"], self.horizon)
+
     def set_model_variables(self):
+        # Proto Indices of Task Times, Resource Choices and Completion Variables
+        self.registry = VariableRegistry(self.model, self.options)
+        # Uncertainty Resolution Time per Scenario Tree Node (Nodes of the First Event First)
+        self.node_urt = [
+            self.model.NewIntVar(0, self.horizon+1, "uncertainty_resolution_time" + ("_{}".format(i) if i else ""))
+            for i in range(len(self.scenario_tree.nodes))
+            ]
+        self.urt = self.node_urt[0]
+        # Collect New Variables for Task: Start, End, Interval, Select if Optional
+        for project in self.options.projects.to_list():
+            self.set_project_variables(project)
+        # Account for Additional Needs Due to Initial Commitment
+        for resource in self.resources:
+            self.set_busy_intervals(resource)
 
-        # Model Data Structure to Include Completion Times and Resource Choices
-        self.assign = dict()
-        for scenario, project, task, resource in self.project_reqs.index:
-            self.assign.setdefault(scenario, {}).setdefault(project,[])
-            if self.assign[scenario][project] and task == self.assign[scenario][project][-1].task:
-                tstruct = self.assign[scenario][project][-1]
-                self.assign[scenario][project][-1] = \
-                    Task(tstruct.task,None,None,tstruct.options+[TaskOption(resource, None, None)],True)
-            else:
-                self.assign[scenario][project].append(
-                    Task(task,None,None,[TaskOption(resource, None, None)],False)
-                    )
-        # Project Earliness and Tardiness
-        self.project_completion = {}
-        for scenario, project in product(self.prob.keys(), self.projects):
-            self.project_completion[(scenario,project)] = CompletionWin(
-                self.model.NewIntVar(0, self.horizon, "{}_{}_earliness".format(scenario, project)),
-                self.model.NewIntVar(0, self.horizon, "{}_{}_tardiness".format(scenario, project))
+    def set_project_variables(self, project):
+        pdata = self.project_attrs.loc[project]
+        windows, reg = self.windows, self.registry
+        for scenario in self.prob:
+            chain = self.options.chain(scenario, project)
+            c = self.options.chain_id(scenario, project)
+            # Project Earliness and Tardiness
+            early, tardy = completion_bounds(
+                windows, chain[-1], 
+                pdata["Deadline"], pdata["Delay Penalty"], pdata["Early Bonus"], self.horizon
                 )
-        # Uncertainty Resolution Time
-        self.urt = self.model.NewIntVar(0, self.horizon+1, "uncertainty_resolution_time")
-        # Collect New Variables for Task: Start, End, Interval, Select if Optional
-        # Collect New Variables for Resource Needs
-        # Collect Variable for Information Constraints
-        self.resource_needs = {resource:[] for resource in self.resources}
-        self.completion_time = {}
-        self.info_revelation = []
-
-        for scenario, projects in self.assign.items():
-            for project, pdata in projects.items():
-                new_pdata = []
-                for tstruct in pdata:
-                    task = tstruct.task
-                    task_label = "{}_{}_{}_".format(scenario,project,task)
-                    dv_start = self.model.NewIntVar(0, self.horizon, task_label + 'start')
-                    dv_end = self.model.NewIntVar(0, self.horizon, task_label + 'end')
-                    new_pdata.append(Task(task, dv_start, dv_end, [], tstruct.mult))
-                    if project == self.uncertainty_resolution['project'] and task == self.uncertainty_resolution['task']:
-                        self.info_revelation.append(dv_end)
-                    for rstruct in tstruct.options:
-                        resource = rstruct.resource
-                        resource_label = "{}_{}_{}_{}_".format(scenario,project,task,resource)
-                        duration = self.project_reqs.loc[(scenario,project,task,resource),"Duration"]
-                        units = self.project_reqs.loc[(scenario,project,task,resource),"Units"]
-                        if tstruct.mult:
-                            rt_end = self.model.NewIntVar(0, self.horizon, resource_label + 'end')
-                            dv_select = self.model.NewBoolVar(resource_label + "indicator")
-                            dv_interval = self.model.NewOptionalIntervalVar(
-                                    dv_start, duration, rt_end, dv_select, resource_label + "interval"
-                                    )
-                            self.completion_time.setdefault((scenario, project, task),[]).append(rt_end)
-                        else:
-                            dv_select = True
-                            dv_interval = self.model.NewIntervalVar(dv_start, duration, dv_end, resource_label + "_interval")
-                        new_pdata[-1].options.append(TaskOption(resource, dv_interval, dv_select))
-                        self.resource_needs.setdefault((scenario, resource), []).append((dv_interval, units))
-                self.assign[scenario][project] = new_pdata
+            reg.early[c] = self.model.NewIntVar(*early, "{}_{}_earliness".format(scenario, project)).Index()
+            reg.tardy[c] = self.model.NewIntVar(*tardy, "{}_{}_tardiness".format(scenario, project)).Index()
+            for group in self.options.task_groups(chain):
+                task, k = group.task, group.index
+                mult = len(group.options) > 1
+                end_lb, end_ub = windows.end_lb[k].item(), windows.end_ub[k].item()
+                task_label = "{}_{}_{}_".format(scenario,project,task)
+                dv_start = self.model.NewIntVar(windows.start_lb[k].item(), windows.start_ub[k].item(), task_label + 'start')
+                dv_end = self.model.NewIntVar(end_lb, end_ub, task_label + 'end')
+                reg.start[k], reg.end[k] = dv_start.Index(), dv_end.Index()
+                for option in group.options:
+                    resource, duration, i = option.resource, option.duration, option.index
+                    resource_label = "{}_{}_{}_{}_".format(scenario,project,task,resource)
+                    if mult:
+                        rt_end = self.model.NewIntVar(end_lb, end_ub, resource_label + 'end')
+                        dv_select = self.model.NewBoolVar(resource_label + "indicator")
+                        dv_interval = self.model.NewOptionalIntervalVar(
+                                dv_start, duration, rt_end, dv_select, resource_label + "interval"
+                                )
+                        reg.active[i], reg.option_end[i] = dv_select.Index(), rt_end.Index()
+                    else:
+                        dv_interval = self.model.NewIntervalVar(dv_start, duration, dv_end, resource_label + "_interval")
+                        reg.option_end[i] = dv_end.Index()
+                    reg.interval[i] = dv_interval.Index()
 
-        # Account for Additional Needs Due to Initial Commitment
-        for scenario, resource in product(self.prob.keys(), self.resources):
-            for t, demand in enumerate(self.resource_busy[resource].values):
-                task = "t{:2d}".format(t)
-                ivname = "occupied_{}_{}_{}_interval".format(t,scenario,resource)
-                if demand > 0:
-                    self.resource_needs.setdefault((scenario, resource),[]).append((self.model.NewIntervalVar(t, 1, t+1, ivname), demand))
-
-    def task_gen(self, mult_only=True):
-        for scenario, projects in self.assign.items():
-            for project, pdata in projects.items():
-                for tstruct in pdata:
-                    if mult_only and not tstruct.mult:
-                        continue
-                    yield scenario, project, tstruct
-
-    def get_project_endtime(self, scenario, project):
-        return self.assign[scenario][project][-1].end
-    
-    def set_precedence_constraints(self):
+    def set_busy_intervals(self, resource):
+        """
+        Fixed Intervals for the Prior Commitments of a Resource, Replacing Any Previous Ones
+        Fixed Intervals Are Shared by All Scenarios
+        """
+        if resource in self.registry.busy:
+            for index in self.registry.busy[resource][0].tolist():
+                self.model.Proto().constraints[index].Clear()
+        intervals, demands = [], []
+        for busy in busy_intervals(self.resource_busy[resource].values, self.compress_busy):
+            ivname = "occupied_{}_{}_{}_interval".format(busy.start,busy.length,resource)
+            intervals.append(self.model.NewIntervalVar(busy.start, busy.length, busy.start+busy.length, ivname).Index())
+            demands.append(busy.demand)
+        self.registry.busy[resource] = (np.array(intervals, dtype=np.int32), np.array(demands, dtype=np.int64))
+
+    def task_mask(self, projects: list=None, mult_only=False) -> np.ndarray:
+        "Task Groups of projects (Default: All) With Variables in the Model, Optionally Only Those With Several Options"
+        mask = self.registry.start >= 0
+        if projects is not None:
+            mask &= np.isin(self.options.task_project, self.options.projects.get_indexer(projects))
+        if mult_only:
+            mask &= self.options.task_size > 1
+        return mask
+
+    def task_index(self, scenario, project, task) -> int:
+        "Task Group of a Task"
+        chain = self.options.chain(scenario, project)
+        names = self.options.tasks[self.options.task_name[chain.start:chain.stop]].to_list()
+        if task not in names:
+            raise KeyError("Task {} of Project {} Not in Scenario {}".format(task, project, scenario))
+        return chain[names.index(task)]
+
+    def set_precedence_constraints(self, projects: list=None):
+        reg, options = self.registry, self.options
+        tasks = self.task_mask(projects)
         # Last Resource End Time is Task End Time
-        for _, _, tstruct in self.task_gen(mult_only=True):
-            self.model.AddMaxEquality(tstruct.end, [rstruct.interval.EndExpr() for rstruct in tstruct.options])
-        # Enforce Task Precedence for Each Scenario, Project Combination
-        for scenario in self.assign:
-            for project in self.assign[scenario]:
-                task_seq = self.assign[scenario][project]
-                # NOTE: ensure len(task_seq) >= 1
-                for i in range(len(task_seq)-1):
-                    self.model.Add(task_seq[i].end <= task_seq[i+1].start)
-
-    def set_resource_constraints(self):
+        for k in np.flatnonzero(self.task_mask(projects, mult_only=True)).tolist():
+            ends = reg.option_end[reg.option_rows(k)].tolist()
+            self.model.AddMaxEquality(reg.var(reg.end[k]), [reg.var(i) for i in ends])
+        # Enforce Task Precedence Along Each Scenario, Project Task Chain
+        follows = tasks[:-1] & (options.task_chain[1:] == options.task_chain[:-1])
+        for k in np.flatnonzero(follows).tolist():
+            self.model.Add(reg.var(reg.end[k]) <= reg.var(reg.start[k+1]))
+
+    def set_resource_constraints(self, projects: list=None):
         # Enforce One Resource Per Task
         # For Each Scenario, Project, Task Combination Require: Only One Resource <<is_active>> Indicator is True
-        for _, _, tstruct in self.task_gen(mult_only=True):
-            self.model.AddBoolXOr(rstruct.is_active for rstruct in tstruct.options)
+        reg = self.registry
+        for k in np.flatnonzero(self.task_mask(projects, mult_only=True)).tolist():
+            self.model.AddBoolXOr(reg.literal(i) for i in reg.active[reg.option_rows(k)].tolist())
+        if projects is not None:
+            return
         # Disjunctive Constraint: Enforce Resource Capacity Limit Over All Intervals
-        # Assumes Resource Capacity Does Not Vary By Stochastic Scenario
-        # Easy to extend model by relaxing this assumption
-        for scenario, resource in product(self.prob.keys(), self.resources):
-            intervals, utilization = zip(*self.resource_needs[scenario, resource])
-            self.model.AddCumulative(
-                intervals, 
-                utilization, 
+        self.capacity_constraint = {}
+        for resource in self.resources:
+            self.set_capacity_constraint(resource)
+
+    def set_capacity_constraint(self, resource):
+        """
+        Cumulative Constraint per Scenario Over All Intervals Needing a Resource, Replacing Any Previous One
+        Assumes Resource Capacity Does Not Vary By Stochastic Scenario
+        Easy to extend model by relaxing this assumption
+        """
+        reg = self.registry
+        for scenario in self.prob:
+            key = (scenario, resource)
+            if key in self.capacity_constraint:
+                self.capacity_constraint.pop(key).Proto().Clear()
+            intervals, units = reg.needs(scenario, resource)
+            if not len(intervals):
+                continue
+            self.capacity_constraint[key] = self.model.AddCumulative(
+                [reg.interval_var(i) for i in intervals.tolist()], 
+                units.tolist(), 
                 self.resource_attrs.loc[resource, "Capacity"]
                 )
 
-    def set_information_constraints(self):
-        self.model.AddMaxEquality(self.urt, self.info_revelation)
-        self.model.AddMinEquality(self.urt, self.info_revelation)
-        for project in self.projects:
-            for bau_tstruct, bypass_tstruct in zip(self.assign["BAU"][project], self.assign["BYPASS"][project]):
+    def set_nonanticipativity(self, scenario_1, scenario_2, urt, projects: list=None):
+        "Tasks Starting Before Uncertainty Resolution Must Be Scheduled Alike in Both Scenarios"
+        reg, options = self.registry, self.options
+        for project in self.projects if projects is None else projects:
+            chain_1, chain_2 = options.chain(scenario_1, project), options.chain(scenario_2, project)
+            tasks_2 = dict(zip(options.task_name[chain_2.start:chain_2.stop].tolist(), chain_2))
+            for k1, task in zip(chain_1, options.task_name[chain_1.start:chain_1.stop].tolist()):
+                if task not in tasks_2:
+                    continue
+                k2 = tasks_2[task]
+                start_1, start_2 = reg.var(reg.start[k1]), reg.var(reg.start[k2])
                 min_time = self.model.NewIntVar(0, self.horizon + 1, "")
                 precede = self.model.NewBoolVar("")
-                self.model.AddMinEquality(min_time, [bau_tstruct.start, bypass_tstruct.start])
-                self.model.Add(min_time <= self.urt).OnlyEnforceIf(precede)
-                self.model.Add(min_time > self.urt).OnlyEnforceIf(precede.Not())
-                self.model.Add(bau_tstruct.start == bypass_tstruct.start).OnlyEnforceIf(precede)
-                self.model.Add(bau_tstruct.end == bypass_tstruct.end).OnlyEnforceIf(precede)
+                self.model.AddMinEquality(min_time, [start_1, start_2])
+                self.model.Add(min_time <= urt).OnlyEnforceIf(precede)
+                self.model.Add(min_time > urt).OnlyEnforceIf(precede.Not())
+                self.model.Add(start_1 == start_2).OnlyEnforceIf(precede)
+                # Tasks of Uncertain Duration Start Alike but Finish as Their Scenario's Duration Says
+                rows_1, rows_2 = reg.option_rows(k1), reg.option_rows(k2)
+                if np.array_equal(options.duration[rows_1.start:rows_1.stop], options.duration[rows_2.start:rows_2.stop]):
+                    self.model.Add(reg.var(reg.end[k1]) == reg.var(reg.end[k2])).OnlyEnforceIf(precede)
+
+    def set_information_constraints(self, projects: list=None):
+        # Each Node Holds Scenarios Differing Only in One Event, Learned When the Resolving
+        # Task Ends in the Node's First Scenario (Alike in All Its Scenarios Until Then);
+        # Linking the First Scenario to the Others Chains Scenarios With One Link Each per Event,
+        # Independent of the Order Events Are Listed In: Each Event e With k_e Outcomes Adds
+        # S x (1 - 1/k_e) Links Over S Scenarios, About (S/2) x log2 S for Binary Events. Fewer
+        # Would Tie Scenarios Differing in e Only Through Other Events, Which May Resolve Earlier.
+        # Given projects, Only Their Nonanticipativity Constraints Are Added
+        reg = self.registry
+        for node, urt in zip(self.scenario_tree.nodes, self.node_urt):
+            rep = node.scenarios[0]
+            if projects is None:
+                self.model.Add(urt == reg.var(reg.end[self.task_index(rep, *node.resolves_after)]))
+            for scenario in node.scenarios[1:]:
+                self.set_nonanticipativity(rep, scenario, urt, projects)
+
+    def set_deadline_constraint(self, project):
+        "Deadline Constraint of a Project in Each Scenario, Replacing Any Previous Ones"
+        reg = self.registry
+        deadline = self.project_attrs.loc[project,"Deadline"]
+        for scenario in self.prob:
+            c = self.options.chain_id(scenario, project)
+            if reg.deadline[c] >= 0:
+                self.model.Proto().constraints[reg.deadline[c]].Clear()
+            project_end = reg.var(reg.end[self.options.last_task[scenario, project]])
+            reg.deadline[c] = self.model.Add(
+                deadline + reg.var(reg.tardy[c]) - reg.var(reg.early[c]) == project_end
+                ).Index()
+
+    def project_cost(self, project):
+        "Expected Resource Cost + Delay Penalty - Early Bonus of a Project"
+        pdata = self.project_attrs.loc[project]
+        reg, options = self.registry, self.options
+        cost = []
+        for scenario, prob in self.prob.items():
+            chain = options.chain(scenario, project)
+            c = options.chain_id(scenario, project)
+            rows = range(options.task_offset[chain.start].item(), options.task_offset[chain.stop].item())
+            for i, active in zip(rows, reg.active[rows.start:rows.stop].tolist()):
+                cost.append(prob * options.cost[i].item() * reg.literal(active))
+            cost.append(prob * (
+                pdata["Delay Penalty"] * reg.var(reg.tardy[c]) 
+                - pdata["Early Bonus"] * reg.var(reg.early[c])
+                ))
+        return sum(cost)
+
+    def objective_terms(self) -> dict:
+        "Expected Tardiness, Delay Penalty, Early Bonus and Resource Cost as Linear Terms (See lexicographic)"
+        reg, options = self.registry, self.options
+        prob = options.scenarios.map(self.prob).to_numpy(dtype=float)
+        rows = np.flatnonzero(reg.present())
+        cost = prob[options.scenario[rows]] * options.cost[rows]
+        single = reg.active[rows] < 0
+        chains = np.flatnonzero(reg.tardy >= 0)
+        weight = prob[options.chain_scenario[chains]]
+        pdata = self.project_attrs.reindex(options.projects[options.chain_project[chains]])
+        tardy = [reg.var(i) for i in reg.tardy[chains].tolist()]
+        early = [reg.var(i) for i in reg.early[chains].tolist()]
+        return {
+            "tardiness": Term(tardy, weight.tolist(), 0),
+            "delay_penalty": Term(tardy, (weight * pdata["Delay Penalty"].to_numpy()).tolist(), 0),
+            "early_bonus": Term(early, (-weight * pdata["Early Bonus"].to_numpy()).tolist(), 0),
+            "resource_cost": Term([reg.literal(i) for i in reg.active[rows[~single]].tolist()], cost[~single].tolist(), cost[single].sum()),
+            }
 
     def set_objective(self):
         # Deadline Contraints
-        for scenario, project in self.project_completion:
-            deadline = self.project_attrs.loc[project,"Deadline"]
-            earliness, tardiness = self.project_completion[scenario, project]
-            self.model.Add(deadline + tardiness - earliness == self.get_project_endtime(scenario, project))
+        for project in self.projects:
+            self.set_deadline_constraint(project)
         # Objective: Minimize Resource Cost + Delay Penalty - Early Bonus
-        resource_cost = []
-        for scenario, project, tstruct in self.task_gen(mult_only=False):
-            for rstruct in tstruct.options:
-                cpd = self.resource_attrs.loc[rstruct.resource, "Cost per Day"]
-                duration = rstruct.interval.SizeExpr()
-                units = self.project_reqs.loc[(scenario,project,tstruct.task,rstruct.resource),"Units"]
-                cost_per_task = cpd * units * duration * rstruct.is_active
-                resource_cost.append(self.prob[scenario] * cost_per_task)
-                
-        self.model.Minimize(
-            sum(resource_cost) +
-            sum(
-                prob * (
-                    pdata["Delay Penalty"] * self.project_completion[scenario, project].tardy 
-                    - pdata["Early Bonus"] * self.project_completion[scenario, project].early
-                )
-                for project, pdata in self.project_attrs.iterrows()
-                for scenario, prob in self.prob.items()
-                )
-            )
+        self.model.Minimize(sum(self.project_cost(project) for project in self.projects))
 
     def build_model(self):
         self.set_model_variables()
@@ -222,54 +360,137 @@ class Model2P(object):
         self.set_resource_constraints()
         self.set_information_constraints()
         self.set_objective()
+        if self.break_symmetry:
+            self.set_symmetry_constraints()
+        if self.warm_start is not None:
+            self.set_solution_hints(self.warm_start)
 
-    def solve(self, max_time: int=100):
+    def set_symmetry_constraints(self):
+        """
+        Summed Task Starts of Interchangeable Projects Rise in Order (in the First Scenario); the
+        First Task Offering Interchangeable Resources Uses the First. Projects Named by Events Are Kept Apart
+        """
+        reg, options = self.registry, self.options
+        self.symmetry = {
+            "projects": project_templates(self.project_attrs, self.project_reqs, self.scenario_tree.event_projects()),
+            "resources": interchangeable_resources(options, self.resource_attrs, self.resource_busy),
+            }
+        scenario = next(iter(self.prob))
+        for group in self.symmetry["projects"]:
+            starts = [sum(reg.var(k) for k in reg.start[options.chain(scenario, project)].tolist()) for project in group]
+            for start_1, start_2 in zip(starts[:-1], starts[1:]):
+                self.model.Add(start_1 <= start_2)
+        for group in self.symmetry["resources"]:
+            choices = [reg.literal(reg.active[i]) for i in first_choice(options, group)]
+            for choice_1, choice_2 in zip(choices[:-1], choices[1:]):
+                self.model.Add(choice_1 >= choice_2)
+
+    def set_solution_hints(self, assignment_file: str):
+        "Hint Task Times and Resource Choices From a Previous Run's Assignment File"
+        self.model.ClearHints()
+        choices = previous_choices(load_assignment(assignment_file), self.datetime_0)
+        reg, options = self.registry, self.options
+        scenarios, projects, names = options.scenarios, options.projects, options.tasks
+        tasks = {
+            (scenarios[options.task_scenario[k]], projects[options.task_project[k]], names[options.task_name[k]]): k
+            for k in np.flatnonzero(self.task_mask()).tolist()
+            }
+        matched, summary = match_tasks(choices, list(tasks))
+        for key, (resource, start, _) in matched.items():
+            k = tasks[key]
+            rows = reg.option_rows(k)
+            chosen = [i for i in rows if options.resources[options.resource[i]] == resource]
+            self.model.AddHint(reg.var(reg.start[k]), start)
+            if chosen:
+                end = start + options.duration[chosen[0]].item()
+                self.model.AddHint(reg.var(reg.end[k]), end)
+            if len(rows) > 1:
+                for i in rows:
+                    self.model.AddHint(reg.literal(reg.active[i]), i in chosen)
+                    if i in chosen:
+                        self.model.AddHint(reg.var(reg.option_end[i]), end)
+        print("Warm Start: {} Tasks Hinted, {} Tasks Added, {} Tasks Removed".format(*summary))
+        return summary
+
+    def set_solver(self, max_time: int=100, profile: str=None):
         self.solver = cp_model.CpSolver()
-        # Set Processing Time Limit
-        self.solver.parameters.max_time_in_seconds = max_time
+        # Set Processing Time Limit and Search Profile (From YAML solver Section Unless Given)
+        solver_config = dict(self.solver_config)
+        if profile is not None:
+            solver_config["profile"] = profile
+        set_solver_parameters(self.solver.parameters, max_time, **solver_config)
+        if self.instrumentation is not None:
+            self.instrumentation.attach(self.solver)
+        self.results = None
+
+    def solve(self, max_time: int=100, profile: str=None):
+        "Solve the Objective, or the Stages of self.lexicographic in Order (max_time and profile Are Stage Defaults)"
+        if self.lexicographic:
+            self.stages = solve_lexicographic(self, self.lexicographic, max_time, profile)
+            return
+        self.stages = None
+        self.set_solver(max_time, profile)
         self.status = self.solver.Solve(self.model)
         print(self.solver.ResponseStats())
 
+    def solve_stream(self, max_time: int=100, profile: str=None, gap: float=None, patience: float=None):
+        """
+        Solve in a Background Thread, Yielding Each Improving Solution as an Incumbent;
+        Stop Early at Relative gap or After patience Seconds Without Improvement
+        """
+        self.set_solver(max_time, profile)
+        self.solution_stream = SolutionStream(self.stream_options(), gap)
+        try:
+            yield from stream_solutions(self.solver, self.model, self.solution_stream, patience)
+        finally:
+            self.status = self.solver.ResponseProto().status
+
+    def stream_options(self):
+        "Task Options Reported by solve_stream: ((Scenario, Project, Task, Resource), Start, End, Is Active)"
+        reg = self.registry
+        rows = np.flatnonzero(reg.present())
+        labels = self.options.label_frame().iloc[rows].itertuples(index=False, name=None)
+        return [
+            (label, reg.var(reg.start[k]), reg.var(end), reg.literal(active))
+            for label, k, end, active in zip(
+                labels, self.options.option_task[rows].tolist(), reg.option_end[rows].tolist(), reg.active[rows].tolist()
+                )
+            ]
+
+    def extract_results(self) -> pd.DataFrame:
+        """
+        Read the Solution at Once Into the Columnar Results Table self.results (One Row per Task
+        Option) and the Uncertainty Resolution Day of Each Scenario Tree Node Into self.resolution
+        """
+        reg, options = self.registry, self.options
+        solution = self.solver.ResponseProto().solution
+        rows = np.flatnonzero(reg.present())
+        tasks = options.option_task[rows]
+        chains = options.task_chain[tasks]
+        completion = reg.end[options.chain_offset[1:] - 1]
+        self.results = results_table(
+            options, solution, rows, reg.start[tasks], reg.option_end[rows], reg.active[rows],
+            completion[chains], reg.early[chains], reg.tardy[chains]
+            )
+        self.resolution = read_values(solution, [urt.Index() for urt in self.node_urt])
+        return self.results
+
     def collect_results(self):
         out = "\n"*3
         if self.status == cp_model.OPTIMAL or self.status == cp_model.FEASIBLE:
             out += '- Solution Status: {}\n'.format(self.solver.StatusName())
-            self.__tograph__ = []
-            for scenario, project, tstruct in self.task_gen(mult_only=False):
-                for rstruct in tstruct.options:
-                    start = rstruct.interval.StartExpr()
-                    end = rstruct.interval.EndExpr()
-                    row = {'Scenario': scenario, 'Project': project}
-                    row["Task"] = tstruct.task
-                    row["Resource"] = rstruct.resource
-                    row["Start"] = self.get_date(self.solver.Value(start))
-                    row["Finish"] = self.get_date(self.solver.Value(end))
-                    row["Is_Active"] = bool(self.solver.Value(rstruct.is_active))
-                    self.__tograph__.append(row)
-
-            df = pd.DataFrame(self.__tograph__)
+            df = assignment_table(self.extract_results(), self.datetime_0)
+            # Persist Assignment for Warm Starts of Later Runs
+            df.to_csv(self.report_path.format("{}_assignment.csv".format(self.name)), index=False)
             df["Project_Scenario"] = df.apply(lambda x: "{Project:}_{Scenario:}".format(**x), axis=1)
-            fig = px.timeline(
-                df.loc[df["Is_Active"],:], 
-                x_start="Start", 
-                x_end="Finish", 
-                y="Project_Scenario", 
-                color="Task",
-                pattern_shape="Resource",
-                pattern_shape_sequence=["x", "", "+"],
-                color_discrete_sequence=px.colors.qualitative.Light24
-            )
-            fig.update_yaxes(categoryorder="category descending")
-            urt = self.get_date(self.solver.Value(self.urt))
-            fig.add_vline(x=urt, line_dash="dot", line_color="white")
-            fig.add_annotation(
-                dict(x=urt,y=-1.0,text="Uncertainty Resolution",xanchor='center',font=dict(size=15))
-                )
+            markers = sorted({self.get_date(urt) for urt in self.resolution.tolist()})
             filename = self.report_path.format("{}_timetable.png".format(self.name))
-            pio.write_image(fig, filename, width=1080, height=720)
+            self.renderer.submit(save_timetable, df, filename, "Project_Scenario", markers)
 
             out += '\t- Optimal Objective Value: {:,.3f}\n'.format(self.solver.ObjectiveValue())
             out += '\t- Optimal Objective Bound: {:,.3f}\n'.format(self.solver.BestObjectiveBound())
+            out += stage_report(getattr(self, "stages", None))
+            out += symmetry_report(getattr(self, "symmetry", None))
         else:
             out += '- No solution found.\n'
         
@@ -282,47 +503,39 @@ class Model2P(object):
         out += fmt.format("Scenario", "Project", "Completion", "Early", "Tardy")
         out += fmt.format(":-------", ":------", "---------:", "----:", "----:")
         self.makespan = {scenario: 0 for scenario in self.prob}
+        completion = completion_table(self.results).set_index(["Scenario", "Project"])
         for scenario, project in product(self.prob.keys(), self.projects):
-            proj_end = self.solver.Value(self.get_project_endtime(scenario, project))
-            earliness, tardiness = self.project_completion[scenario, project]
+            proj_end, earliness, tardiness = completion.loc[(scenario, project), CHAIN_VALUES].tolist()
             self.makespan[scenario] = max(self.makespan[scenario], proj_end)
-            out += fmt.format(scenario, project, proj_end, self.solver.Value(earliness), self.solver.Value(tardiness))
+            out += fmt.format(scenario, project, proj_end, earliness, tardiness)
 
         out += "\n\n### Time Uncertainty Is Resolved\n\n"
-        out +=  str(self.get_date(self.solver.Value(self.urt)))
-        out +=  " (Or {} Days After Time 0)\n".format(self.solver.Value(self.urt))
+        for node, urt in zip(self.scenario_tree.nodes, self.resolution.tolist()):
+            if len(self.scenario_tree.nodes) > 1:
+                out += "- Event {} ({} Scenarios From {}): ".format(node.event, len(node.scenarios), node.scenarios[0])
+            out +=  str(self.get_date(urt))
+            out +=  " (Or {} Days After Time 0)\n".format(urt)
         return out
     
-    def resource_report(self):
-        cols = [(scenario, resource, s) 
-                for scenario in self.prob 
-                for resource in self.resources 
-                for s in ['state0','state1']]
-        utilization = pd.DataFrame(0, index=np.arange(max(self.makespan.values())+1), columns=pd.MultiIndex.from_tuples(cols))
+    def utilization(self):
+        "Daily Utilization per Scenario and Resource Up to the Longest Makespan: state0 Prior Commitments, state1 Total Load"
+        busy = {(scenario, resource): self.resource_busy[resource].values for scenario, resource in product(self.prob.keys(), self.resources)}
+        days = max(self.makespan.values())+1
+        utilization = results_utilization(self.results, busy, days)
         utilization.columns.names = ['Scenario','Resource','State']
-        for scenario, resource in product(self.prob.keys(), self.resources):
-            for i, x in enumerate(self.resource_busy[resource].values):
-                utilization.loc[i,(scenario, resource,'state0')] += x
-            for iv, units in self.resource_needs[scenario, resource]:
-                start = self.solver.Value(iv.StartExpr())
-                end = self.solver.Value(iv.EndExpr())
-                for i in range(start,end):
-                    utilization.loc[i,(scenario, resource,'state1')] += units
-        color_dict = {'state0':'grey', 'state1':'green'}
-        utilization.index = [self.get_date(t).strftime("%b %d") for t in utilization.index]
-        fig, axs = plt.subplots(len(self.resources), len(self.prob), figsize=(16,12), sharex=True)
-        fig.autofmt_xdate(rotation=90)
-        urt = self.solver.Value(self.urt)
-        for i, rname in enumerate(self.resources):
-            for j, scenario in enumerate(self.prob.keys()):
-                utilization.loc[:,(scenario, rname,'state1')] -= utilization.loc[:,(scenario, rname,'state0')]
-                ttl = "{}_{}".format(scenario, rname)
-                utilization[scenario][rname].plot.bar(stacked=True, title=ttl, width=1, grid=True, color=color_dict, ax=axs[i,j])
-                yannot = utilization[scenario][rname].sum(1).max()
-                axs[i,j].axvline(urt, color='red', linestyle=':', lw=2)
-                axs[i,j].text(urt, yannot, "Uncertainty\nResolution", ha='center', va='top', 
-                              bbox=dict(facecolor='white',boxstyle='square',edgecolor='red',pad=0.2))
-        return fig
+        utilization.index = pd.Index([self.get_date(t) for t in utilization.index], name="Date")
+        return utilization
+
+    def resolution_days(self):
+        "Uncertainty Resolution Days per Scenario"
+        markers = {scenario: [] for scenario in self.prob}
+        for node, urt in zip(self.scenario_tree.nodes, self.resolution.tolist()):
+            for scenario in node.scenarios:
+                markers[scenario].append(urt)
+        return markers
+
+    def resource_report(self, utilization=None):
+        return utilization_figure(self.utilization() if utilization is None else utilization, self.resolution_days())
     
     def report_results(self):
         repfile = open(self.report_file, "a")
@@ -331,13 +544,24 @@ class Model2P(object):
         print(self.project_report() , file=repfile)
         print("\n\n## Optimal Timetable" , file=repfile)
         timetable_file = "{}_timetable.png".format(self.name)
-        print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
+        if self.renderer.enabled:
+            print("![Timetable]({})\n\n\n".format(timetable_file) , file=repfile)
         print("\n\n## Optimal Resource Utilization" , file=repfile)
         utilization_file = "{}_utilization.png".format(self.name)
-        fig = self.resource_report()
-        fig.savefig(self.report_path.format(utilization_file), dpi=72)
-        print("![Utilization]({})\n\n\n".format(utilization_file) , file=repfile)
+        utilization_csv = "{}_utilization.csv".format(self.name)
+        utilization = self.utilization()
+        utilization.to_csv(self.report_path.format(utilization_csv))
+        self.renderer.submit(save_utilization, utilization, self.report_path.format(utilization_file), self.resolution_days())
+        if self.renderer.enabled:
+            print("![Utilization]({})\n".format(utilization_file) , file=repfile)
+        print("[Daily Utilization (CSV)]({})\n\n\n".format(utilization_csv) , file=repfile)
+        if self.instrumentation is not None:
+            print("[Phase Timings (CSV)]({0}_phases.csv), [Phase and Solver Statistics (JSON)]({0}_phases.json)\n".format(self.name) , file=repfile)
         repfile.close()
+        # Append the Run to the Results Store (History Across Runs)
+        if self.results_store is not None:
+            with ResultsStore(self.results_store) as store:
+                self.run_id = store.record(self, utilization)
 
 
 if __name__ == "__main__":
@@ -345,4 +569,5 @@ if __name__ == "__main__":
     mod.get_inputs()
     mod.build_model()
     mod.solve()
-    mod.report_results()
\ No newline at end of file
+    mod.report_results()
+    mod.renderer.wait()
@@ -0,0 +1,94 @@
+from ortools.sat.python import cp_model
+from collections import namedtuple
+import queue
+import threading
+import time
+
+# Streaming of Improving Solutions While CP-SAT Searches
+# The Solver Runs in a Background Thread; a Solution Callback Queues Each Improving Solution
+# (Objective, Bound, Gap, Elapsed Time and the Active Task Options With Their Start and Finish)
+# and the Generator Yields Them as They Arrive. The Search Stops Early Once the Relative Gap
+# Reaches gap, or After patience Seconds Without Improvement; the Incumbent Is Kept Either Way.
+# Usage:
+#   for incumbent in mod.solve_stream(max_time=60, gap=0.01, patience=10):
+#       print(incumbent.objective, incumbent.gap, len(incumbent.assignment))
+
+Incumbent = namedtuple('Incumbent', 'solution objective bound gap elapsed assignment')
+
+def relative_gap(objective: float, bound: float) -> float:
+    return abs(objective - bound) / max(abs(objective), 1)
+
+
+class SolutionStream(cp_model.CpSolverSolutionCallback):
+    """
+    Queue Each Improving Solution as an Incumbent; options Lists the Task Options to Report
+    as (Labels, Start, End, Is Active), Is Active Being a Literal, True or None (Always Active)
+    """
+
+    def __init__(self, options: list, gap: float=None) -> None:
+        super().__init__()
+        self.options = options
+        self.gap = gap
+        self.queue = queue.Queue()
+        self.best = None
+        self.solutions = 0
+        self.last_improvement = time.perf_counter()
+        self.stop_reason = None
+
+    def is_active(self, literal) -> bool:
+        return literal is None or literal is True or self.BooleanValue(literal)
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue()
+        if self.best is not None and objective >= self.best:
+            return
+        self.best = objective
+        self.solutions += 1
+        self.last_improvement = time.perf_counter()
+        bound = self.BestObjectiveBound()
+        assignment = [
+            labels + (self.Value(start), self.Value(end))
+            for labels, start, end, literal in self.options
+            if self.is_active(literal)
+            ]
+        gap = relative_gap(objective, bound)
+        self.queue.put(Incumbent(self.solutions, objective, bound, gap, self.WallTime(), assignment))
+        if self.gap is not None and gap <= self.gap:
+            self.stop("gap")
+
+    def stop(self, reason: str) -> None:
+        if self.stop_reason is None:
+            self.stop_reason = reason
+            self.StopSearch()
+
+
+def stream_solutions(solver, model, callback: SolutionStream, patience: float=None):
+    """
+    Solve model in a Background Thread, Yielding Each Incumbent Queued by callback as It Arrives
+    Closing the Generator Early Stops the Search; callback.stop_reason Tells Why the Search Stopped Early
+    """
+
+    def run():
+        try:
+            solver.Solve(model, callback)
+        finally:
+            callback.queue.put(None)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                incumbent = callback.queue.get(timeout=0.1)
+            except queue.Empty:
+                idle = time.perf_counter() - callback.last_improvement
+                if patience is not None and callback.best is not None and idle > patience:
+                    callback.stop("patience")
+                continue
+            if incumbent is None:
+                break
+            yield incumbent
+    finally:
+        if thread.is_alive():
+            callback.stop("closed")
+            thread.join()
@@ -0,0 +1,51 @@
+import numpy as np
+
+# Symmetry Detection for the Scheduling Models
+# Interchangeable Projects: Same Attributes (Deadline, Delay Penalty, Early Bonus) and the Same
+# Requirements Row for Row (in Every Scenario). Permuting Their Schedules Maps Solutions to
+# Solutions of Equal Cost, so Their Summed Task Start Times May Rise in Input Order (Fewer Ties
+# Than First Task Starts, Which Are Often All Zero).
+# Interchangeable Resources: Same Attributes (Capacity, Cost per Day), Same Busy Calendar and
+# Options of Equal Duration and Units on Exactly the Same Task Groups. Permuting Them Maps
+# Solutions to Solutions of Equal Cost, so the First Task Group Offering Them May Be Restricted
+# to the First of Them.
+# Models Add These Constraints in set_symmetry_constraints Unless break_symmetry Is Off; Inputs
+# Edited After Building (What-If Edits, Rolling-Horizon Release Times) Can Break the Symmetry.
+
+def project_templates(project_attrs, project_reqs, fixed: list=()) -> list:
+    "Groups of Two or More Interchangeable Projects (in project_attrs Order), Projects in fixed Excluded"
+    reqs = project_reqs.reset_index()
+    rows = {}
+    for project, row in zip(reqs["Project"].to_list(), reqs.drop(columns="Project").itertuples(index=False, name=None)):
+        rows.setdefault(project, []).append(row)
+    groups = {}
+    for project, attrs in zip(project_attrs.index.to_list(), project_attrs.itertuples(index=False, name=None)):
+        if project in rows and project not in fixed:
+            groups.setdefault((attrs, tuple(rows[project])), []).append(project)
+    return [group for group in groups.values() if len(group) > 1]
+
+def interchangeable_resources(options, resource_attrs, resource_busy) -> list:
+    "Groups of Two or More Interchangeable Resources With Options (in resource_attrs Order)"
+    groups = {}
+    for r, resource in enumerate(options.resources.to_list()):
+        rows = options.resource == r
+        if not rows.any():
+            continue
+        offered = tuple(zip(options.option_task[rows].tolist(), options.duration[rows].tolist(), options.units[rows].tolist()))
+        busy = tuple(np.asarray(resource_busy[resource]).tolist()) if resource in resource_busy else ()
+        groups.setdefault((tuple(resource_attrs.loc[resource].tolist()), busy, offered), []).append(resource)
+    return [group for group in groups.values() if len(group) > 1]
+
+def first_choice(options, resources: list) -> list:
+    "Option Rows of resources (in Order) in the First Task Group Offering Them"
+    codes = options.resources.get_indexer(resources)
+    k = options.option_task[np.flatnonzero(options.resource == codes[0])[0]]
+    rows = np.arange(options.task_offset[k], options.task_offset[k+1])
+    return [rows[options.resource[rows] == code][0].item() for code in codes]
+
+def symmetry_report(symmetry: dict) -> str:
+    "Report Line of the Groups set_symmetry_constraints Ordered (Empty if None)"
+    if symmetry is None:
+        return ""
+    return '\t- Symmetry Breaking: {} Interchangeable Project Groups, {} Interchangeable Resource Groups\n'.format(
+        len(symmetry["projects"]), len(symmetry["resources"]))
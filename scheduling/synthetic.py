@@ -0,0 +1,185 @@
+import os
+import yaml
+import numpy as np
+import pandas as pd
+
+# Seeded Generators for Synthetic Scheduling Inputs
+
+def busy_calendar(
+        resource_attrs: pd.DataFrame,
+        days: int,
+        date0_str: str="2023-04-01",
+        mean_run: int=7,
+        seed: int=0) -> pd.DataFrame:
+    "Prior Commitments Per Resource: Piecewise Constant Runs of Random Demand up to Capacity"
+    rng = np.random.default_rng(seed)
+    out = {}
+    for resource, capacity in resource_attrs["Capacity"].items():
+        profile = []
+        while len(profile) < days:
+            run = int(rng.geometric(1 / mean_run))
+            profile += [int(rng.integers(0, capacity + 1))] * run
+        out[resource] = profile[:days]
+    index = pd.date_range(date0_str, periods=days, name="Time").strftime("%Y-%m-%d")
+    return pd.DataFrame(out, index=index)
+
+def vacation_calendar(
+        resource_attrs: pd.DataFrame,
+        days: int,
+        date0_str: str="2023-05-01",
+        vacations: int=6,
+        seed: int=0) -> pd.DataFrame:
+    """
+    Capacity Calendar (See capacity_calendar) Per Resource: vacations Random One- or Two-Week
+    Ranges With One Unit Less, and Half Capacity Over Weekends
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(date0_str, periods=days)
+    saturdays = dates[dates.dayofweek == 5]
+    rows = []
+    for resource, capacity in resource_attrs["Capacity"].items():
+        for _ in range(vacations):
+            start = dates[int(rng.integers(days))]
+            rows.append((resource, start, start + pd.Timedelta(days=7 * int(rng.integers(1, 3)) - 1), int(capacity) - 1))
+        for saturday in saturdays:
+            rows.append((resource, saturday, saturday + pd.Timedelta(days=1), int(capacity) // 2))
+    calendar = pd.DataFrame(rows, columns=["Resource", "Start", "End", "Capacity"])
+    for column in ("Start", "End"):
+        calendar[column] = calendar[column].dt.strftime("%Y-%m-%d")
+    return calendar
+
+def portfolio(
+        n_projects: int,
+        n_resources: int=3,
+        tasks_per_project: tuple=(4, 12),
+        max_options: int=3,
+        max_duration: int=10,
+        seed: int=0) -> tuple:
+    """
+    Random Project Portfolio: Return (project_attrs, project_reqs, resource_attrs)
+    Each Task Has 1..max_options Resource Options of Similar Duration; Deadlines Are the
+    Project's Shortest Chain Plus a Random Share of the Portfolio's Load per Unit Capacity
+    """
+    rng = np.random.default_rng(seed)
+    resources = ["R{:02d}".format(r+1) for r in range(n_resources)]
+    resource_attrs = pd.DataFrame(
+        {
+            "Capacity": rng.integers(2, 7, n_resources),
+            "Cost per Day": rng.integers(5, 16, n_resources) * 100
+        },
+        index=pd.Index(resources, name="Resource")
+        )
+    capacity = resource_attrs["Capacity"].to_numpy()
+    rows, chain, work = [], [], 0
+    for p in range(n_projects):
+        project = "P{:04d}".format(p+1)
+        critical = 0
+        for t in range(rng.integers(tasks_per_project[0], tasks_per_project[1] + 1)):
+            task = "T{:02d}".format(t+1)
+            n_options = rng.integers(1, min(max_options, n_resources) + 1)
+            base = rng.integers(1, max_duration + 1)
+            options = []
+            for r in rng.choice(n_resources, size=n_options, replace=False):
+                duration = int(max(1, base + rng.integers(-2, 3)))
+                units = int(rng.integers(1, min(2, capacity[r]) + 1))
+                options.append((project, task, resources[r], duration, units))
+            rows += options
+            critical += min(o[3] for o in options)
+            work += min(o[3] * o[4] for o in options)
+        chain.append((project, critical))
+    load = work // capacity.sum()
+    project_attrs = pd.DataFrame(
+        [(project, critical + int(rng.integers(0, load + 1))) for project, critical in chain],
+        columns=["Project", "Deadline"]
+        ).set_index("Project")
+    project_attrs["Delay Penalty"] = rng.integers(5, 51, n_projects) * 100
+    project_attrs["Early Bonus"] = (rng.uniform(0, 0.5, n_projects) * project_attrs["Delay Penalty"]).round(-1)
+    project_reqs = pd.DataFrame(rows, columns=["Project","Task","Resource","Duration","Units"]).set_index(["Project","Task","Resource"])
+    return project_attrs, project_reqs, resource_attrs
+
+def stoch_task(project_reqs: pd.DataFrame, bypass_probability: float=0.4, seed: int=0) -> dict:
+    """
+    Single Uncertain Event in the stoch_task Format of the Stochastic Models: a Random Project
+    With at Least 3 Tasks Learns Its Outcome After a Middle Task and May Bypass Its Last Tasks
+    """
+    rng = np.random.default_rng(seed)
+    tasks = project_reqs.reset_index().groupby("Project", sort=False)["Task"].unique()
+    candidates = tasks[tasks.map(len) >= 3]
+    if candidates.empty:
+        raise ValueError("No Project With 3 or More Tasks to Carry the Uncertain Event")
+    project = candidates.index[rng.integers(len(candidates))]
+    chain = list(candidates[project])
+    resolves = int(rng.integers(1, len(chain) - 1))
+    n_bypass = int(rng.integers(1, len(chain) - resolves))
+    return {
+        "bypass": [[project, task] for task in chain[-n_bypass:]],
+        "bypass_probability": bypass_probability,
+        "uncertainty_resolves_after": {"project": project, "task": chain[resolves]},
+        }
+
+def write_instance(
+        path: str,
+        name: str,
+        project_attrs: pd.DataFrame,
+        project_reqs: pd.DataFrame,
+        resource_attrs: pd.DataFrame,
+        resource_busy: pd.DataFrame,
+        date0_str: str="2023-05-01",
+        **model_input) -> str:
+    "Write Input CSVs and Model Configuration to path; Return Configuration File Name"
+    os.makedirs(path, exist_ok=True)
+    tables = {
+        "project_attrs": project_attrs,
+        "project_reqs": project_reqs,
+        "resource_attrs": resource_attrs,
+        "resource_busy": resource_busy
+        }
+    for key, df in tables.items():
+        filename = os.path.join(path, "{}.csv".format(key))
+        df.to_csv(filename)
+        model_input[key] = filename
+    model_input["report_path"] = os.path.join(path, "{}")
+    model_input["date0_str"] = date0_str
+    model_input_file = os.path.join(path, "{}.yml".format(name))
+    with open(model_input_file, 'w') as f:
+        yaml.safe_dump(model_input, f, sort_keys=False)
+    return model_input_file
+
+def copy_config(model_input_file: str, path: str, name: str, **changes) -> str:
+    "Copy a Model Configuration to path With Reports Redirected There; Return New File Name"
+    with open(model_input_file, 'r') as f:
+        model_input = yaml.safe_load(f)
+    model_input.update(changes)
+    model_input["report_path"] = os.path.join(path, "{}")
+    os.makedirs(path, exist_ok=True)
+    new_model_input_file = os.path.join(path, "{}.yml".format(name))
+    with open(new_model_input_file, 'w') as f:
+        yaml.safe_dump(model_input, f, sort_keys=False)
+    return new_model_input_file
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic instance (input CSVs and model configuration)")
+    parser.add_argument("path", help="output directory")
+    parser.add_argument("--name", default="synthetic", help="configuration name ({name}.yml)")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--resources", type=int, default=3)
+    parser.add_argument("--tasks", type=int, nargs=2, default=[4, 12], metavar=("MIN", "MAX"), help="tasks per project")
+    parser.add_argument("--options", type=int, default=3, help="maximum resource options per task")
+    parser.add_argument("--max-duration", type=int, default=10)
+    parser.add_argument("--days", type=int, default=60, help="length of the busy calendar")
+    parser.add_argument("--bypass-probability", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    project_attrs, project_reqs, resource_attrs = portfolio(
+        args.projects, args.resources, tuple(args.tasks), args.options, args.max_duration, args.seed
+        )
+    model_input_file = write_instance(
+        args.path, args.name, project_attrs, project_reqs, resource_attrs,
+        busy_calendar(resource_attrs, args.days, seed=args.seed),
+        stoch_task=stoch_task(project_reqs, args.bypass_probability, args.seed)
+        )
+    print("{}: {} Projects, {} Tasks, {} Options".format(
+        model_input_file, len(project_attrs), len(project_reqs.groupby(level=[0,1])), len(project_reqs)))
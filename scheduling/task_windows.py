@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+TaskWindows = namedtuple('TaskWindows', 'start_lb start_ub end_lb end_ub')
+
+def earliest_fit(free: np.ndarray, units: int, duration: int) -> np.ndarray:
+    """
+    For Each Day t of the Busy Calendar, Earliest Day >= t Where an Option of
+    Given Units and Duration Fits Into the Free Capacity Left by Prior Commitments
+    (The Calendar is Free Beyond Its Last Day)
+    """
+    days = len(free)
+    blocked = np.append(free < units, False)
+    cum = np.concatenate([[0], np.cumsum(blocked)])
+    t = np.arange(days + 1)
+    ok = cum[np.minimum(t + duration, days + 1)] == cum[t]
+    ok[days] = True
+    first_ok = np.where(ok, t, days)
+    return np.minimum.accumulate(first_ok[::-1])[::-1]
+
+def task_windows(options, resource_busy: pd.DataFrame, capacity: pd.Series, horizon: int) -> TaskWindows:
+    """
+    Earliest start / latest finish of every task group of an OptionTable.
+
+    Forward pass along each task chain: a task starts no earlier than the
+    earliest finish of its predecessor, pushed to the first day its cheapest-fit
+    option fits into the capacity left by resource_busy. Backward pass from the
+    horizon with minimal option durations. All bounds are implied by the model
+    constraints, so they only shrink variable domains.
+    """
+    days = len(resource_busy)
+    resources = options.resources
+    free = {}
+    for r, resource in enumerate(resources):
+        busy = resource_busy[resource].to_numpy() if resource in resource_busy else np.zeros(days)
+        free[r] = int(capacity[resource]) - busy
+    fit_cache = {}
+
+    def fit(r, units, duration, t):
+        if units > int(capacity[resources[r]]):
+            return horizon + 1
+        if t >= days:
+            return t
+        key = (r, units, duration)
+        if key not in fit_cache:
+            fit_cache[key] = earliest_fit(free[r], units, duration).tolist()
+        return fit_cache[key][t]
+
+    offsets = options.task_offset.tolist()
+    resource = options.resource.tolist()
+    duration = options.duration.tolist()
+    units = options.units.tolist()
+    n_tasks = options.n_tasks
+    start_lb, end_lb, start_ub, end_ub = [0]*n_tasks, [0]*n_tasks, [0]*n_tasks, [0]*n_tasks
+    min_duration = [min(duration[offsets[k]:offsets[k+1]]) for k in range(n_tasks)]
+
+    chains = options.chain_offset.tolist()
+    for first, last in zip(chains[:-1], chains[1:]):
+        # Forward Pass: Earliest Start and Finish
+        ready = 0
+        for k in range(first, last):
+            starts, ends = [], []
+            for i in range(offsets[k], offsets[k+1]):
+                s = fit(resource[i], units[i], duration[i], ready)
+                starts.append(s)
+                ends.append(s + duration[i])
+            start_lb[k] = min(starts)
+            end_lb[k] = min(ends)
+            ready = end_lb[k]
+        # Backward Pass: Latest Finish and Start
+        finish = horizon
+        for k in reversed(range(first, last)):
+            end_ub[k] = finish
+            start_ub[k] = max(finish - min_duration[k], 0)
+            finish = start_ub[k]
+
+    # Keep Domains Non-Empty; Infeasible Windows Surface as an Infeasible Model
+    start_lb = np.minimum(start_lb, start_ub)
+    end_lb = np.minimum(end_lb, end_ub)
+    return TaskWindows(start_lb, np.array(start_ub), end_lb, np.array(end_ub))
+
+def completion_bounds(windows: TaskWindows, k: int, deadline: int, delay_penalty, early_bonus, horizon: int) -> tuple:
+    """
+    Earliness and Tardiness Domains for a Project Ending With Task Group k
+    (Relies on Delay Penalty > Early Bonus, So That Optimal Solutions Never Have Both Positive)
+    """
+    if early_bonus >= delay_penalty:
+        return (0, horizon), (0, horizon)
+    end_lb, end_ub, deadline = int(windows.end_lb[k]), int(windows.end_ub[k]), int(deadline)
+    early = (min(max(0, deadline - end_ub), horizon), min(max(0, deadline - end_lb), horizon))
+    tardy = (min(max(0, end_lb - deadline), horizon), min(max(0, end_ub - deadline), horizon))
+    return early, tardy
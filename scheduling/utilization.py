@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Daily Resource Utilization From Solved Intervals or a Results Table: Difference Array Plus Prefix Sum
+
+STATES = ['state0', 'state1']
+
+def interval_values(model, response, intervals, units) -> np.ndarray:
+    """
+    Solved (Start, End, Units) of the Present Intervals Among intervals (Interval Constraint
+    Indices, Each Using units), Read From the Model's Proto and the Solver's ResponseProto
+    """
+    solution = np.asarray(response.solution, dtype=np.int64)
+
+    def value(expr):
+        return expr.offset + int(np.dot(np.asarray(expr.coeffs), solution[list(expr.vars)])) if expr.vars else expr.offset
+
+    def present(literals):
+        return all(solution[l] if l >= 0 else 1 - solution[-l-1] for l in literals)
+
+    rows = []
+    for index, need in zip(np.asarray(intervals).tolist(), np.asarray(units).tolist()):
+        proto = model.constraints[index]
+        if present(proto.enforcement_literal):
+            rows.append((value(proto.interval.start), value(proto.interval.end), need))
+    return np.array(rows, dtype=np.int64).reshape(-1, 3)
+
+def need_indices(needs: dict) -> dict:
+    "Lists of (Interval, Units) Pairs as (Interval Constraint Indices, Units) Arrays"
+    return {
+        key: (np.array([iv.Index() for iv, _ in pairs], dtype=np.int32), np.array([units for _, units in pairs], dtype=np.int64))
+        for key, pairs in needs.items()
+        }
+
+def interval_load(values: np.ndarray, days: int) -> np.ndarray:
+    "Units in Use on Each Day of [0, days) for (Start, End, Units) Rows With End Exclusive"
+    diff = np.zeros(days + 1, dtype=np.int64)
+    np.add.at(diff, np.clip(values[:, 0], 0, days), values[:, 2])
+    np.add.at(diff, np.clip(values[:, 1], 0, days), -values[:, 2])
+    return np.cumsum(diff[:days])
+
+def utilization_table(busy: dict, needs: dict, days: int, model, response) -> pd.DataFrame:
+    """
+    Daily Utilization With Columns (*Key, State) for Each Key of busy (a Resource or a
+    (Scenario, Resource) Pair): state0 the Prior Commitments, state1 the Load of All
+    Present Intervals in needs[key] (Interval Constraint Indices, Units), Prior Commitments Included
+    """
+    columns, data = [], []
+    for key, profile in busy.items():
+        state0 = np.zeros(days, dtype=np.int64)
+        profile = np.asarray(profile, dtype=np.int64)[:days]
+        state0[:len(profile)] = profile
+        state1 = interval_load(interval_values(model, response, *needs.get(key, ([], []))), days)
+        key = key if isinstance(key, tuple) else (key,)
+        columns += [key + (state,) for state in STATES]
+        data += [state0, state1]
+    return pd.DataFrame(np.column_stack(data), columns=pd.MultiIndex.from_tuples(columns))
+
+def results_utilization(results: pd.DataFrame, busy: dict, days: int) -> pd.DataFrame:
+    """
+    Daily Utilization With Columns (*Key, State) for Each Key of busy (a Resource or a
+    (Scenario, Resource) Pair) From a Results Table: state0 the Prior Commitments, state1
+    Adds the Load of the Key's Active Task Options
+    """
+    active = results.loc[results["Is_Active"]]
+    values = active[["Start", "Finish", "Units"]].to_numpy(dtype=np.int64)
+    groups = active.groupby(["Scenario", "Resource"], sort=False).indices
+    columns, data = [], []
+    for key, profile in busy.items():
+        key = key if isinstance(key, tuple) else (key,)
+        state0 = np.zeros(days, dtype=np.int64)
+        profile = np.asarray(profile, dtype=np.int64)[:days]
+        state0[:len(profile)] = profile
+        rows = groups.get(key if len(key) == 2 else ("",) + key, [])
+        columns += [key + (state,) for state in STATES]
+        data += [state0, state0 + interval_load(values[rows], days)]
+    return pd.DataFrame(np.column_stack(data), columns=pd.MultiIndex.from_tuples(columns))
@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import yaml
 import sys
@@ -8,6 +7,7 @@ import numpy as np
 
 # Plot Resource Utilization Diagram
 def plot_utilization(resource_reqs: dict, datetime_0: datetime, tmax: int):
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(len(resource_reqs), 1, figsize=(6,10), sharex=True)
     fig.autofmt_xdate(rotation=90)
     for j, resource in enumerate(resource_reqs.keys()):
@@ -55,7 +55,10 @@ def read_resource_input(
     for res, rdict in inputdict['resources'].items():
         out[res] = Resource(res, **rdict)
 
-    # Plot Initial Requirements Per Resource
+    # Plot Initial Requirements Per Resource (Skipped Without plotfile)
+    if plotfile is None:
+        return out
+    import matplotlib.pyplot as plt
     res_reqs = {res:rstruct.state0 for res, rstruct in out.items()}
     fig = plot_utilization(res_reqs, datetime_0, tmax)
     fig.suptitle("Unavailable Resources", fontweight ="bold")
@@ -0,0 +1,93 @@
+import numpy as np
+from collections import namedtuple
+
+# Columnar Registry of a Model's Decision Variables
+# Proto Indices in NumPy Arrays Aligned With an OptionTable, Instead of Nested Dictionaries of
+# Namedtuples Holding cp_model Objects:
+#   Task Groups:  start, end                Task Start and End Variables
+#   Options:      interval, active, end     Interval Constraint, Selection Literal (-1 for the Only
+#                                           Option of a Task), End Variable (Task End if Only Option)
+#   Task Chains:  early, tardy, deadline    Earliness and Tardiness Variables, Deadline Constraint
+#   busy:         Resource -> (Interval Constraint Indices, Units) of Prior Commitments
+# -1 Marks an Absent Entry, Also for the Forgotten Variables of Removed Projects. Constraint
+# Builders Select Indices With Masks Over the OptionTable Columns and Wrap Them in cp_model
+# Objects Only Where an Expression Is Needed; Results Are Read for All Options at Once.
+
+OptionValues = namedtuple('OptionValues', 'start end active')
+
+COLUMNS = {
+    "start": "n_tasks", "end": "n_tasks",
+    "interval": "n_options", "active": "n_options", "option_end": "n_options",
+    "early": "n_chains", "tardy": "n_chains", "deadline": "n_chains",
+    }
+
+def absent(n: int) -> np.ndarray:
+    return np.full(n, -1, dtype=np.int32)
+
+
+class VariableRegistry(object):
+    "Proto Indices of the Variables of a CpModel Built Over an OptionTable"
+
+    def __init__(self, model, options) -> None:
+        self.model = model
+        self.options = options
+        for column, size in COLUMNS.items():
+            setattr(self, column, absent(getattr(options, size)))
+        self.busy = {}
+
+    def resize(self, options) -> None:
+        "Extend the Columns to an OptionTable With Rows Appended (Indices of Existing Rows Unchanged)"
+        for column, size in COLUMNS.items():
+            values = getattr(self, column)
+            setattr(self, column, np.append(values, absent(getattr(options, size) - len(values))))
+        self.options = options
+
+    def var(self, index: int):
+        return self.model.GetIntVarFromProtoIndex(int(index))
+
+    def literal(self, index: int):
+        "Selection Literal, True for an Always Active Option"
+        return True if index < 0 else self.model.GetBoolVarFromProtoIndex(int(index))
+
+    def interval_var(self, index: int):
+        return self.model.GetIntervalVarFromProtoIndex(int(index))
+
+    def present(self) -> np.ndarray:
+        "Options Whose Variables Are in the Model"
+        return self.interval >= 0
+
+    def option_rows(self, k: int) -> range:
+        "Option Indices of Task Group k"
+        return range(self.options.task_offset[k].item(), self.options.task_offset[k+1].item())
+
+    def needs(self, scenario: str, resource: str) -> tuple:
+        "Interval Constraint Indices and Units of All Intervals of a Scenario Using a Resource"
+        options = self.options
+        s, r = options.scenarios.get_loc(scenario), options.resources.get_loc(resource)
+        rows = self.present() & (options.scenario == s) & (options.resource == r)
+        busy, demand = self.busy.get(resource, (absent(0), absent(0)))
+        return np.append(self.interval[rows], busy), np.append(options.units[rows], demand)
+
+    def drop(self, chains: list) -> np.ndarray:
+        "Forget the Variables of Task Chains; Returns Their Options"
+        options = self.options
+        tasks = np.isin(options.task_chain, chains)
+        masks = {"n_tasks": tasks, "n_options": tasks[options.option_task], "n_chains": np.isin(np.arange(options.n_chains), chains)}
+        rows = np.flatnonzero(masks["n_options"])
+        for column, size in COLUMNS.items():
+            getattr(self, column)[masks[size]] = -1
+        return rows
+
+    def option_values(self, solution) -> OptionValues:
+        "Start, End and Selection of Every Option (Meaningful Where present())"
+        solution = np.asarray(solution, dtype=np.int64)
+        return OptionValues(
+            solution[self.start[self.options.option_task]],
+            solution[self.option_end],
+            np.where(self.active >= 0, solution[self.active], 1).astype(bool),
+            )
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, column).nbytes for column in COLUMNS) + sum(
+            intervals.nbytes + units.nbytes for intervals, units in self.busy.values()
+            )
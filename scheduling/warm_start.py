@@ -0,0 +1,45 @@
+from collections import namedtuple
+from datetime import date
+import pandas as pd
+
+HintSummary = namedtuple('HintSummary', 'matched added removed')
+
+def load_assignment(filename: str) -> pd.DataFrame:
+    "Read an Assignment Persisted by collect_results (One Row per Task Option)"
+    df = pd.read_csv(filename, parse_dates=["Start","Finish"])
+    if "Scenario" not in df.columns:
+        df.insert(0, "Scenario", "")
+    return df
+
+def previous_choices(assignment: pd.DataFrame, datetime_0: date) -> dict:
+    """
+    Active Option of Each Previous Task, Keyed by (Scenario, Project, Task):
+    (Resource, Start, Finish) With Times in Days After the New datetime_0
+    """
+    active = assignment.loc[assignment["Is_Active"].astype(bool)]
+    t0 = pd.Timestamp(datetime_0)
+    start = (active["Start"] - t0).dt.days
+    finish = (active["Finish"] - t0).dt.days
+    keys = zip(active["Scenario"].fillna(""), active["Project"], active["Task"])
+    return {key: (r, s, f) for key, r, s, f in zip(keys, active["Resource"], start, finish)}
+
+def match_tasks(choices: dict, tasks: list) -> tuple:
+    """
+    Map Current (Scenario, Project, Task) Keys to Previous Choices. Scenarios Missing From
+    the Previous Run Fall Back to Any Previous Scenario Holding the Same (Project, Task).
+    Tasks Already Started Before datetime_0 Are Not Hinted.
+    Return (Matched Choices, HintSummary)
+    """
+    fallback = {}
+    for (scenario, project, task), choice in choices.items():
+        fallback.setdefault((project, task), choice)
+    matched, added = {}, 0
+    for key in tasks:
+        choice = choices.get(key, fallback.get(key[1:]))
+        if choice is None:
+            added += 1
+        elif choice[1] >= 0:
+            matched[key] = choice
+    current = {key[1:] for key in tasks}
+    removed = len({key[1:] for key in choices} - current)
+    return matched, HintSummary(len(matched), added, removed)